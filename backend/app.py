@@ -1,28 +1,70 @@
 from flask import Flask, render_template_string, request, jsonify
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-from pymongo import MongoClient
-import openai
 import os
-import time
 import logging
+import click
 from config import Config
+from pymongo.errors import PyMongoError
+from utils.database import collection, pool_stats
+from utils.health import health_monitor
+from utils.indexes import ensure_indexes
+from utils.json_provider import BSONJSONProvider
+from utils.compression import init_compression
+from utils.log_buffer import LogBuffer
+from utils.revocation import RevocationCheckUnavailable, revocation_store
+from utils.scheduler import card_scheduler
+from utils.startup_profile import profile_startup
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-log_messages = []  # In-memory log storage for display
+log_buffer = LogBuffer(Config.LOG_BUFFER_SIZE)  # In-memory log storage for display
 
 # Function to log messages with status
 def log_message(status, message):
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    log = {"timestamp": timestamp, "status": status, "message": message}
-    log_messages.append(log)
+    log_buffer.append(status, message)
     logging.info(message)
 
+# Polled endpoints that are not written to the status page log
+QUIET_PATHS = {'/logs', '/healthz', '/readyz'}
+
+# Names shown on the status page for each probed dependency
+DEPENDENCY_LABELS = {"mongodb": "MongoDB", "s3": "S3", "openai": "OpenAI API", "textract": "Textract"}
+
+def backfill_card_schedules():
+    """Schedule the cards of decks created before card_schedules existed."""
+    try:
+        backfilled = card_scheduler.backfill_decks(collection('flashcards_decks'))
+    except PyMongoError as e:
+        log_message("❌", f"Card schedule backfill failed: {e}")
+        return
+    if backfilled:
+        log_message("✅", f"Card schedules backfilled for {backfilled} deck(s).")
+
+def on_dependency_change(name, result, previous):
+    """
+    Log each dependency as it comes up or goes down, and ensure indexes and
+    backfill card schedules whenever MongoDB becomes reachable.
+    """
+    label = DEPENDENCY_LABELS.get(name, name)
+    if result["ok"]:
+        log_message("✅", f"Successfully connected to {label} ({result['latency_ms']} ms).")
+        # Index creation is idempotent, so it is simply repeated after an outage
+        if name == "mongodb" and Config.MONGO_ENSURE_INDEXES:
+            ensure_indexes()
+            log_message("✅", "MongoDB indexes ensured.")
+        if name == "mongodb":
+            backfill_card_schedules()
+    else:
+        log_message("❌", f"Unable to connect to {label}: {result['error']}")
+
+health_monitor.add_listener(on_dependency_change)
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
-    connection_status = {"MongoDB": False, "OpenAI": False}
+    app.json = BSONJSONProvider(app)
+    init_compression(app)
 
     # Environment Variable Check
     required_env_keys = ["MONGODB_URI", "OPEN_AI_KEY", "AWS_ACCESS_KEY", "AWS_SECRET_KEY"]
@@ -33,27 +75,15 @@ def create_app():
         else:
             log_message("✅", f"Environment variable {key} loaded successfully.")
 
-    # MongoDB Connection Test
-    try:
-        client = MongoClient(os.getenv("MONGODB_URI"))
-        client.server_info()
-        connection_status["MongoDB"] = True
-        log_message("✅", "Successfully connected to MongoDB.")
-    except Exception as e:
-        log_message("❌", f"Unable to connect to MongoDB: {e}")
-
-    # OpenAI Connection Test
-    try:
-        openai.api_key = os.getenv("OPEN_AI_KEY")
-        openai.Model.list()
-        connection_status["OpenAI"] = True
-        log_message("✅", "Successfully connected to OpenAI API.")
-    except Exception as e:
-        log_message("❌", f"Unable to connect to OpenAI API: {e}")
+    # Dependencies are probed in the background; the status page and /readyz show the results
+    health_monitor.start()
 
     # Middleware for Real-Time API Logging
     @app.before_request
     def log_request():
+        # The status page and load balancers poll these several times a second per worker
+        if request.path in QUIET_PATHS:
+            return
         log_message("🔵", f"API Request: {request.method} {request.path}")
 
     # HTML Template with Terminal-Style Logs
@@ -75,12 +105,25 @@ def create_app():
             .info { color: #fab387; }
         </style>
         <script>
-            // Periodically fetch logs to simulate real-time updates
+            // Periodically fetch new log entries to simulate real-time updates
+            const MAX_LINES = 1000;
+            let lastSeq = 0;
+
             async function fetchLogs() {
-                const response = await fetch('/logs');
-                const logs = await response.json();
+                const response = await fetch(`/logs?since=${lastSeq}`);
+                const data = await response.json();
+                lastSeq = data.last_seq;
+                if (!data.entries.length) return;
+
                 const terminal = document.getElementById('terminal');
-                terminal.innerHTML = logs.map(log => `[${log.timestamp}] ${log.status} - ${log.message}`).join('\\n');
+                for (const log of data.entries) {
+                    const line = document.createElement('div');
+                    line.textContent = `[${log.timestamp}] ${log.status} - ${log.message}`;
+                    terminal.appendChild(line);
+                }
+                while (terminal.childElementCount > MAX_LINES) {
+                    terminal.firstElementChild.remove();
+                }
                 terminal.scrollTop = terminal.scrollHeight;
             }
 
@@ -89,7 +132,7 @@ def create_app():
         </script>
     </head>
     <body>
-        <h1>Backend Status: {% if connection_status.MongoDB and connection_status.OpenAI %}Connected 🚀{% else %}Error Establishing Connection ❌{% endif %}</h1>
+        <h1>Backend Status: {% if connected %}Connected 🚀{% else %}Error Establishing Connection ❌{% endif %}</h1>
         <div class="container">
             <h2>Environment Variables</h2>
             {% for log in logs %}
@@ -99,12 +142,11 @@ def create_app():
             {% endfor %}
 
             <h2>Service Connections</h2>
-            <div class="status success">
-                MongoDB Connection: {% if connection_status.MongoDB %}Connected ✅{% else %}No Connection ❌{% endif %}
-            </div>
-            <div class="status success">
-                OpenAI Connection: {% if connection_status.OpenAI %}Connected ✅{% else %}No Connection ❌{% endif %}
-            </div>
+            {% for name, check in health.checks.items() %}
+                <div class="status {% if check.ok %}success{% else %}error{% endif %}">
+                    {{ labels.get(name, name) }} Connection: {% if check.ok %}Connected ✅ ({{ check.latency_ms }} ms){% else %}No Connection ❌{% endif %}
+                </div>
+            {% endfor %}
 
             <h2>API Activity & Logs</h2>
             <div class="terminal" id="terminal"></div>
@@ -116,12 +158,35 @@ def create_app():
     # Route to display connection statuses
     @app.route('/')
     def home():
-        return render_template_string(status_html, logs=log_messages, connection_status=connection_status)
+        health = health_monitor.status()
+        connected = all(check['ok'] for check in health['checks'].values())
+        return render_template_string(status_html, logs=log_buffer.snapshot(), health=health, connected=connected, labels=DEPENDENCY_LABELS)
+
+    # Liveness: the process is up and serving requests. Never touches a dependency.
+    @app.route('/healthz')
+    def healthz():
+        return jsonify({'status': 'ok'})
 
-    # Route to serve logs in JSON for real-time updates
+    # Readiness: cached results of the background dependency probes (utils/health.py)
+    @app.route('/readyz')
+    def readyz():
+        health = health_monitor.status()
+        body = {'status': 'ready' if health['ready'] else 'not_ready', **health}
+        return jsonify(body), 200 if health['ready'] else 503
+
+    # Route to serve log entries newer than ?since=<seq> in JSON for real-time updates
     @app.route('/logs')
     def get_logs():
-        return jsonify(log_messages)
+        try:
+            since = int(request.args.get('since', 0))
+        except ValueError:
+            return jsonify({'error': 'since must be an integer'}), 400
+        return jsonify(log_buffer.since(since))
+
+    # Route to expose MongoDB connection pool statistics for this worker
+    @app.route('/pool_stats')
+    def get_pool_stats():
+        return jsonify(pool_stats())
 
     # Configure CORS
     app.config['CORS_HEADERS'] = 'Content-Type'
@@ -129,6 +194,47 @@ def create_app():
 
     jwt = JWTManager(app)
 
+    # Reject tokens revoked by /auth/logout on any worker
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return revocation_store.is_revoked(jwt_payload['jti'], jwt_payload.get('exp'))
+
+    # A token whose revocation status cannot be read is refused rather than trusted
+    @app.errorhandler(RevocationCheckUnavailable)
+    def revocation_check_unavailable(error):
+        response = jsonify({'error': 'Authentication is temporarily unavailable, please retry'})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    # Management command: flask --app app ensure-indexes
+    @app.cli.command('ensure-indexes')
+    def ensure_indexes_command():
+        for collection_name, names in ensure_indexes().items():
+            click.echo(f"{collection_name}: {', '.join(names) or 'none'}")
+
+    # Management command: flask --app app backfill-schedules
+    @app.cli.command('backfill-schedules')
+    def backfill_schedules_command():
+        backfilled = card_scheduler.backfill_decks(collection('flashcards_decks'))
+        click.echo(f"Backfilled card schedules for {backfilled} deck(s)")
+
+    # Management command: flask --app app backfill-generated-subjects
+    @app.cli.command('backfill-generated-subjects')
+    def backfill_generated_subjects_command():
+        from routes.notes import backfill_generated_subjects
+        click.echo(f"Set subject_id on {backfill_generated_subjects()} generated note(s)")
+
+    # Management command: flask --app app startup-report
+    @app.cli.command('startup-report')
+    @click.option('--top', default=15, help='Number of modules to list.')
+    def startup_report_command(top):
+        """Time app import and create_app() and list the slowest module imports."""
+        report = profile_startup()
+        click.echo(f"import app: {report['import_ms']:.0f} ms, create_app(): {report['create_app_ms']:.0f} ms")
+        click.echo(f"{'self ms':>8} {'cumulative ms':>14}  module")
+        for name, self_us, cumulative_us in report['modules'][:top]:
+            click.echo(f"{self_us / 1000:8.1f} {cumulative_us / 1000:14.1f}  {name}")
+
     # Register Blueprints
     from routes.auth import auth_bp
     from routes.notes import notes_bp
@@ -142,6 +248,22 @@ def create_app():
     app.register_blueprint(quiz_bp, url_prefix='/quiz')
     app.register_blueprint(flashcards_bp, url_prefix='/flashcards')
 
+    # Route to expose in-process cache statistics for this worker
+    from utils.completion_cache import completion_cache
+    from utils.s3_manager import S3Manager, s3_manager
+
+    @app.route('/upload_stats')
+    def get_upload_stats():
+        return jsonify(S3Manager.upload_stats())
+
+    @app.route('/cache_stats')
+    def get_cache_stats():
+        return jsonify({
+            'presigned_urls': s3_manager.presigned_url_cache_stats(),
+            'completions': completion_cache.stats(),
+            'revoked_tokens': revocation_store.stats()
+        })
+
     return app
 
 if __name__ == '__main__':
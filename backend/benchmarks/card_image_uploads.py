@@ -0,0 +1,70 @@
+# backend/benchmarks/card_image_uploads.py
+"""
+Time upload_card_images() one upload at a time against the thread pool,
+using a local S3 stand-in that sleeps for a fixed latency per PutObject.
+
+    python benchmarks/card_image_uploads.py --cards 10 50 --latency-ms 50
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-with-at-least-32-bytes')
+os.environ.setdefault('MONGODB_URI', 'mongodb://127.0.0.1:1')
+os.environ.setdefault('S3_BUCKET', 'benchmark-bucket')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from routes.flashcards import upload_card_images
+from utils.s3_manager import s3_manager
+
+
+class LatencyS3Client:
+    """Accepts uploads after sleeping for `latency` seconds, like a remote PutObject."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Callback=None, Config=None):
+        body = Fileobj.read()
+        time.sleep(self.latency)
+        if Callback:
+            Callback(len(body))
+
+
+def time_uploads(cards: list, workers: int, repeat: int) -> float:
+    """Best of `repeat` runs, in milliseconds."""
+    Config.S3_UPLOAD_MAX_WORKERS = workers
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        upload_card_images(cards, 'benchmark@example.com')
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--image-kb', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=Config.S3_UPLOAD_MAX_WORKERS)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    s3_manager._s3 = LatencyS3Client(args.latency_ms / 1000)
+    image = 'data:image/png;base64,' + base64.b64encode(os.urandom(args.image_kb * 1024)).decode()
+
+    print(f"latency {args.latency_ms:g} ms per upload, {args.image_kb} KB images, best of {args.repeat}")
+    print(f"{'cards':>6} {'sequential ms':>14} {f'{args.workers} workers ms':>14} {'speedup':>8}")
+    for count in args.cards:
+        cards = [{'id': f"c{i}", 'image': image} for i in range(count)]
+        sequential = time_uploads(cards, 1, args.repeat)
+        concurrent = time_uploads(cards, args.workers, args.repeat)
+        print(f"{count:>6} {sequential:>14.0f} {concurrent:>14.0f} {sequential / concurrent:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# backend/benchmarks/response_encoding.py
+"""
+Time JSON encoding and compression of a deck response: the stdlib encoder
+after the old str(_id) loop, the orjson provider, then gzip and brotli at the
+configured levels.
+
+    python benchmarks/response_encoding.py --cards 1000
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-with-at-least-32-bytes')
+os.environ.setdefault('MONGODB_URI', 'mongodb://127.0.0.1:1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from flask import Flask
+from config import Config
+from utils.json_provider import BSONJSONProvider, orjson
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def make_deck(card_count: int) -> dict:
+    """A deck document shaped like flashcards_decks, as PyMongo returns it."""
+    now = datetime.utcnow()
+    cards = [
+        {
+            'id': f"card-{i}",
+            'term': f"Term {i}: mitochondrial membrane potential",
+            'definition': (
+                f"Definition {i}. The electrochemical gradient across the inner mitochondrial "
+                "membrane that drives ATP synthase during oxidative phosphorylation."
+            ),
+            'image': None if i % 4 else f"https://{Config.S3_BUCKET}.s3.amazonaws.com/users/student/flashcard_{i}.png",
+            'status': 'learned' if i % 3 else 'unfamiliar',
+            'streak': i % 4,
+            'lastAnswered': now - timedelta(minutes=i),
+            'learned': bool(i % 3),
+            'mastered': False,
+        }
+        for i in range(card_count)
+    ]
+    return {
+        '_id': ObjectId(),
+        'user_id': 'student@example.com',
+        'title': 'Cell biology',
+        'description': 'Organelles and metabolism',
+        'cards': cards,
+        'progress': {'learned': [i for i in range(card_count) if i % 3], 'mastered': [], 'unfamiliar': [i for i in range(card_count) if not i % 3]},
+        'cardStates': {str(i): {'streak': i % 4, 'status': cards[i]['status'], 'lastAnswered': cards[i]['lastAnswered']} for i in range(card_count)},
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+def stdlib_encode(deck: dict) -> bytes:
+    # What the routes did before the provider: stringify ids by hand, then json.dumps
+    deck = {**deck, '_id': str(deck['_id'])}
+    return json.dumps(deck, default=str, separators=(',', ':')).encode('utf-8')
+
+
+def best_ms(fn, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    provider = BSONJSONProvider(app)
+    deck = make_deck(args.cards)
+
+    rows = []
+    ms, body = best_ms(lambda: stdlib_encode(deck), args.repeat)
+    rows.append(('encode, stdlib json + str() loop', ms, len(body)))
+    ms, body = best_ms(lambda: provider.dumps(deck).encode('utf-8'), args.repeat)
+    rows.append((f"encode, {'orjson' if orjson else 'stdlib'} provider", ms, len(body)))
+    ms, compressed = best_ms(lambda: gzip.compress(body, compresslevel=Config.COMPRESS_GZIP_LEVEL, mtime=0), args.repeat)
+    rows.append((f"gzip level {Config.COMPRESS_GZIP_LEVEL}", ms, len(compressed)))
+    if brotli is not None:
+        ms, compressed = best_ms(lambda: brotli.compress(body, quality=Config.COMPRESS_BROTLI_QUALITY), args.repeat)
+        rows.append((f"brotli quality {Config.COMPRESS_BROTLI_QUALITY}", ms, len(compressed)))
+
+    print(f"{args.cards}-card deck, best of {args.repeat}")
+    for label, ms, size in rows:
+        print(f"  {label:<34} {ms:7.1f} ms {size / 1024:8.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,4 +11,84 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     ALLOWED_EXTENSIONS = {'pdf', 'txt', 'doc', 'docx', 'jpg', 'png','jpeg'}
     OPENAI_API_KEY = os.getenv('OPEN_AI_KEY')
-    AWS_REGION=os.getenv('AWS_REGION')
\ No newline at end of file
+    AWS_REGION=os.getenv('AWS_REGION')
+
+    # MongoDB connection pool (one client per worker process, see utils/database.py)
+    MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'notes_app')
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 60000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 5000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', 30000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000))
+    MONGO_READ_PREFERENCE = os.getenv('MONGO_READ_PREFERENCE', 'primary')
+    MONGO_WRITE_CONCERN_W = int(os.getenv('MONGO_WRITE_CONCERN_W', 1))
+    MONGO_WRITE_CONCERN_TIMEOUT_MS = int(os.getenv('MONGO_WRITE_CONCERN_TIMEOUT_MS', 5000))
+    MONGO_ENSURE_INDEXES = os.getenv('MONGO_ENSURE_INDEXES', 'true').lower() == 'true'
+
+    # Presigned URL cache (utils/s3_manager.py)
+    PRESIGNED_URL_CACHE_SIZE = int(os.getenv('PRESIGNED_URL_CACHE_SIZE', 4096))
+    PRESIGNED_URL_REUSE_FRACTION = float(os.getenv('PRESIGNED_URL_REUSE_FRACTION', 0.5))
+
+    # Background jobs (utils/jobs.py): 'thread' runs jobs on a worker pool, 'inline' runs them in the request
+    JOB_BACKEND = os.getenv('JOB_BACKEND', 'thread')
+    JOB_MAX_WORKERS = int(os.getenv('JOB_MAX_WORKERS', 4))
+    # Finished jobs are deleted this long after finishing; unfinished ones untouched this long are failed
+    JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', 7 * 24 * 3600))
+    JOB_STALE_SECONDS = int(os.getenv('JOB_STALE_SECONDS', 1800))
+
+    # LLM completion cache (utils/completion_cache.py)
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 512))
+    LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+    LLM_CACHE_MAX_ENTRY_BYTES = int(os.getenv('LLM_CACHE_MAX_ENTRY_BYTES', 256 * 1024))
+
+    # Extracted text shared by identical uploads (utils/ocr_cache.py) is deleted this long after it was stored
+    OCR_CACHE_TTL_SECONDS = int(os.getenv('OCR_CACHE_TTL_SECONDS', 30 * 24 * 3600))
+
+    # Long documents are summarized in chunks of at most LLM_CHUNK_TOKENS (estimated) input tokens
+    LLM_CHUNK_TOKENS = int(os.getenv('LLM_CHUNK_TOKENS', 3000))
+    LLM_MAX_PARALLEL_CHUNKS = int(os.getenv('LLM_MAX_PARALLEL_CHUNKS', 4))
+    # Cheaper model that writes the single title and outline over the chunked sections
+    LLM_OUTLINE_MODEL = os.getenv('LLM_OUTLINE_MODEL', 'gpt-3.5-turbo')
+
+    # Concurrent S3 uploads for flashcard images
+    S3_UPLOAD_MAX_WORKERS = int(os.getenv('S3_UPLOAD_MAX_WORKERS', 8))
+
+    # Direct-to-S3 uploads (/notes/upload/init and /notes/upload/confirm)
+    MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', 50 * 1024 * 1024))
+    UPLOAD_URL_EXPIRATION = int(os.getenv('UPLOAD_URL_EXPIRATION', 900))
+
+    # S3 transfer settings (utils/s3_manager.py)
+    S3_MULTIPART_THRESHOLD = int(os.getenv('S3_MULTIPART_THRESHOLD', 8 * 1024 * 1024))
+    S3_MULTIPART_CHUNKSIZE = int(os.getenv('S3_MULTIPART_CHUNKSIZE', 8 * 1024 * 1024))
+    S3_MAX_CONCURRENCY = int(os.getenv('S3_MAX_CONCURRENCY', 10))
+    S3_CHECKSUM_ALGORITHM = os.getenv('S3_CHECKSUM_ALGORITHM', 'SHA256')
+    S3_SPOOL_MAX_MEMORY = int(os.getenv('S3_SPOOL_MAX_MEMORY', 1024 * 1024))
+
+    # Asynchronous Textract jobs for multi-page PDFs
+    TEXTRACT_POLL_INTERVAL = float(os.getenv('TEXTRACT_POLL_INTERVAL', 2))
+    TEXTRACT_TIMEOUT = int(os.getenv('TEXTRACT_TIMEOUT', 600))
+
+    # Keyset pagination for list endpoints (?limit=&cursor=&fields=)
+    LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', 50))
+    LIST_MAX_PAGE_SIZE = int(os.getenv('LIST_MAX_PAGE_SIZE', 200))
+
+    # Response compression (gzip, or brotli when installed), negotiated per request
+    COMPRESS_RESPONSES = os.getenv('COMPRESS_RESPONSES', 'true').lower() == 'true'
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))
+
+    # Entries kept by the status page log buffer (oldest are dropped first)
+    LOG_BUFFER_SIZE = int(os.getenv('LOG_BUFFER_SIZE', 1000))
+
+    # Dependency probes behind /readyz (utils/health.py)
+    HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', 15))
+    HEALTH_PROBE_TIMEOUT = float(os.getenv('HEALTH_PROBE_TIMEOUT', 5))
+    READINESS_DEPENDENCIES = os.getenv('READINESS_DEPENDENCIES', 'mongodb,s3')
+
+    # Revoked JWTs (utils/revocation.py); "not revoked" answers are cached per worker for a few seconds
+    REVOCATION_CACHE_MAX_ENTRIES = int(os.getenv('REVOCATION_CACHE_MAX_ENTRIES', 10000))
+    REVOCATION_NEGATIVE_TTL_SECONDS = float(os.getenv('REVOCATION_NEGATIVE_TTL_SECONDS', 5))
@@ -1,5 +1,4 @@
 from datetime import datetime
-from bson import ObjectId
 
 class User:
     def __init__(self, email, password_hash, full_name=None):
@@ -3,14 +3,15 @@ from flask_bcrypt import Bcrypt
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
+    decode_token,
     jwt_required,
     get_jwt_identity,
     get_jwt
 )
-from pymongo import MongoClient
 from models import User
 import logging
-from config import Config
+from utils.database import collection
+from utils.revocation import revocation_store
 from flask_cors import cross_origin
 import re
 
@@ -18,12 +19,7 @@ auth_bp = Blueprint('auth', __name__)
 bcrypt = Bcrypt()
 
 # Initialize MongoDB connection
-client = MongoClient(Config.MONGODB_URI)
-db = client['notes_app']
-users_collection = db['users']
-
-# Token blacklist set for logged out tokens
-token_blacklist = set()
+users_collection = collection('users')
 
 def is_valid_email(email):
     pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
@@ -141,8 +137,23 @@ def login():
 @cross_origin()
 def logout():
     try:
-        jti = get_jwt()['jti']
-        token_blacklist.add(jti)
+        user_id = get_jwt_identity()
+        claims = get_jwt()
+
+        # The refresh token could otherwise mint new access tokens until it expires
+        refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+        refresh_claims = None
+        if refresh_token:
+            try:
+                refresh_claims = decode_token(refresh_token, allow_expired=True)
+            except Exception:
+                return jsonify({'error': 'Invalid refresh token'}), 400
+            if refresh_claims.get('type') != 'refresh' or refresh_claims.get('sub') != user_id:
+                return jsonify({'error': 'Invalid refresh token'}), 400
+
+        revocation_store.revoke(claims['jti'], claims.get('exp'), user_id=user_id)
+        if refresh_claims:
+            revocation_store.revoke(refresh_claims['jti'], refresh_claims.get('exp'), user_id=user_id)
         return jsonify({'message': 'Successfully logged out'}), 200
     except Exception as e:
         logging.error(f"Logout error: {e}")
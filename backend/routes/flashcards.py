@@ -1,27 +1,37 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from pymongo import MongoClient
 from bson import ObjectId
 from datetime import datetime
 import logging
 from config import Config
+from utils.database import collection
+from utils.card_progress import (
+    CARD_STATUSES,
+    apply_answer,
+    card_status,
+    default_card_state,
+    initial_progress_counts,
+    parse_answer_timestamp,
+    progress_counts_from_states
+)
+from utils.scheduler import CORRECT_QUALITY, INCORRECT_QUALITY, card_scheduler
+from utils.pagination import PageRequest
+from utils.etags import VERSION_PROJECTION, bump_version, document_etag, matching_etag, not_modified, with_etag
+from pymongo import ReturnDocument
 from flask_cors import cross_origin
 import re
-import base64
 import secrets
-from utils.s3_manager import S3Manager
+from concurrent.futures import ThreadPoolExecutor
+from utils.s3_manager import s3_manager
 from utils.gpt_api import gpt_manager  
 
 flashcards_bp = Blueprint('flashcards', __name__)
 
 # Initialize MongoDB
-client = MongoClient(Config.MONGODB_URI)
-db = client['notes_app']
-flashcards_collection = db['flashcards_decks']
-notes_collection = db['notes']
-generated_notes_collection = db['generated_notes']
+flashcards_collection = collection('flashcards_decks')
+notes_collection = collection('notes')
+generated_notes_collection = collection('generated_notes')
 
-s3_manager = S3Manager(Config)
 
 def is_base64_image(data_url: str) -> bool:
     """
@@ -34,38 +44,53 @@ def is_base64_image(data_url: str) -> bool:
         return False
     return True
 
+def upload_card_image(card, user_id):
+    """
+    Return a copy of the card with a base64 data URL image replaced by its S3
+    URL. HTTPS URLs are kept, anything else (or a failed upload) becomes None.
+    """
+    updated_card = card.copy()
+    if 'image' in updated_card and updated_card['image']:
+        try:
+            # Check if it's already an S3 URL or any HTTPS URL
+            if updated_card['image'].startswith('https://'):
+                return updated_card
+
+            # Check if it's a base64-encoded image
+            if is_base64_image(updated_card['image']):
+                # Extract base64 portion
+                base64_str = updated_card['image'].split(';base64,')[-1]
+                # Generate a unique filename
+                filename = f"flashcard_{datetime.utcnow().timestamp()}_{secrets.token_hex(8)}.png"
+                # Upload to S3
+                s3_url = s3_manager.upload_base64(base64_str, user_id, filename)
+                updated_card['image'] = s3_url
+            else:
+                updated_card['image'] = None
+        except Exception as e:
+            logging.error(f"Failed to process image for card: {e}", exc_info=True)
+            updated_card['image'] = None
+    return updated_card
+
 def upload_card_images(cards, user_id):
     """
     Iterate through the provided cards. If a card's image field is a base64 data URL,
     upload it to S3 and replace the image field with the S3 URL. If it's already a URL,
     leave it as is.
+
+    Uploads run concurrently on a bounded thread pool sharing the S3 client;
+    the returned list keeps the input card order.
     """
-    updated_cards = []
-    for card in cards:
-        updated_card = card.copy()
-        if 'image' in updated_card and updated_card['image']:
-            try:
-                # Check if it's already an S3 URL or any HTTPS URL
-                if updated_card['image'].startswith('https://'):
-                    updated_cards.append(updated_card)
-                    continue
-
-                # Check if it's a base64-encoded image
-                if is_base64_image(updated_card['image']):
-                    # Extract base64 portion
-                    base64_str = updated_card['image'].split(';base64,')[-1]
-                    # Generate a unique filename
-                    filename = f"flashcard_{datetime.utcnow().timestamp()}_{secrets.token_hex(8)}.png"
-                    # Upload to S3
-                    s3_url = s3_manager.upload_base64(base64_str, user_id, filename)
-                    updated_card['image'] = s3_url
-                else:
-                    updated_card['image'] = None
-            except Exception as e:
-                logging.error(f"Failed to process image for card: {e}", exc_info=True)
-                updated_card['image'] = None
-        updated_cards.append(updated_card)
-    return updated_cards
+    pending = [
+        card for card in cards
+        if isinstance(card.get('image'), str) and is_base64_image(card['image'])
+    ]
+    if len(pending) <= 1:
+        return [upload_card_image(card, user_id) for card in cards]
+
+    workers = min(Config.S3_UPLOAD_MAX_WORKERS, len(pending))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='card-upload') as executor:
+        return list(executor.map(lambda card: upload_card_image(card, user_id), cards))
 
 @flashcards_bp.route('/decks', methods=['POST'])
 @jwt_required()
@@ -100,51 +125,72 @@ def create_deck():
                     'lastAnswered': None
                 } for i in range(len(cards))
             },
+            "progress_counts": initial_progress_counts(len(cards)),
+            "schedules_seeded": True,
             "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "updated_at": datetime.utcnow(),
+            "version": 1
         }
 
         result = flashcards_collection.insert_one(new_deck)
-        new_deck["_id"] = str(result.inserted_id)
+        card_scheduler.seed_deck(user_id, result.inserted_id, len(cards), new_deck["created_at"])
 
         return jsonify(new_deck), 201
     except Exception as e:
         logging.error(f"Error creating deck: {e}", exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
+# Left out of deck listings so the payload stays O(decks)
+DECK_HIDDEN_FIELDS = ("cards", "cardStates", "progress", "applied_batches")
+
+# Counters for decks written before progress_counts was maintained, derived from cardStates
+_LEGACY_STATUSES = {"$map": {
+    "input": {"$objectToArray": {"$ifNull": ["$cardStates", {}]}},
+    "in": "$$this.v.status"
+}}
+LEGACY_PROGRESS_COUNTS = {"$let": {
+    "vars": {
+        "total": {"$size": {"$ifNull": ["$cards", []]}},
+        "learned": {"$size": {"$filter": {"input": _LEGACY_STATUSES, "cond": {"$eq": ["$$this", "learned"]}}}},
+        "mastered": {"$size": {"$filter": {"input": _LEGACY_STATUSES, "cond": {"$eq": ["$$this", "mastered"]}}}}
+    },
+    "in": {
+        "learned": "$$learned",
+        "mastered": "$$mastered",
+        "unfamiliar": {"$subtract": ["$$total", {"$add": ["$$learned", "$$mastered"]}]},
+        "total": "$$total"
+    }
+}}
+# Stored progress_counts, derived from cardStates only for decks that lack it
+WITH_PROGRESS_COUNTS = {"$addFields": {"progress_counts": {"$cond": [
+    {"$gt": ["$progress_counts", None]},
+    "$progress_counts",
+    LEGACY_PROGRESS_COUNTS
+]}}}
+
 @flashcards_bp.route('/decks', methods=['GET'])
 @jwt_required()
 @cross_origin()
 def list_decks():
+    """
+    Deck summaries for the dashboard. Cards, card states and progress lists
+    are projected out, so the payload grows with the number of decks only;
+    progress_counts is maintained on write.
+    """
     try:
         user_id = get_jwt_identity()
-        decks_cursor = flashcards_collection.find({"user_id": user_id})
-        decks = []
-        for deck in decks_cursor:
-            # Calculate progress for each deck
-            total_cards = len(deck.get('cards', []))
-            if total_cards > 0:
-                learned_count = len([c for c in deck.get('cards', []) if c.get('learned') and not c.get('mastered')])
-                mastered_count = len([c for c in deck.get('cards', []) if c.get('mastered')])
-                unfamiliar_count = total_cards - learned_count - mastered_count
-
-                deck['progress_counts'] = {
-                    'learned': learned_count,
-                    'mastered': mastered_count,
-                    'unfamiliar': unfamiliar_count,
-                    'total': total_cards
-                }
-            else:
-                deck['progress_counts'] = {
-                    'learned': 0,
-                    'mastered': 0,
-                    'unfamiliar': 0,
-                    'total': 0
-                }
-            
-            deck["_id"] = str(deck["_id"])
-            decks.append(deck)
-        return jsonify({"decks": decks}), 200
+        try:
+            page = PageRequest.from_args(request.args, DECK_HIDDEN_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        decks, next_cursor = page.finish(list(flashcards_collection.aggregate([
+            {"$match": {"user_id": user_id}},
+            *page.pipeline(),
+            WITH_PROGRESS_COUNTS,
+            {"$project": page.projection(DECK_HIDDEN_FIELDS)}
+        ])))
+        return jsonify({"decks": decks, "next_cursor": next_cursor}), 200
     except Exception as e:
         logging.error(f"Error listing decks: {e}", exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
@@ -155,51 +201,27 @@ def list_decks():
 def get_deck(deck_id):
     try:
         user_id = get_jwt_identity()
-        deck = flashcards_collection.find_one({"_id": ObjectId(deck_id), "user_id": user_id})
-        if not deck:
+        deck_filter = {"_id": ObjectId(deck_id), "user_id": user_id}
+
+        # Revalidation only needs the version fields
+        if request.if_none_match:
+            versions = flashcards_collection.find_one(deck_filter, VERSION_PROJECTION)
+            if not versions:
+                return jsonify({"error": "Deck not found"}), 404
+            etag = matching_etag(document_etag(versions))
+            if etag:
+                return not_modified(etag)
+
+        # progress_counts is maintained on write; cardStates is returned as stored
+        decks = list(flashcards_collection.aggregate([
+            {"$match": deck_filter},
+            {"$project": {"applied_batches": 0}},
+            WITH_PROGRESS_COUNTS
+        ]))
+        if not decks:
             return jsonify({"error": "Deck not found"}), 404
-
-        # Ensure progress structure exists
-        if 'progress' not in deck:
-            deck['progress'] = {
-                'learned': [],
-                'mastered': [],
-                'unfamiliar': list(range(len(deck.get('cards', []))))
-            }
-
-        # Initialize cardStates if not present
-        if 'cardStates' not in deck:
-            deck['cardStates'] = {
-                str(i): {
-                    'streak': 0,
-                    'status': 'unfamiliar',
-                    'lastAnswered': None
-                } for i in range(len(deck.get('cards', [])))
-            }
-
-        # Update cards with their current states
-        for i, card in enumerate(deck.get('cards', [])):
-            card_state = deck['cardStates'].get(str(i), {})
-            card['status'] = card_state.get('status', 'unfamiliar')
-            card['streak'] = card_state.get('streak', 0)
-            card['learned'] = card_state.get('status') in ['learned', 'mastered']
-            card['mastered'] = card_state.get('status') == 'mastered'
-
-        # Calculate progress counts for TestUI
-        total_cards = len(deck.get('cards', []))
-        learned_count = len([c for c in deck.get('cards', []) if c.get('learned') and not c.get('mastered')])
-        mastered_count = len([c for c in deck.get('cards', []) if c.get('mastered')])
-        unfamiliar_count = total_cards - learned_count - mastered_count
-
-        deck['progress_counts'] = {
-            'learned': learned_count,
-            'mastered': mastered_count,
-            'unfamiliar': unfamiliar_count,
-            'total': total_cards
-        }
-
-        deck["_id"] = str(deck["_id"])
-        return jsonify(deck), 200
+        deck = decks[0]
+        return with_etag(jsonify(deck), document_etag(deck)), 200
     except Exception as e:
         logging.error(f"Error fetching deck: {e}", exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
@@ -241,25 +263,59 @@ def update_deck(deck_id):
                     'lastAnswered': None
                 } for i in range(len(updated_cards))
             }
+            update_fields["progress_counts"] = initial_progress_counts(len(updated_cards))
+            update_fields["schedules_seeded"] = True
 
-        update_fields["updated_at"] = datetime.utcnow()
+        # A single-document update is atomic; no transaction needed
+        flashcards_collection.update_one(
+            {"_id": ObjectId(deck_id)},
+            bump_version({"$set": update_fields})
+        )
 
-        with client.start_session() as session:
-            with session.start_transaction():
-                flashcards_collection.update_one(
-                    {"_id": ObjectId(deck_id)},
-                    {"$set": update_fields},
-                    session=session
-                )
+        if "cards" in data:
+            card_scheduler.seed_deck(user_id, ObjectId(deck_id), len(update_fields["cards"]))
 
-        updated_deck = flashcards_collection.find_one({"_id": ObjectId(deck_id)})
-        updated_deck["_id"] = str(updated_deck["_id"])
+        updated_deck = flashcards_collection.find_one({"_id": ObjectId(deck_id)}, {"applied_batches": 0})
         return jsonify(updated_deck), 200
 
     except Exception as e:
         logging.error(f"Error updating deck: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+def _answered_at(state):
+    """A card state's lastAnswered as a datetime, or None if never answered or unreadable."""
+    value = (state or {}).get('lastAnswered')
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return parse_answer_timestamp(value)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+def legacy_schedule_changes(old_states, new_states, card_count):
+    """
+    Translate a whole-deck cardStates replacement (PUT /progress) into
+    scheduler changes. A card answered since its stored state is a review,
+    graded correct if its streak went up; a card that lost its lastAnswered
+    was reset and starts its schedule over.
+
+    Returns:
+        tuple: ([(card_index, quality, answered_at)], [card indexes to reset])
+    """
+    reviews, reset = [], []
+    for i in range(card_count):
+        old, new = old_states.get(str(i)) or {}, new_states.get(str(i)) or {}
+        old_answered, new_answered = _answered_at(old), _answered_at(new)
+        if new_answered is None:
+            if old_answered is not None:
+                reset.append(i)
+        elif new_answered != old_answered:
+            correct = new.get('streak', 0) > old.get('streak', 0)
+            reviews.append((i, CORRECT_QUALITY if correct else INCORRECT_QUALITY, new_answered))
+    return reviews, reset
+
 @flashcards_bp.route('/decks/<deck_id>/progress', methods=['PUT'])
 @jwt_required()
 @cross_origin()
@@ -279,8 +335,7 @@ def update_deck_progress(deck_id):
         # Store both progress and cardStates
         update_data = {
             "progress": data['progress'],
-            "cardStates": data.get('cardStates', {}),
-            "updated_at": datetime.utcnow()
+            "cardStates": data.get('cardStates', {})
         }
 
         # Update cards with their states
@@ -298,15 +353,20 @@ def update_deck_progress(deck_id):
             updated_cards.append(updated_card)
 
         update_data['cards'] = updated_cards
+        update_data['progress_counts'] = progress_counts_from_states(data.get('cardStates', {}), len(updated_cards))
 
         result = flashcards_collection.update_one(
             {"_id": ObjectId(deck_id), "user_id": user_id},
-            {"$set": update_data}
+            bump_version({"$set": update_data})
         )
 
         if result.modified_count == 0:
             return jsonify({"error": "Failed to update progress"}), 500
 
+        reviews, reset = legacy_schedule_changes(deck.get('cardStates') or {}, update_data['cardStates'], len(updated_cards))
+        card_scheduler.record_reviews(user_id, deck['_id'], reviews)
+        card_scheduler.reset_cards(user_id, deck['_id'], reset)
+
         # Calculate and return progress counts
         total_cards = len(updated_cards)
         learned_count = len([c for c in updated_cards if c.get('learned') and not c.get('mastered')])
@@ -326,6 +386,289 @@ def update_deck_progress(deck_id):
         logging.error(f"Error updating deck progress: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+MAX_PROGRESS_EVENTS = 500
+PROGRESS_PATCH_RETRIES = 5
+# Recent PATCH batch ids kept per deck so a resent batch is not applied twice
+APPLIED_BATCH_HISTORY = 50
+MAX_BATCH_ID_LENGTH = 64
+
+def names_cards_by_id(events) -> bool:
+    """True if any answer event names its card by 'card_id' rather than 'index'."""
+    return isinstance(events, list) and any(
+        isinstance(event, dict) and event.get('index') is None and 'card_id' in event for event in events
+    )
+
+
+def progress_list_changes(old_states, new_states):
+    """{status: (indexes leaving its progress list, indexes joining it)} for the lists a batch changes."""
+    changes = {}
+    for i, new_state in new_states.items():
+        old_status, new_status = card_status(old_states[i]), new_state['status']
+        if old_status != new_status:
+            changes.setdefault(old_status, (set(), set()))[0].add(i)
+            changes.setdefault(new_status, (set(), set()))[1].add(i)
+    return changes
+
+
+def apply_progress_list_changes(deck_oid, update_filter, update, changes):
+    """
+    Add the progress list changes to a PATCH update. A list that only loses
+    or only gains cards gets a $pull or $addToSet; MongoDB rejects both on
+    one path, so a list that does both is read and $set, with the value read
+    added to the filter like the card states.
+    """
+    both = [status for status, (removed, added) in changes.items() if removed and added]
+    stored = {}
+    if both:
+        deck = flashcards_collection.find_one({"_id": deck_oid}, {f"progress.{status}": 1 for status in both})
+        stored = (deck or {}).get('progress') or {}
+
+    for status, (removed, added) in changes.items():
+        path = f"progress.{status}"
+        if status in both:
+            current = stored.get(status)
+            update_filter[path] = current
+            update["$set"][path] = sorted(set(current or []) - removed | added)
+        elif removed:
+            update.setdefault("$pull", {})[path] = {"$in": sorted(removed)}
+        else:
+            update.setdefault("$addToSet", {})[path] = {"$each": sorted(added)}
+
+
+def parse_answer_events(events, card_ids=None):
+    """
+    Validate a batch of answer events and resolve each to (card index, correct,
+    answered_at, quality). Events name a card by 'index' or by the card's 'id',
+    resolved through card_ids ({card id: index}), and may carry an SM-2
+    'quality' grade (0-5) instead of the default for right/wrong answers.
+    Raises ValueError with a client-facing message on bad input.
+    """
+    if not isinstance(events, list) or not events:
+        raise ValueError("events must be a non-empty list")
+    if len(events) > MAX_PROGRESS_EVENTS:
+        raise ValueError(f"At most {MAX_PROGRESS_EVENTS} events per request")
+
+    parsed = []
+    for event in events:
+        if not isinstance(event, dict) or not isinstance(event.get('correct'), bool):
+            raise ValueError("Each event needs a boolean 'correct'")
+
+        index = event.get('index')
+        if index is None and 'card_id' in event:
+            index = (card_ids or {}).get(event['card_id'])
+        if isinstance(index, bool) or not isinstance(index, int) or index < 0:
+            raise ValueError("Each event needs a valid card 'index' or 'card_id'")
+
+        try:
+            answered_at = parse_answer_timestamp(event.get('timestamp'))
+        except (TypeError, ValueError, OverflowError, OSError):
+            raise ValueError("Invalid event timestamp")
+        quality = event.get('quality', CORRECT_QUALITY if event['correct'] else INCORRECT_QUALITY)
+        if isinstance(quality, bool) or not isinstance(quality, int) or not 0 <= quality <= 5:
+            raise ValueError("Event 'quality' must be an integer from 0 to 5")
+        parsed.append((index, event['correct'], answered_at, quality))
+    return parsed
+
+@flashcards_bp.route('/decks/<deck_id>/progress', methods=['PATCH'])
+@jwt_required()
+@cross_origin()
+def patch_deck_progress(deck_id):
+    """
+    Apply a batch of answer events to individual card states.
+
+    Only the affected cardStates entries are read and written, and
+    progress_counts and the progress index lists are adjusted in the same
+    update. The update is conditional on the card states read, so concurrent
+    sessions retry instead of overwriting each other.
+
+    An optional 'batch_id' makes the batch idempotent: it is recorded with
+    the update, and a batch whose id was already applied returns the current
+    counters without changing anything, so a client can safely resend a
+    batch whose response it never saw.
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        deck_oid = ObjectId(deck_id)
+
+        # Card ids are resolved against the deck, so a missing deck is reported
+        # as such rather than as unknown cards
+        card_ids = None
+        if names_cards_by_id(data.get('events')):
+            deck = flashcards_collection.find_one({"_id": deck_oid, "user_id": user_id}, {"cards.id": 1})
+            if not deck:
+                return jsonify({"error": "Deck not found"}), 404
+            card_ids = {card.get('id'): i for i, card in enumerate(deck.get('cards', []))}
+
+        try:
+            events = parse_answer_events(data.get('events'), card_ids)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        batch_id = data.get('batch_id')
+        if batch_id is not None and (not isinstance(batch_id, str) or not 0 < len(batch_id) <= MAX_BATCH_ID_LENGTH):
+            return jsonify({"error": f"batch_id must be a string of at most {MAX_BATCH_ID_LENGTH} characters"}), 400
+
+        indexes = sorted({index for index, _, _, _ in events})
+        for _ in range(PROGRESS_PATCH_RETRIES):
+            projection = {f"cardStates.{i}": 1 for i in indexes}
+            projection.update({
+                "progress_counts": 1,
+                "card_count": {"$size": {"$ifNull": ["$cards", []]}}
+            })
+            if batch_id is not None:
+                projection["batch_applied"] = {"$in": [batch_id, {"$ifNull": ["$applied_batches", []]}]}
+            decks = list(flashcards_collection.aggregate([
+                {"$match": {"_id": deck_oid, "user_id": user_id}},
+                {"$project": projection}
+            ]))
+            if not decks:
+                return jsonify({"error": "Deck not found"}), 404
+            deck = decks[0]
+            if deck.get('batch_applied'):
+                # Applying a batch always stores progress_counts
+                return jsonify({
+                    "message": "Batch already applied",
+                    "progress_counts": deck['progress_counts']
+                }), 200
+            if indexes[-1] >= deck['card_count']:
+                return jsonify({"error": "Card index out of range"}), 400
+
+            stored_states = deck.get('cardStates', {})
+            old_states = {i: stored_states.get(str(i)) for i in indexes}
+            new_states = {i: dict(old_states[i] or default_card_state()) for i in indexes}
+            for index, correct, answered_at, _ in events:
+                new_states[index] = apply_answer(new_states[index], correct, answered_at)
+
+            count_deltas = {status: 0 for status in CARD_STATUSES}
+            for i in indexes:
+                count_deltas[card_status(old_states[i])] -= 1
+                count_deltas[new_states[i]['status']] += 1
+
+            # Only write if the card states are still what we read
+            update_filter = {
+                "_id": deck_oid,
+                "user_id": user_id,
+                "$expr": {"$lt": [indexes[-1], {"$size": {"$ifNull": ["$cards", []]}}]}
+            }
+            for i in indexes:
+                if old_states[i] is None:
+                    update_filter[f"cardStates.{i}"] = {"$exists": False}
+                else:
+                    for field in ('streak', 'status', 'lastAnswered'):
+                        update_filter[f"cardStates.{i}.{field}"] = old_states[i].get(field)
+
+            update = bump_version({"$set": {f"cardStates.{i}": new_states[i] for i in indexes}})
+            apply_progress_list_changes(deck_oid, update_filter, update, progress_list_changes(old_states, new_states))
+            if 'progress_counts' in deck:
+                update_filter["progress_counts"] = {"$exists": True}
+                update["$inc"].update({f"progress_counts.{k}": v for k, v in count_deltas.items() if v})
+            else:
+                # Decks written before counters were maintained get them seeded here
+                full = flashcards_collection.find_one({"_id": deck_oid}, {"cardStates": 1})
+                merged_states = {**full.get('cardStates', {}), **{str(i): new_states[i] for i in indexes}}
+                update_filter["progress_counts"] = {"$exists": False}
+                update["$set"]["progress_counts"] = progress_counts_from_states(merged_states, deck['card_count'])
+            if batch_id is not None:
+                update_filter["applied_batches"] = {"$ne": batch_id}
+                update["$push"] = {"applied_batches": {"$each": [batch_id], "$slice": -APPLIED_BATCH_HISTORY}}
+
+            updated = flashcards_collection.find_one_and_update(
+                update_filter,
+                update,
+                projection={"progress_counts": 1},
+                return_document=ReturnDocument.AFTER
+            )
+            if updated:
+                schedules = card_scheduler.record_reviews(
+                    user_id, deck_oid, [(index, quality, answered_at) for index, _, answered_at, quality in events]
+                )
+                return jsonify({
+                    "message": "Progress updated successfully",
+                    "progress_counts": updated['progress_counts'],
+                    "cardStates": {str(i): new_states[i] for i in indexes},
+                    "schedules": {str(i): schedule for i, schedule in schedules.items()}
+                }), 200
+
+        return jsonify({"error": "Progress was modified concurrently, please retry"}), 409
+
+    except Exception as e:
+        logging.error(f"Error patching deck progress: {e}", exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+DEFAULT_DUE_LIMIT = 20
+MAX_DUE_LIMIT = 100
+
+@flashcards_bp.route('/due', methods=['GET'])
+@jwt_required()
+@cross_origin()
+def get_due_cards():
+    """
+    The next N cards due for review across all of the user's decks, oldest
+    due first. Schedules come from the (user_id, next_due) index and only the
+    selected cards are pulled out of their decks, so the cost depends on N
+    rather than on how many decks or cards the user has.
+    """
+    try:
+        user_id = get_jwt_identity()
+        try:
+            limit = int(request.args.get('limit', DEFAULT_DUE_LIMIT))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        limit = max(1, min(limit, MAX_DUE_LIMIT))
+
+        due = card_scheduler.due_cards(user_id, limit)
+        if not due:
+            return jsonify({"cards": []}), 200
+
+        indexes_by_deck = {}
+        for entry in due:
+            indexes_by_deck.setdefault(entry['deck_id'], []).append(entry['card_index'])
+
+        # Pick just the due cards out of each deck server-side
+        decks = flashcards_collection.aggregate([
+            {"$match": {"_id": {"$in": list(indexes_by_deck)}, "user_id": user_id}},
+            {"$project": {
+                "title": 1,
+                "due_cards": {"$map": {
+                    "input": {"$switch": {
+                        "branches": [
+                            {"case": {"$eq": ["$_id", deck_oid]}, "then": indexes}
+                            for deck_oid, indexes in indexes_by_deck.items()
+                        ],
+                        "default": []
+                    }},
+                    "as": "i",
+                    "in": {"$arrayElemAt": ["$cards", "$$i"]}
+                }}
+            }}
+        ])
+        cards_by_deck = {
+            deck['_id']: (deck.get('title'), dict(zip(indexes_by_deck[deck['_id']], deck['due_cards'])))
+            for deck in decks
+        }
+
+        cards = []
+        for entry in due:
+            title, deck_cards = cards_by_deck.get(entry['deck_id'], (None, {}))
+            card = deck_cards.get(entry['card_index'])
+            if card is None:
+                continue
+            cards.append({
+                "deck_id": str(entry['deck_id']),
+                "deck_title": title,
+                "card_index": entry['card_index'],
+                "card": card,
+                "ease": entry['ease'],
+                "interval": entry['interval'],
+                "repetitions": entry['repetitions'],
+                "next_due": entry['next_due']
+            })
+        return jsonify({"cards": cards}), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching due cards: {e}", exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
 @flashcards_bp.route('/decks/<deck_id>', methods=['DELETE'])
 @jwt_required()
 @cross_origin()
@@ -348,6 +691,7 @@ def delete_deck(deck_id):
                     logging.error(f"Failed to delete image {image_url} from S3: {e}", exc_info=True)
 
         flashcards_collection.delete_one({"_id": ObjectId(deck_id), "user_id": user_id})
+        card_scheduler.delete_deck(ObjectId(deck_id))
         return jsonify({"message": "Deck deleted successfully"}), 200
     except Exception as e:
         logging.error(f"Error deleting deck: {e}", exc_info=True)
@@ -384,7 +728,7 @@ def generate_deck_from_note():
         cleaned_content = re.sub('<[^<]+?>', '', content)
 
         # Use GPT to generate flashcards from the cleaned text
-        flashcards = gpt_manager.generate_flashcards(cleaned_content)
+        flashcards = gpt_manager.generate_flashcards(cleaned_content, use_cache=not data.get('bypass_cache'))
         if not flashcards or not isinstance(flashcards, list):
             return jsonify({'error': 'Failed to generate flashcards'}), 500
 
@@ -410,12 +754,15 @@ def generate_deck_from_note():
                     'lastAnswered': None
                 } for i in range(len(flashcards))
             },
+            "progress_counts": initial_progress_counts(len(flashcards)),
+            "schedules_seeded": True,
             "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "updated_at": datetime.utcnow(),
+            "version": 1
         }
 
         result = flashcards_collection.insert_one(new_deck)
-        new_deck["_id"] = str(result.inserted_id)
+        card_scheduler.seed_deck(user_id, result.inserted_id, len(flashcards), new_deck["created_at"])
 
         return jsonify({
             'message': 'Flashcards generated successfully',
@@ -1,27 +1,59 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
-from pymongo import MongoClient
 from datetime import datetime
 from bson import ObjectId
-from models import Note
-from utils.s3_manager import S3Manager
-from utils.gpt_api import GPTManager
+from utils.s3_manager import s3_manager
+from utils.gpt_api import gpt_manager
 import logging
+import base64
+import json
+import re
 from config import Config
+from utils.database import collection
+from utils.jobs import job_queue
+from utils.ocr_cache import ocr_cache, sha256_of_file
+from utils.text_extraction import extract_local_text, needs_ocr
+from utils.pagination import PageRequest
+from utils.etags import VERSION_PROJECTION, bump_version, document_etag, matching_etag, not_modified, with_etag
 
 notes_bp = Blueprint('notes', __name__)
 
-# Initialize MongoDB connection
-client = MongoClient(Config.MONGODB_URI)
-db = client['notes_app']
-notes_collection = db['notes']
-generated_notes_collection = db['generated_notes']
-subjects_collection = db['subjects']
+DEFAULT_COVER_IMAGE_URL = "https://cdn1.vectorstock.com/i/1000x1000/39/90/write-note-school-activity-cartoon-graphic-design-vector-21513990.jpg"
+
+# Never returned by the listing endpoints
+NOTE_HIDDEN_FIELDS = ('extracted_text',)
 
-# Initialize S3 and GPT managers
-s3_manager = S3Manager(Config)
-gpt_manager = GPTManager()
+# Initialize MongoDB connection
+notes_collection = collection('notes')
+generated_notes_collection = collection('generated_notes')
+subjects_collection = collection('subjects')
+
+
+def attach_subject_names(notes):
+    """
+    Set 'subject_name' on each note that references a subject, resolving all
+    subjects with a single $in query instead of one lookup per note.
+    """
+    subject_ids = {
+        str(note['subject_id']) for note in notes
+        if note.get('subject_id') and ObjectId.is_valid(str(note['subject_id']))
+    }
+    if not subject_ids:
+        return notes
+
+    subjects = subjects_collection.find(
+        {'_id': {'$in': [ObjectId(sid) for sid in subject_ids]}},
+        {'subject_name': 1}
+    )
+    subject_names = {str(subject['_id']): subject['subject_name'] for subject in subjects}
+
+    for note in notes:
+        if note.get('subject_id'):
+            subject_name = subject_names.get(str(note['subject_id']))
+            if subject_name:
+                note['subject_name'] = subject_name
+    return notes
 
 
 @notes_bp.route('/upload', methods=['POST'])
@@ -45,7 +77,7 @@ def upload_note():
 
         extension = file.filename.rsplit('.', 1)[1].lower()
         if extension not in Config.ALLOWED_EXTENSIONS:
-            return jsonify({'error': f'File type not allowed.'}), 400
+            return jsonify({'error': 'File type not allowed.'}), 400
 
         if not subject_id:
             return jsonify({'error': 'Subject ID is required'}), 400
@@ -54,6 +86,9 @@ def upload_note():
         if not subject:
             return jsonify({'error': 'Subject not found'}), 404
 
+        # Hash the file so OCR results can be reused for identical uploads
+        file_sha256 = sha256_of_file(file)
+
         # Upload file to S3 (for OCR)
         s3_url = s3_manager.upload_file(file, user_id)
         content_type = file.content_type or 'image/jpeg'
@@ -64,11 +99,11 @@ def upload_note():
             cover_image = request.files['cover_image']
             cover_image_extension = cover_image.filename.rsplit('.', 1)[1].lower()
             if cover_image_extension not in Config.ALLOWED_EXTENSIONS:
-                return jsonify({'error': f'Cover image file type not allowed.'}), 400
+                return jsonify({'error': 'Cover image file type not allowed.'}), 400
             cover_image_url = s3_manager.upload_file(cover_image, user_id)
         else:
             # Optionally set a default placeholder image
-            cover_image_url = "https://cdn1.vectorstock.com/i/1000x1000/39/90/write-note-school-activity-cartoon-graphic-design-vector-21513990.jpg"
+            cover_image_url = DEFAULT_COVER_IMAGE_URL
 
         note = {
             'user_id': user_id,
@@ -78,7 +113,10 @@ def upload_note():
             's3_url': s3_url,
             'subject_id': subject_id,
             'content_type': content_type,
+            'file_sha256': file_sha256,
             'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow(),
+            'version': 1,
             'status': 'pending',
             'cover_image_url': cover_image_url  # store cover image url
         }
@@ -95,6 +133,165 @@ def upload_note():
         logging.error(f"Upload error: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
     
+def _validate_direct_upload(upload, label):
+    """
+    Check the filename, content type and size a client declares before it
+    uploads to S3. Returns an error message, or None if the upload is allowed.
+    """
+    if not isinstance(upload, dict) or not upload.get('filename') or not upload.get('content_type'):
+        return f'{label} filename and content_type are required'
+    filename = upload['filename']
+    if '.' not in filename or filename.rsplit('.', 1)[1].lower() not in Config.ALLOWED_EXTENSIONS:
+        return f'{label} type not allowed.'
+    size = upload.get('size')
+    if not isinstance(size, int) or size <= 0 or size > Config.MAX_UPLOAD_BYTES:
+        return f'{label} size must be between 1 and {Config.MAX_UPLOAD_BYTES} bytes'
+    if upload.get('sha256') is not None and not _is_sha256_hex(upload['sha256']):
+        return f'{label} sha256 must be a hex-encoded SHA-256 digest'
+    return None
+
+
+def _is_sha256_hex(value):
+    return isinstance(value, str) and re.fullmatch(r'[0-9a-fA-F]{64}', value) is not None
+
+
+def _direct_upload_policy(upload, user_id):
+    key = s3_manager.direct_upload_key(user_id, upload['filename'])
+    post = s3_manager.generate_presigned_post(
+        key, upload['content_type'], Config.MAX_UPLOAD_BYTES, expiration=Config.UPLOAD_URL_EXPIRATION,
+        checksum_sha256=upload.get('sha256')
+    )
+    return {'key': key, 'url': post['url'], 'fields': post['fields']}
+
+
+def _verify_direct_upload(key, user_id):
+    """
+    HEAD an object the client says it uploaded. Returns its metadata if it is
+    under the user's uploads/ prefix, exists and is within the size limit.
+    """
+    if not isinstance(key, str) or not key.startswith(f"users/{user_id}/uploads/"):
+        return None
+    head = s3_manager.head_file(key)
+    if not head or head.get('ContentLength', 0) > Config.MAX_UPLOAD_BYTES:
+        return None
+    return head
+
+
+@notes_bp.route('/upload/init', methods=['POST'])
+@jwt_required()
+@cross_origin()
+def init_direct_upload():
+    """
+    Step one of the direct upload flow: validate the file (and optional cover
+    image) and return presigned POST policies for uploading them to S3.
+    A declared 'sha256' (hex) is pinned in the file's policy so S3 verifies it.
+    """
+    try:
+        data = request.get_json()
+        user_id = get_jwt_identity()
+
+        error = _validate_direct_upload(data.get('file'), 'File')
+        if not error and data.get('cover_image'):
+            error = _validate_direct_upload(data['cover_image'], 'Cover image')
+        if error:
+            return jsonify({'error': error}), 400
+
+        subject_id = data.get('subject_id')
+        if not subject_id:
+            return jsonify({'error': 'Subject ID is required'}), 400
+
+        subject = subjects_collection.find_one({'_id': ObjectId(subject_id), 'user_id': user_id}, {'_id': 1})
+        if not subject:
+            return jsonify({'error': 'Subject not found'}), 404
+
+        response = {'file': _direct_upload_policy(data['file'], user_id)}
+        if data.get('cover_image'):
+            response['cover_image'] = _direct_upload_policy(data['cover_image'], user_id)
+
+        return jsonify(response), 200
+    except Exception as e:
+        logging.error(f"Upload init error: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@notes_bp.route('/upload/confirm', methods=['POST'])
+@jwt_required()
+@cross_origin()
+def confirm_direct_upload():
+    """
+    Step two of the direct upload flow: check the uploaded objects with a HEAD
+    request and create the note. When the client declared a 'sha256' at init
+    it sends it again here and it must match the checksum S3 stored.
+    """
+    try:
+        data = request.get_json()
+        user_id = get_jwt_identity()
+        title = data.get('title')
+        description = data.get('description')
+        subject_id = data.get('subject_id')
+
+        if not title or not description:
+            return jsonify({'error': 'Title and Description are required'}), 400
+
+        if not subject_id:
+            return jsonify({'error': 'Subject ID is required'}), 400
+
+        subject = subjects_collection.find_one({'_id': ObjectId(subject_id), 'user_id': user_id}, {'_id': 1})
+        if not subject:
+            return jsonify({'error': 'Subject not found'}), 404
+
+        key = data.get('key')
+        head = _verify_direct_upload(key, user_id)
+        if not head:
+            return jsonify({'error': 'Uploaded file not found'}), 400
+
+        cover_image_url = DEFAULT_COVER_IMAGE_URL
+        if data.get('cover_image_key'):
+            if not _verify_direct_upload(data['cover_image_key'], user_id):
+                return jsonify({'error': 'Uploaded cover image not found'}), 400
+            cover_image_url = s3_manager.object_url(data['cover_image_key'])
+
+        # S3 returns a SHA-256 checksum when the policy pinned one on upload;
+        # multipart checksums ("<digest>-<parts>") are not content hashes
+        file_sha256 = None
+        if head.get('ChecksumSHA256') and '-' not in head['ChecksumSHA256']:
+            file_sha256 = base64.b64decode(head['ChecksumSHA256']).hex()
+
+        declared_sha256 = data.get('sha256')
+        if declared_sha256 is not None:
+            if not _is_sha256_hex(declared_sha256) or file_sha256 != declared_sha256.lower():
+                return jsonify({'error': 'Uploaded file checksum does not match'}), 400
+
+        s3_url = s3_manager.object_url(key)
+        note = {
+            'user_id': user_id,
+            'title': title.strip(),
+            'description': description.strip(),
+            'filename': key.rsplit('/', 1)[-1].split('_', 1)[-1],
+            's3_url': s3_url,
+            'subject_id': subject_id,
+            'content_type': head.get('ContentType') or 'image/jpeg',
+            'file_sha256': file_sha256,
+            'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow(),
+            'version': 1,
+            'status': 'pending',
+            'cover_image_url': cover_image_url
+        }
+
+        result = notes_collection.insert_one(note)
+
+        return jsonify({
+            'message': 'File uploaded successfully',
+            'note_id': str(result.inserted_id),
+            's3_url': s3_url,
+            'cover_image_url': cover_image_url
+        }), 201
+    except Exception as e:
+        logging.error(f"Upload confirm error: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @notes_bp.route('/generate', methods=['POST'])
 @jwt_required()
 def generate_notes():
@@ -104,46 +301,302 @@ def generate_notes():
         user_id = get_jwt_identity()
 
         # Fetch the note
-        note = notes_collection.find_one({'_id': note_id, 'user_id': user_id})
+        note = notes_collection.find_one({'_id': note_id, 'user_id': user_id}, {'s3_url': 1})
         if not note:
             return jsonify({'error': 'Note not found'}), 404
 
         image_url = note['s3_url']
-        # Extract key from image_url
         # Assuming s3_url is like: https://<bucket>.s3.amazonaws.com/users/<user_id>/<filename>
         # Bucket is config.S3_BUCKET
         base_url = f"https://{Config.S3_BUCKET}.s3.amazonaws.com/"
         if not image_url.startswith(base_url):
             return jsonify({'error': 'Invalid S3 URL'}), 400
 
-        s3_key = image_url[len(base_url):]
+        # OCR and GPT generation run on the job queue; poll /notes/jobs/<job_id>
+        notes_collection.update_one({'_id': note_id}, bump_version({'$set': {'status': 'pending'}, '$unset': {'job_id': ''}}))
+        job_id = job_queue.submit('generate_notes', run_note_generation, user_id, note_id=str(note_id),
+                                  bypass_cache=bool(data.get('bypass_cache')))
+
+        return jsonify({
+            'message': 'Note generation started',
+            'job_id': job_id,
+            'note_id': str(note_id),
+            'status': 'pending'
+        }), 202
+
+    except Exception as e:
+        logging.error(f"Generation error: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
 
-        # Extract text from image using Amazon Textract
-        extracted_text_result = gpt_manager.extract_text_from_image(Config.S3_BUCKET, s3_key)
-        extracted_text = extracted_text_result['text']
+def is_pdf_note(note):
+    return (note.get('content_type') == 'application/pdf'
+            or note.get('filename', '').lower().endswith('.pdf'))
+
+
+def needs_background_extraction(note):
+    """
+    A PDF without saved text may need Textract's asynchronous job, which can
+    take up to TEXTRACT_TIMEOUT; request handlers hand those to the job queue.
+    """
+    return note.get('extracted_text') is None and is_pdf_note(note)
+
+
+def submit_text_extraction(note, user_id):
+    """Queue text extraction for a note and return the 202 response to send."""
+    job_id = job_queue.submit('extract_text', run_text_extraction, user_id, note_id=str(note['_id']))
+    return jsonify({
+        'message': 'Text extraction started',
+        'job_id': job_id,
+        'note_id': str(note['_id']),
+        'status': 'pending'
+    }), 202
+
+
+def extract_note_text(note):
+    """
+    Return the text of a note's uploaded file and save it on the note.
+
+    Text already saved on the note is reused, then the cached result for files
+    with the same SHA-256. Otherwise plain text, DOCX and PDFs with a text layer
+    are read locally; only images and scanned PDFs go to Textract (PDFs through
+    its asynchronous multi-page job).
+
+    Returns:
+        dict: {'text': ..., 'method': ...} where method names the path that ran:
+        'saved', 'cache', 'plain', 'docx', 'pdf-text', 'textract' or 'textract-pdf'.
+    """
+    if note.get('extracted_text') is not None:
+        return {'text': note['extracted_text'], 'method': 'saved'}
+
+    file_sha256 = note.get('file_sha256')
+    extracted_text = ocr_cache.get(file_sha256)
+    if extracted_text is not None:
+        result = {'text': extracted_text, 'method': 'cache'}
+    else:
+        base_url = f"https://{Config.S3_BUCKET}.s3.amazonaws.com/"
+        s3_key = note['s3_url'][len(base_url):]
+        content_type = note.get('content_type')
+        filename = note.get('filename', s3_key)
+
+        result = None
+        if not needs_ocr(content_type, filename):
+            result = extract_local_text(s3_manager.get_file(s3_key), content_type, filename)
+
+        # Extract text using Amazon Textract
+        if result is None and is_pdf_note(note):
+            result = {**gpt_manager.extract_text_from_pdf(Config.S3_BUCKET, s3_key), 'method': 'textract-pdf'}
+        elif result is None:
+            result = {**gpt_manager.extract_text_from_image(Config.S3_BUCKET, s3_key), 'method': 'textract'}
+        ocr_cache.put(file_sha256, result['text'])
+
+    logging.info(f"Extracted text for note {note['_id']} via {result['method']}")
+    notes_collection.update_one(
+        {'_id': note['_id']},
+        bump_version({'$set': {'extracted_text': result['text'], 'extraction_method': result['method']}})
+    )
+    return {'text': result['text'], 'method': result['method']}
+
+
+def subject_object_id(value):
+    """A note's subject_id as an ObjectId (notes store it as either), or None."""
+    if value and ObjectId.is_valid(str(value)):
+        return ObjectId(str(value))
+    return None
+
+
+def store_generated_notes(note_id, user_id, content, subject_id=None):
+    # subject_id is copied from the note so /generated_notes/<subject_id> can page by it
+    generated_notes_collection.insert_one({
+        'user_id': user_id,
+        'original_note_id': note_id,
+        'subject_id': subject_object_id(subject_id),
+        **generated_content_fields(content),
+        'created_at': datetime.utcnow()
+    })
+    notes_collection.update_one({'_id': note_id}, bump_version({}))
+
+
+def run_note_generation(job_id, note_id, user_id, bypass_cache=False):
+    """
+    Job handler for /notes/generate: OCR the uploaded file, generate notes and
+    store them, keeping the note's status in step with the job.
+    """
+    note_id = ObjectId(note_id)
+    notes_collection.update_one({'_id': note_id}, bump_version({'$set': {'status': 'processing', 'job_id': job_id}}))
+    try:
+        note = notes_collection.find_one({'_id': note_id, 'user_id': user_id})
+        extracted_text = extract_note_text(note)['text']
 
         # Generate notes from extracted text
-        generated_notes = gpt_manager.generate_notes(extracted_text)
+        generated_notes = gpt_manager.generate_notes(extracted_text, use_cache=not bypass_cache)
 
-        # Store generated notes
-        generated_notes_collection.insert_one({
-            'user_id': user_id,
-            'original_note_id': note_id,
-            'content': generated_notes['summary'],
-            'created_at': datetime.utcnow()
-        })
+        store_generated_notes(note_id, user_id, generated_notes['summary'], note.get('subject_id'))
+    except Exception:
+        notes_collection.update_one({'_id': note_id, 'job_id': job_id}, bump_version({'$set': {'status': 'failed'}}))
+        raise
+
+    # A note that has moved on to a newer job keeps that job's status
+    notes_collection.update_one({'_id': note_id, 'job_id': job_id}, bump_version({'$set': {'status': 'done'}}))
+    return {'summary': generated_notes['summary']}
+
+
+def fail_stranded_note(job):
+    """
+    Stale handler for generate_notes jobs: a job that never finished fails
+    its note too, unless the note has since moved on to another job.
+    """
+    notes_collection.update_one(
+        {'_id': ObjectId(job['payload']['note_id']), 'status': {'$in': ['pending', 'processing']},
+         'job_id': {'$in': [str(job['_id']), None]}},
+        bump_version({'$set': {'status': 'failed'}})
+    )
+
+
+job_queue.on_stale('generate_notes', fail_stranded_note)
+
+
+def run_text_extraction(job_id, note_id, user_id):
+    """Job handler for /notes/extract_text on PDFs: extract and save the text."""
+    note = notes_collection.find_one({'_id': ObjectId(note_id), 'user_id': user_id})
+    if not note:
+        raise ValueError(f"Note {note_id} not found")
+    extracted = extract_note_text(note)
+    return {'extracted_text': extracted['text'], 'extraction_method': extracted['method']}
+
+
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@notes_bp.route('/generate/stream', methods=['POST'])
+@jwt_required()
+@cross_origin()
+def stream_generated_notes():
+    """
+    Generate notes and stream the HTML to the client as Server-Sent Events:
+    'status' events while OCR runs, 'chunk' events carrying HTML fragments,
+    then 'done' once the full content has been saved (or 'error').
+
+    PDFs whose text has not been extracted yet get a 202 with an extraction
+    job id instead; poll /notes/jobs/<job_id> and retry once it is done.
+    """
+    try:
+        data = request.get_json()
+        note_id = ObjectId(data.get('note_id'))
+        user_id = get_jwt_identity()
+        use_cache = not data.get('bypass_cache')
+
+        note = notes_collection.find_one({'_id': note_id, 'user_id': user_id})
+        if not note:
+            return jsonify({'error': 'Note not found'}), 404
+
+        base_url = f"https://{Config.S3_BUCKET}.s3.amazonaws.com/"
+        if not note['s3_url'].startswith(base_url):
+            return jsonify({'error': 'Invalid S3 URL'}), 400
+
+        if needs_background_extraction(note):
+            return submit_text_extraction(note, user_id)
+    except Exception as e:
+        logging.error(f"Streamed generation error: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+    def generate():
+        notes_collection.update_one({'_id': note_id}, bump_version({'$set': {'status': 'processing'}}))
+        finished = False
+        try:
+            yield sse_event('status', {'status': 'extracting'})
+            extracted_text = extract_note_text(note)['text']
+
+            yield sse_event('status', {'status': 'generating'})
+            fragments = []
+            for fragment in gpt_manager.stream_notes(extracted_text, use_cache=use_cache):
+                fragments.append(fragment)
+                yield sse_event('chunk', {'html': fragment})
+
+            store_generated_notes(note_id, user_id, ''.join(fragments), note.get('subject_id'))
+            notes_collection.update_one({'_id': note_id}, bump_version({'$set': {'status': 'done'}}))
+            finished = True
+            yield sse_event('done', {'note_id': str(note_id), 'status': 'done'})
+        except Exception as e:
+            logging.error(f"Streamed generation error: {e}", exc_info=True)
+            notes_collection.update_one({'_id': note_id}, bump_version({'$set': {'status': 'failed'}}))
+            finished = True
+            yield sse_event('error', {'error': 'Internal server error', 'status': 'failed'})
+        finally:
+            if not finished:
+                # The client disconnected (GeneratorExit) before the notes were saved.
+                # There is no job record, so nothing else would ever fail the note.
+                logging.warning(f"Streamed generation for note {note_id} closed before it finished")
+                notes_collection.update_one({'_id': note_id}, bump_version({'$set': {'status': 'failed'}}))
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@notes_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+@cross_origin()
+def get_job_status(job_id):
+    try:
+        user_id = get_jwt_identity()
+        job = job_queue.get(job_id, user_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
 
         return jsonify({
-            'message': 'Notes generated successfully',
-            'summary': generated_notes['summary']
+            'job_id': job['_id'],
+            'type': job['type'],
+            'status': job['status'],
+            'result': job.get('result'),
+            'error': job.get('error'),
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at']
         }), 200
-
     except Exception as e:
-        logging.error(f"Generation error: {e}", exc_info=True)
+        logging.error(f"Job status error: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
 
 
 
+# Generated notes read per round trip by backfill_generated_subjects()
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_generated_subjects(batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Copy subject_id from each note onto its generated notes written before
+    they carried one. Returns the number of generated notes updated.
+
+    This is a one-off maintenance command (flask backfill-generated-subjects),
+    never run at startup. No index covers a missing subject_id, so it walks
+    generated_notes through _id ranges of batch_size documents instead of one
+    unbounded distinct over the collection.
+    """
+    updated = 0
+    # Sorts before every ObjectId, so the first batch is an _id range as well
+    last_id = ObjectId('0' * 24)
+    while True:
+        batch = list(generated_notes_collection.find(
+            {'_id': {'$gt': last_id}, 'subject_id': {'$exists': False}},
+            {'original_note_id': 1}
+        ).sort('_id', 1).limit(batch_size))
+        if not batch:
+            return updated
+        last_id = batch[-1]['_id']
+
+        note_ids = list({doc['original_note_id'] for doc in batch})
+        for note in notes_collection.find({'_id': {'$in': note_ids}}, {'subject_id': 1}):
+            subject_id = subject_object_id(note.get('subject_id'))
+            if subject_id:
+                updated += generated_notes_collection.update_many(
+                    {'original_note_id': note['_id'], 'subject_id': {'$exists': False}},
+                    {'$set': {'subject_id': subject_id}}
+                ).modified_count
+
+
 @notes_bp.route('/add_to_subject', methods=['POST'])
 @jwt_required()
 @cross_origin()
@@ -160,7 +613,8 @@ def add_note_to_subject():
         if not note or not subject:
             return jsonify({'error': 'Note or Subject not found'}), 404
 
-        notes_collection.update_one({'_id': note_id}, {'$set': {'subject_id': subject_id}})
+        notes_collection.update_one({'_id': note_id}, bump_version({'$set': {'subject_id': subject_id}}))
+        generated_notes_collection.update_many({'original_note_id': note_id, 'user_id': user_id}, {'$set': {'subject_id': subject_id}})
         
         return jsonify({'message': 'Note linked to subject successfully'}), 200
     except Exception as e:
@@ -169,22 +623,113 @@ def add_note_to_subject():
 
 
 
+GENERATED_SUMMARY_LENGTH = 200
+
+
+def _summarize_html(html):
+    text = re.sub(r'\s+', ' ', re.sub('<[^<]*?(>|$)', ' ', html)).strip()
+    if len(text) > GENERATED_SUMMARY_LENGTH:
+        text = text[:GENERATED_SUMMARY_LENGTH].rsplit(' ', 1)[0] + '...'
+    return text
+
+
+def generated_content_fields(content):
+    """
+    Generated note content plus its length and plain-text summary, stored
+    alongside it so listings can return either without loading the HTML.
+    """
+    return {'content': content, 'content_length': len(content), 'summary': _summarize_html(content)}
+
+
+def generated_content_stages(page, content_mode):
+    """
+    Aggregation stages joining each note on the page with its generated notes
+    (as 'generated') and projecting the listing fields. The HTML is only kept
+    in full mode; summary and none modes return the stored summary and length.
+    """
+    joined_fields = ['generated.user_id', 'generated.content_length', 'generated.summary']
+    if content_mode == 'full':
+        joined_fields.append('generated.content')
+    if page.fields is None:
+        projection = {field: 0 for field in NOTE_HIDDEN_FIELDS}
+        if content_mode != 'full':
+            projection['generated.content'] = 0
+    else:
+        projection = page.projection(required_fields=joined_fields)
+    return [
+        {'$lookup': {
+            'from': 'generated_notes',
+            'localField': '_id',
+            'foreignField': 'original_note_id',
+            'as': 'generated'
+        }},
+        {'$project': projection}
+    ]
+
+
+def attach_generated_content(notes, user_id, content_mode):
+    """
+    Replace the generated notes joined in by generated_content_stages() with
+    generated_content (content=full) or generated_summary (content=summary),
+    plus generated_content_length. Documents stored before the summary was
+    get it computed from the content in hand in full mode, and from one extra
+    $in query in the other modes.
+    """
+    generated = {}
+    for note in notes:
+        docs = [doc for doc in note.pop('generated', []) if doc.get('user_id') == user_id]
+        if docs:
+            generated[note['_id']] = docs[0]
+
+    legacy_ids = [note_id for note_id, doc in generated.items() if 'content_length' not in doc]
+    if legacy_ids and content_mode == 'full':
+        for note_id in legacy_ids:
+            generated[note_id].update(generated_content_fields(generated[note_id].get('content') or ''))
+    elif legacy_ids:
+        for doc in generated_notes_collection.find(
+                {'original_note_id': {'$in': legacy_ids}, 'user_id': user_id}, {'original_note_id': 1, 'content': 1}):
+            if 'content_length' not in generated[doc['original_note_id']]:
+                generated[doc['original_note_id']].update(generated_content_fields(doc.get('content') or ''))
+
+    for note in notes:
+        doc = generated.get(note['_id'])
+        if doc is None:
+            continue
+        note['generated_content_length'] = doc['content_length']
+        if content_mode == 'full':
+            note['generated_content'] = doc.get('content')
+        elif content_mode == 'summary':
+            note['generated_summary'] = doc['summary']
+    return notes
+
+
 @notes_bp.route('/subject_notes/<subject_id>', methods=['GET'])
 @jwt_required()
 @cross_origin()
 def list_subject_notes(subject_id):
     try:
         user_id = get_jwt_identity()
-        notes = list(notes_collection.find({'user_id': user_id, 'subject_id': ObjectId(subject_id)}))
-
-        for n in notes:
-            n['_id'] = str(n['_id'])
-            # Query the generated_notes_collection using original_note_id = n['_id']
-            gen_note = generated_notes_collection.find_one({'original_note_id': ObjectId(n['_id'])})
-            if gen_note and 'content' in gen_note:
-                n['generated_content'] = gen_note['content']
-        
-        return jsonify({'notes': notes}), 200
+        # content=full (default) returns the generated HTML, content=summary returns
+        # a plain-text preview and length, content=none returns only the length.
+        content_mode = request.args.get('content', 'full')
+        if content_mode not in ('full', 'summary', 'none'):
+            return jsonify({'error': 'content must be one of full, summary, none'}), 400
+
+        try:
+            page = PageRequest.from_args(request.args, (*NOTE_HIDDEN_FIELDS, 'generated'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # One round trip: the page of notes and their generated notes together
+        pipeline = [
+            {'$match': {'user_id': user_id, 'subject_id': ObjectId(subject_id)}},
+            *page.pipeline(),
+            *generated_content_stages(page, content_mode)
+        ]
+        notes, next_cursor = page.finish(list(notes_collection.aggregate(pipeline)))
+        attach_generated_content(notes, user_id, content_mode)
+
+        return jsonify({'notes': notes, 'next_cursor': next_cursor}), 200
     except Exception as e:
         logging.error(f"List subject notes error: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
@@ -197,11 +742,17 @@ def list_subject_notes(subject_id):
 def list_generated_notes(subject_id):
     try:
         user_id = get_jwt_identity()
-        generated = list(generated_notes_collection.find({'user_id': user_id, 'subject_id': ObjectId(subject_id)}))
-        for g in generated:
-            g['_id'] = str(g['_id'])
-            g['original_note_id'] = str(g['original_note_id'])
-        return jsonify({'generated_notes': generated}), 200
+        try:
+            page = PageRequest.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        generated, next_cursor = page.find(
+            generated_notes_collection,
+            {'user_id': user_id, 'subject_id': ObjectId(subject_id)},
+            page.projection()
+        )
+        return jsonify({'generated_notes': generated, 'next_cursor': next_cursor}), 200
     except Exception as e:
         logging.error(f"List generated notes error: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
@@ -249,16 +800,18 @@ def list_notes():
         if not user_id:
             return jsonify({'error': 'Unauthorized'}), 401
 
-        notes = list(notes_collection.find({'user_id': user_id}))
-        for note in notes:
-            note['_id'] = str(note['_id'])
-
-            # If there's a subject_id, get the subject name
-            if 'subject_id' in note and note['subject_id']:
-                subject = subjects_collection.find_one({'_id': ObjectId(note['subject_id'])})
-                if subject:
-                    note['subject_name'] = subject['subject_name']
+        try:
+            page = PageRequest.from_args(request.args, NOTE_HIDDEN_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
+        notes, next_cursor = page.find(
+            notes_collection,
+            {'user_id': user_id},
+            page.projection(NOTE_HIDDEN_FIELDS, required_fields=('s3_url', 'subject_id'))
+        )
+        attach_subject_names(notes)
+        for note in notes:
             # Extract the S3 key from the stored s3_url
             # Example s3_url: https://<bucket>.s3.amazonaws.com/users/<user_id>/<filename>
             base_url = f"https://{Config.S3_BUCKET}.s3.amazonaws.com/"
@@ -272,7 +825,7 @@ def list_notes():
             else:
                 note['image_url'] = None
 
-        return jsonify({'notes': notes}), 200
+        return jsonify({'notes': notes, 'next_cursor': next_cursor}), 200
     except Exception as e:
         logging.error(f"List notes error: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
@@ -291,16 +844,20 @@ def extract_text():
         if not note:
             return jsonify({'error': 'Note not found'}), 404
 
-        image_url = note['s3_url']
-        s3_key = image_url.split(f"https://{Config.S3_BUCKET}.s3.amazonaws.com/")[1]
-        image_data = s3_manager.get_file(s3_key)
-        content_type = note.get('content_type', 'image/jpeg')
+        base_url = f"https://{Config.S3_BUCKET}.s3.amazonaws.com/"
+        if not note['s3_url'].startswith(base_url):
+            return jsonify({'error': 'Invalid S3 URL'}), 400
+
+        # PDFs may need a long Textract job; those run on the job queue
+        if needs_background_extraction(note):
+            return submit_text_extraction(note, user_id)
 
-        extracted_text_result = gpt_manager.extract_text_from_image(image_data, content_type)
+        extracted = extract_note_text(note)
 
         return jsonify({
             'message': 'Text extracted successfully',
-            'extracted_text': extracted_text_result['text']
+            'extracted_text': extracted['text'],
+            'extraction_method': extracted['method']
         }), 200
 
     except Exception as e:
@@ -314,16 +871,24 @@ def extract_text():
 def get_notebook(notebook_id):
     try:
         user_id = get_jwt_identity()
-        note = notes_collection.find_one({'_id': ObjectId(notebook_id), 'user_id': user_id})
+        note_filter = {'_id': ObjectId(notebook_id), 'user_id': user_id}
+
+        # Revalidation only needs the version fields
+        if request.if_none_match:
+            versions = notes_collection.find_one(note_filter, VERSION_PROJECTION)
+            if not versions:
+                return jsonify({'error': 'Notebook not found.'}), 404
+            etag = matching_etag(document_etag(versions))
+            if etag:
+                return not_modified(etag)
+
+        note = notes_collection.find_one(note_filter, {'extracted_text': 0})
 
         if not note:
             return jsonify({'error': 'Notebook not found.'}), 404
+        etag = document_etag(note)
 
-        note['_id'] = str(note['_id'])
-        if 'subject_id' in note and note['subject_id']:
-            subject = subjects_collection.find_one({'_id': ObjectId(note['subject_id'])})
-            if subject:
-                note['subject_name'] = subject['subject_name']
+        attach_subject_names([note])
         # Fetch generated notes
         gen_note = generated_notes_collection.find_one({'original_note_id': ObjectId(notebook_id)})
         if gen_note:
@@ -333,7 +898,7 @@ def get_notebook(notebook_id):
         else:
             note['image_url'] = None  # or a default image URL
 
-        return jsonify({'note': note}), 200
+        return with_etag(jsonify({'note': note}), etag), 200
     except Exception as e:
         logging.error(f"Get notebook error: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
@@ -364,11 +929,16 @@ def update_notebook(notebook_id):
 
         result = notes_collection.update_one(
             {'_id': ObjectId(notebook_id), 'user_id': user_id},
-            {'$set': update_fields}
+            bump_version({'$set': update_fields})
         )
 
         if result.matched_count == 0:
             return jsonify({'error': 'Notebook not found or no changes made.'}), 404
+        if 'subject_id' in update_fields:
+            generated_notes_collection.update_many(
+                {'original_note_id': ObjectId(notebook_id), 'user_id': user_id},
+                {'$set': {'subject_id': subject_object_id(update_fields['subject_id'])}}
+            )
 
         return jsonify({'message': 'Notebook updated successfully.'}), 200
 
@@ -396,8 +966,10 @@ def update_generated_notes(notebook_id):
 
         generated_notes_collection.update_one(
             {'_id': gen_note['_id']},
-            {'$set': {'content': new_content}}
+            {'$set': {**generated_content_fields(new_content), 'updated_at': datetime.utcnow()}}
         )
+        # The notebook's ETag covers its generated content
+        notes_collection.update_one({'_id': ObjectId(notebook_id), 'user_id': user_id}, bump_version({}))
 
         return jsonify({'message': 'Generated notes updated successfully'}), 200
 
@@ -1,21 +1,15 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from pymongo import MongoClient
 from bson import ObjectId
 import logging
-from config import Config
-from utils.gpt_api import GPTManager
+from utils.database import collection
+from utils.gpt_api import gpt_manager
 
 quiz_bp = Blueprint('quiz', __name__)
 
 # Initialize MongoDB connection
-client = MongoClient(Config.MONGODB_URI)
-db = client['notes_app']
-subjects_collection = db['subjects']
-notes_collection = db['notes']
-
-# Initialize GPT manager
-gpt_manager = GPTManager()
+subjects_collection = collection('subjects')
+notes_collection = collection('notes')
 
 @quiz_bp.route('/generate/<subject_id>', methods=['POST'])
 @jwt_required()
@@ -1,20 +1,18 @@
 # backend/routes/subjects.py
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from pymongo import MongoClient
 from bson import ObjectId
 from flask_cors import cross_origin
 from datetime import datetime
 import logging
-from config import Config
+from utils.database import collection
+from utils.pagination import PageRequest
 
 subjects_bp = Blueprint('subjects', __name__)
 
 # Initialize MongoDB connection
-client = MongoClient(Config.MONGODB_URI)
-db = client['notes_app']
-subjects_collection = db['subjects']
-notes_collection = db['notes']
+subjects_collection = collection('subjects')
+notes_collection = collection('notes')
 
 @subjects_bp.route('/create', methods=['POST'])
 @jwt_required()
@@ -51,12 +49,13 @@ def create_subject():
 def list_subjects():
     try:
         user_id = get_jwt_identity()
-        subjects = list(subjects_collection.find({'user_id': user_id}))
+        try:
+            page = PageRequest.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
-        for subject in subjects:
-            subject['_id'] = str(subject['_id'])
-
-        return jsonify({'subjects': subjects}), 200
+        subjects, next_cursor = page.find(subjects_collection, {'user_id': user_id}, page.projection())
+        return jsonify({'subjects': subjects, 'next_cursor': next_cursor}), 200
     except Exception as e:
         logging.error(f"List subjects error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -73,10 +72,10 @@ def delete_subject(subject_id):
             return jsonify({'error': 'Subject not found'}), 404
         
         # Delete associated notes
-        notes_collection.delete_many({'subject_id': ObjectId(subject_id)})
+        notes_collection.delete_many({'user_id': user_id, 'subject_id': ObjectId(subject_id)})
         
         # Delete the subject itself
-        subjects_collection.delete_one({'_id': ObjectId(subject_id)})
+        subjects_collection.delete_one({'_id': ObjectId(subject_id), 'user_id': user_id})
 
         return jsonify({'message': 'Subject deleted successfully'}), 200
     except Exception as e:
@@ -0,0 +1,248 @@
+# backend/tests/conftest.py
+import base64
+import hashlib
+import io
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+import pytest
+
+# Settings the app reads at import time
+os.environ.setdefault('JWT_SECRET_KEY', 'test-secret-key-with-at-least-32-bytes')
+os.environ.setdefault('MONGODB_URI', 'mongodb://127.0.0.1:1')
+os.environ.setdefault('AWS_ACCESS_KEY', 'test-access-key')
+os.environ.setdefault('AWS_SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+os.environ.setdefault('S3_BUCKET', 'test-bucket')
+os.environ.setdefault('JOB_BACKEND', 'inline')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mongomock
+from botocore.exceptions import ClientError
+from flask_jwt_extended import create_access_token
+
+import utils.database as database
+from utils.gpt_api import gpt_manager
+from utils.health import health_monitor
+from utils.indexes import ensure_indexes
+from utils.s3_manager import s3_manager
+
+# Tests never probe real dependencies in the background
+health_monitor.start = lambda: None
+
+from app import create_app
+
+# One call made through a collection: name, method and filter or pipeline
+MongoCall = namedtuple('MongoCall', 'collection operation query')
+
+# Collection methods that send a command to the server
+RECORDED_OPERATIONS = (
+    'find', 'find_one', 'aggregate', 'count_documents', 'distinct',
+    'insert_one', 'insert_many', 'update_one', 'update_many', 'replace_one',
+    'delete_one', 'delete_many', 'find_one_and_update', 'find_one_and_delete', 'find_one_and_replace',
+)
+
+
+class RecordingCollection:
+    """
+    Wraps a collection and appends a MongoCall for every server round trip,
+    so tests can count queries and check their plans.
+    """
+
+    def __init__(self, collection, calls: list):
+        self._collection = collection
+        self._calls = calls
+
+    def __getattr__(self, attr):
+        value = getattr(self._collection, attr)
+        if attr not in RECORDED_OPERATIONS:
+            return value
+
+        def recorded(*args, **kwargs):
+            query = args[0] if args else kwargs.get('filter', kwargs.get('pipeline'))
+            if attr == 'distinct':
+                # distinct(key, filter)
+                query = args[1] if len(args) > 1 else kwargs.get('filter')
+            if attr.startswith('insert_'):
+                query = None
+            self._calls.append(MongoCall(self._collection.name, attr, query))
+            return value(*args, **kwargs)
+        return recorded
+
+
+class FakeS3Client:
+    """
+    Local stand-in for the boto3 S3 client. Objects live in a dict, every
+    call is counted, and uploads can be given latency and failures:
+    fail(key, body) returning True makes that upload raise a ClientError.
+    SHA-256 checksums (base64, as S3 reports them) are kept for objects
+    uploaded with one and returned by head_object.
+    """
+
+    def __init__(self, latency: float = 0.0, fail=lambda key, body: False):
+        self.latency = latency
+        self.fail = fail
+        self.objects = {}
+        self.checksums = {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, name):
+        with self._lock:
+            self.calls.append(name)
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Callback=None, Config=None):
+        self._record('upload_fileobj')
+        body = Fileobj.read()
+        time.sleep(self.latency)
+        if self.fail(Key, body):
+            raise ClientError({'Error': {'Code': 'InternalError', 'Message': 'Injected failure'}}, 'PutObject')
+        with self._lock:
+            self.objects[Key] = body
+            if (ExtraArgs or {}).get('ChecksumAlgorithm') == 'SHA256':
+                self.checksums[Key] = base64.b64encode(hashlib.sha256(body).digest()).decode('ascii')
+        if Callback:
+            Callback(len(body))
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._record('head_object')
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, 'HeadObject')
+        head = {'ContentLength': len(self.objects[Key])}
+        if Key in self.checksums:
+            head['ChecksumSHA256'] = self.checksums[Key]
+        return head
+
+    def get_object(self, Bucket, Key):
+        self._record('get_object')
+        return {'Body': io.BytesIO(self.objects[Key])}
+
+    def delete_object(self, Bucket, Key):
+        self._record('delete_object')
+        self.objects.pop(Key, None)
+
+    def head_bucket(self, Bucket):
+        self._record('head_bucket')
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        # Signing is local in boto3, so this is not a round trip
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?signature={uuid.uuid4().hex}"
+
+    def generate_presigned_post(self, Bucket, Key, Fields=None, Conditions=None, ExpiresIn=3600):
+        return {'url': f"https://{Bucket}.s3.amazonaws.com/", 'fields': {**(Fields or {}), 'key': Key}}
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.calls)
+
+
+class FakeTextract:
+    """
+    Local stand-in for the boto3 Textract client. detect_document_text returns
+    one LINE block per line of image_text; get_document_text_detection returns
+    the queued detection responses in order. Every call is recorded with its
+    arguments.
+    """
+
+    class exceptions:
+        class InvalidS3ObjectException(Exception):
+            pass
+
+        class UnsupportedDocumentException(Exception):
+            pass
+
+    def __init__(self, image_text: str = '', detection_responses=()):
+        self.image_text = image_text
+        self.detection_responses = list(detection_responses)
+        self.calls = []
+
+    def detect_document_text(self, Document):
+        self.calls.append(('detect_document_text', Document))
+        return {'Blocks': [{'BlockType': 'LINE', 'Text': line} for line in self.image_text.splitlines()]}
+
+    def start_document_text_detection(self, DocumentLocation):
+        self.calls.append(('start_document_text_detection', DocumentLocation))
+        return {'JobId': 'textract-job'}
+
+    def get_document_text_detection(self, JobId, NextToken=None):
+        self.calls.append(('get_document_text_detection', NextToken))
+        return self.detection_responses.pop(0)
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user_id():
+    return 'student@example.com'
+
+
+@pytest.fixture
+def auth_headers(app, user_id):
+    with app.app_context():
+        token = create_access_token(identity=user_id)
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def mongo_client():
+    """
+    A real server when MONGODB_TEST_URI is set, otherwise mongomock.
+    """
+    uri = os.getenv('MONGODB_TEST_URI')
+    if not uri:
+        yield mongomock.MongoClient()
+        return
+    from pymongo import MongoClient
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def mongo_calls():
+    return []
+
+
+@pytest.fixture
+def db(mongo_client, mongo_calls, monkeypatch):
+    """
+    A throwaway database with the declared indexes, wired in as the app's
+    database. Every call the app makes is appended to mongo_calls.
+    """
+    name = f"notes_app_test_{uuid.uuid4().hex[:12]}"
+    test_db = mongo_client[name]
+    monkeypatch.setattr(database, 'get_client', lambda: mongo_client)
+    monkeypatch.setattr(database, 'get_db', lambda: test_db)
+    monkeypatch.setattr(database, 'get_collection', lambda collection_name: RecordingCollection(test_db[collection_name], mongo_calls))
+    ensure_indexes(test_db)
+    yield test_db
+    mongo_client.drop_database(name)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3Client()
+    monkeypatch.setattr(s3_manager, '_s3', fake)
+    return fake
+
+
+@pytest.fixture
+def textract(monkeypatch):
+    fake = FakeTextract()
+    monkeypatch.setattr(gpt_manager, '_textract', fake)
+    return fake
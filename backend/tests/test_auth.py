@@ -0,0 +1,64 @@
+# backend/tests/test_auth.py
+"""Logout revokes the access token and, when the client sends it, the refresh token."""
+import pytest
+from flask_jwt_extended import create_refresh_token
+from pymongo.errors import ServerSelectionTimeoutError
+
+from utils.revocation import revocation_store
+
+PASSWORD = 'Passw0rdA'
+
+
+@pytest.fixture
+def tokens(client, db, user_id):
+    assert client.post('/auth/signup', json={'email': user_id, 'password': PASSWORD, 'full_name': 'Student'}).status_code == 201
+    response = client.post('/auth/login', json={'email': user_id, 'password': PASSWORD})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_logout_revokes_the_refresh_token(client, tokens):
+    response = client.post('/auth/logout', headers=bearer(tokens['access_token']), json={'refresh_token': tokens['refresh_token']})
+    assert response.status_code == 200
+
+    assert client.get('/auth/me', headers=bearer(tokens['access_token'])).status_code == 401
+    assert client.post('/auth/refresh', headers=bearer(tokens['refresh_token'])).status_code == 401
+
+
+def test_logout_without_a_refresh_token_only_revokes_the_access_token(client, tokens):
+    assert client.post('/auth/logout', headers=bearer(tokens['access_token'])).status_code == 200
+
+    assert client.get('/auth/me', headers=bearer(tokens['access_token'])).status_code == 401
+    assert client.post('/auth/refresh', headers=bearer(tokens['refresh_token'])).status_code == 200
+
+
+def test_logout_rejects_a_token_that_is_not_the_users_refresh_token(client, tokens, app):
+    with app.app_context():
+        other_users = create_refresh_token(identity='someone@example.com')
+
+    for refresh_token in ('not-a-token', tokens['access_token'], other_users):
+        response = client.post('/auth/logout', headers=bearer(tokens['access_token']), json={'refresh_token': refresh_token})
+        assert response.status_code == 400
+    # Nothing was revoked
+    assert client.get('/auth/me', headers=bearer(tokens['access_token'])).status_code == 200
+
+
+class UnreachableCollection:
+    def find_one(self, *args, **kwargs):
+        raise ServerSelectionTimeoutError('No servers available')
+
+
+def test_revocation_check_fails_closed_when_mongodb_is_down(client, tokens, monkeypatch):
+    # Revoke one token first; its cached revocation needs no lookup
+    revoked = tokens['access_token']
+    assert client.post('/auth/logout', headers=bearer(revoked)).status_code == 200
+    monkeypatch.setattr(revocation_store, 'collection', UnreachableCollection())
+
+    response = client.post('/auth/refresh', headers=bearer(tokens['refresh_token']))
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '5'
+    assert client.get('/auth/me', headers=bearer(revoked)).status_code == 401
@@ -0,0 +1,73 @@
+# backend/tests/test_card_images.py
+"""
+upload_card_images() uploads base64 card images on a thread pool. Results
+must come back in input order, and one failed upload must only clear that
+card's image.
+"""
+import base64
+import time
+
+import pytest
+
+from config import Config
+from routes.flashcards import upload_card_images
+
+LATENCY = 0.05
+
+
+def data_url(payload: bytes) -> str:
+    return 'data:image/png;base64,' + base64.b64encode(payload).decode()
+
+
+def make_cards(count):
+    return [{'id': f"c{i}", 'term': f"Term {i}", 'image': data_url(f"card-{i}".encode())} for i in range(count)]
+
+
+@pytest.fixture
+def slow_s3(s3):
+    # Every upload takes LATENCY seconds, and cards 3 and 7 fail
+    s3.latency = LATENCY
+    s3.fail = lambda key, body: body in (b'card-3', b'card-7')
+    return s3
+
+
+def test_order_and_per_card_failures_are_preserved(slow_s3):
+    cards = make_cards(10) + [
+        {'id': 'linked', 'image': 'https://example.com/cell.png'},
+        {'id': 'plain', 'term': 'No image'},
+        {'id': 'invalid', 'image': 'not-an-image'},
+    ]
+    originals = [dict(card) for card in cards]
+
+    result = upload_card_images(cards, 'student@example.com')
+
+    assert [card['id'] for card in result] == [card['id'] for card in cards]
+    assert cards == originals
+    for i in range(10):
+        if i in (3, 7):
+            assert result[i]['image'] is None
+        else:
+            key = result[i]['image'].split('.s3.amazonaws.com/', 1)[1]
+            assert slow_s3.objects[key] == f"card-{i}".encode()
+    assert result[10]['image'] == 'https://example.com/cell.png'
+    assert result[11] == {'id': 'plain', 'term': 'No image'}
+    assert result[12]['image'] is None
+    assert slow_s3.calls.count('upload_fileobj') == 10
+
+
+def test_every_upload_failing_does_not_raise(s3):
+    s3.fail = lambda key, body: True
+    result = upload_card_images(make_cards(4), 'student@example.com')
+    assert [card['image'] for card in result] == [None] * 4
+
+
+def test_uploads_overlap(slow_s3, monkeypatch):
+    monkeypatch.setattr(Config, 'S3_UPLOAD_MAX_WORKERS', 8)
+    cards = make_cards(16)
+
+    started = time.perf_counter()
+    upload_card_images(cards, 'student@example.com')
+    elapsed = time.perf_counter() - started
+
+    # 16 uploads one after another would take 16 * LATENCY; 8 workers need about 2 * LATENCY
+    assert elapsed < len(cards) * LATENCY / 2
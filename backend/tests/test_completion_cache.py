@@ -0,0 +1,123 @@
+# backend/tests/test_completion_cache.py
+"""CompletionCache: keys, the in-memory LRU, expiry, the MongoDB tier, and how GPTManager uses it."""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import utils.gpt_api as gpt_api
+from utils.completion_cache import CompletionCache
+from utils.gpt_api import gpt_manager
+
+MESSAGES = [{'role': 'system', 'content': 'Summarize'}, {'role': 'user', 'content': 'Cells'}]
+CARDS = [{'term': 'Mitochondria', 'definition': 'Powerhouse of the cell'}]
+
+
+def make_cache(**options):
+    return CompletionCache(**{'max_entries': 8, 'ttl_seconds': 60, 'max_entry_bytes': 1024, **options})
+
+
+def test_key_covers_model_messages_and_parameters():
+    key = CompletionCache.make_key('gpt-4', MESSAGES, temperature=0.7, max_tokens=2000)
+    assert key == CompletionCache.make_key('gpt-4', MESSAGES, max_tokens=2000, temperature=0.7)
+    assert len({
+        key,
+        CompletionCache.make_key('gpt-3.5-turbo', MESSAGES, temperature=0.7, max_tokens=2000),
+        CompletionCache.make_key('gpt-4', MESSAGES[:1], temperature=0.7, max_tokens=2000),
+        CompletionCache.make_key('gpt-4', MESSAGES, temperature=0, max_tokens=2000),
+    }) == 4
+
+
+def test_least_recently_used_entry_is_evicted(db):
+    cache = make_cache(max_entries=2)
+    for key in ('a', 'b'):
+        cache.put(key, {'content': key})
+    cache.get('a')
+    cache.put('c', {'content': 'c'})
+
+    assert list(cache._memory) == ['a', 'c']
+    assert cache.stats()['evictions'] == 1
+    # The evicted entry is still in MongoDB
+    assert cache.get('b') == {'content': 'b'}
+    assert cache.stats()['persistent_hits'] == 1
+
+
+def test_expired_entries_miss_in_both_tiers(db):
+    cache = make_cache(ttl_seconds=0)
+    cache.put('key', {'content': 'Cells'})
+    assert cache.get('key') is None
+    assert 'key' not in cache._memory
+    assert cache.stats()['misses'] == 1
+
+
+def test_memory_miss_falls_back_to_mongodb(db):
+    make_cache().put('key', {'content': 'Cells', 'tokens_used': 10})
+    # Another worker process: nothing in memory yet
+    cache = make_cache()
+    assert cache.get('key') == {'content': 'Cells', 'tokens_used': 10}
+    assert cache.get('key') == {'content': 'Cells', 'tokens_used': 10}
+    stats = cache.stats()
+    assert (stats['persistent_hits'], stats['memory_hits'], stats['misses']) == (1, 1, 0)
+
+
+def test_oversized_entries_are_not_stored(db):
+    cache = make_cache(max_entry_bytes=16)
+    cache.put('key', {'content': 'x' * 32})
+    assert cache.get('key') is None
+    assert db.completion_cache.count_documents({}) == 0
+
+
+class FakeOpenAI:
+    """Stands in for the openai module, returning the queued completions in order."""
+
+    error = SimpleNamespace(OpenAIError=type('OpenAIError', (Exception,), {}))
+
+    def __init__(self, *contents):
+        self.contents = list(contents)
+        self.calls = 0
+        self.ChatCompletion = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return {'choices': [{'message': {'content': self.contents.pop(0)}}], 'usage': {'total_tokens': 10}}
+
+
+@pytest.fixture
+def cache(db, monkeypatch):
+    fresh = make_cache(max_entry_bytes=64 * 1024)
+    monkeypatch.setattr(gpt_api, 'completion_cache', fresh)
+    return fresh
+
+
+def use_openai(monkeypatch, *contents):
+    fake = FakeOpenAI(*contents)
+    monkeypatch.setattr(gpt_api, '_openai', lambda: fake)
+    return fake
+
+
+def test_repeated_notes_are_served_from_the_cache(cache, monkeypatch):
+    openai = use_openai(monkeypatch, '<h1>Cells</h1>')
+    first = gpt_manager.generate_notes('Cells')
+    second = gpt_manager.generate_notes('Cells')
+    assert (first['cached'], second['cached']) == (False, True)
+    assert second['summary'] == '<h1>Cells</h1>' and openai.calls == 1
+
+
+def test_use_cache_false_bypasses_the_cache(cache, monkeypatch):
+    openai = use_openai(monkeypatch, '<h1>Cells</h1>', '<h1>Cells again</h1>', '<h1>Cells</h1>')
+    gpt_manager.generate_notes('Cells')
+    assert gpt_manager.generate_notes('Cells', use_cache=False)['summary'] == '<h1>Cells again</h1>'
+    # The uncached answer was not written back
+    assert gpt_manager.generate_notes('Cells')['summary'] == '<h1>Cells</h1>'
+    assert openai.calls == 2
+
+
+def test_malformed_flashcards_are_invalidated(cache, monkeypatch, db):
+    openai = use_openai(monkeypatch, 'Here are your flashcards!', json.dumps(CARDS))
+    with pytest.raises(ValueError):
+        gpt_manager.generate_flashcards('Cells')
+    assert db.completion_cache.count_documents({}) == 0 and not cache._memory
+
+    assert gpt_manager.generate_flashcards('Cells') == CARDS
+    assert gpt_manager.generate_flashcards('Cells') == CARDS
+    assert openai.calls == 2
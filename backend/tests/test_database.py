@@ -0,0 +1,26 @@
+# backend/tests/test_database.py
+import mongomock
+
+import utils.database as database
+
+
+def test_collection_proxy_resolves_once_per_client(monkeypatch):
+    clients = [mongomock.MongoClient()]
+    lookups = []
+
+    def get_collection(name):
+        lookups.append(name)
+        return clients[0]['notes_app'][name]
+
+    monkeypatch.setattr(database, 'get_client', lambda: clients[0])
+    monkeypatch.setattr(database, 'get_collection', get_collection)
+
+    notes = database.collection('notes')
+    notes.insert_one({'title': 'Cells'})
+    assert notes.count_documents({}) == 1
+    assert lookups == ['notes']
+
+    # A new client (as after a fork) is picked up on the next access
+    clients[0] = mongomock.MongoClient()
+    assert notes.count_documents({}) == 0
+    assert lookups == ['notes', 'notes']
@@ -0,0 +1,128 @@
+# backend/tests/test_etags.py
+"""Conditional GETs of notebooks and decks: If-None-Match revalidation, encoded ETags, and version bumps on every write."""
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from flask import Flask
+
+from routes.flashcards import card_scheduler
+from utils.etags import matching_etag
+from utils.gpt_api import gpt_manager
+
+CARDS = [{'id': 'mito', 'term': 'Mitochondria'}, {'id': 'ribo', 'term': 'Ribosome'}]
+
+
+@pytest.fixture
+def note_id(db, user_id):
+    return db.notes.insert_one({
+        'user_id': user_id, 'title': 'Cells', 'status': 'pending', 'version': 1, 'created_at': datetime.utcnow(),
+        's3_url': 'https://test-bucket.s3.amazonaws.com/users/student@example.com/cells.png',
+        'filename': 'cells.png', 'content_type': 'image/png', 'extracted_text': 'Cells',
+    }).inserted_id
+
+
+@pytest.fixture
+def deck_id(client, auth_headers, db):
+    response = client.post('/flashcards/decks', headers=auth_headers, json={'title': 'Cells', 'description': 'Organelles', 'cards': CARDS})
+    return ObjectId(response.get_json()['_id'])
+
+
+@pytest.fixture
+def stub_generation(monkeypatch):
+    monkeypatch.setattr(gpt_manager, 'generate_notes', lambda text, use_cache=True: {'summary': '<p>Cells</p>'})
+    monkeypatch.setattr(gpt_manager, 'stream_notes', lambda text, use_cache=True: iter(['<p>Cells</p>']))
+
+
+def conditional_get(client, auth_headers, url, etag):
+    return client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+
+
+def test_matching_etag_returns_304(client, auth_headers, note_id):
+    url = f'/notes/get/{note_id}'
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+    response = conditional_get(client, auth_headers, url, etag)
+    assert response.status_code == 304 and response.get_data() == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_stale_etag_returns_200_with_the_current_one(client, auth_headers, note_id):
+    url = f'/notes/get/{note_id}'
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+    response = conditional_get(client, auth_headers, url, '"stale"')
+    assert response.status_code == 200
+    assert response.headers['ETag'] == etag and response.get_json()['note']['title'] == 'Cells'
+
+
+def test_missing_document_is_not_found_on_revalidation(client, auth_headers, db):
+    assert conditional_get(client, auth_headers, f'/notes/get/{ObjectId()}', '"abc"').status_code == 404
+    assert conditional_get(client, auth_headers, f'/flashcards/decks/{ObjectId()}', '"abc"').status_code == 404
+
+
+@pytest.mark.parametrize('if_none_match, expected', [
+    ('"abc"', '"abc"'),
+    ('"abc-gzip"', '"abc-gzip"'),
+    ('"abc-br"', '"abc-br"'),
+    ('"other", "abc-br"', '"abc-br"'),
+    ('*', '"abc"'),
+    ('"abc-deflate"', None),
+    ('W/"abc"', None),
+])
+def test_encoded_etags_match(if_none_match, expected):
+    with Flask(__name__).test_request_context(headers={'If-None-Match': if_none_match}):
+        assert matching_etag('abc') == (expected and expected.strip('"'))
+
+
+# Every write that changes what GET /notes/get/<id> returns
+NOTE_WRITES = {
+    'rename': lambda client, headers, note_id, db: client.put(f'/notes/update/{note_id}', headers=headers, json={'title': 'Tissues'}),
+    'generate': lambda client, headers, note_id, db: client.post('/notes/generate', headers=headers, json={'note_id': str(note_id)}),
+    'generate_stream': lambda client, headers, note_id, db: client.post('/notes/generate/stream', headers=headers, json={'note_id': str(note_id)}),
+    'edit_generated': lambda client, headers, note_id, db: (
+        client.post('/notes/generate', headers=headers, json={'note_id': str(note_id)}),
+        client.put(f'/notes/update_generated_notes/{note_id}', headers=headers, json={'generated_content': '<p>Tissues</p>'}),
+    ),
+    'add_to_subject': lambda client, headers, note_id, db: client.post('/notes/add_to_subject', headers=headers, json={
+        'note_id': str(note_id),
+        'subject_id': str(db.subjects.insert_one({'user_id': 'student@example.com', 'subject_name': 'Biology'}).inserted_id),
+    }),
+}
+
+
+@pytest.mark.parametrize('write', NOTE_WRITES.values(), ids=NOTE_WRITES.keys())
+def test_note_writes_bump_the_version(client, auth_headers, db, note_id, stub_generation, write):
+    url = f'/notes/get/{note_id}'
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+    version = db.notes.find_one({'_id': note_id})['version']
+
+    write(client, auth_headers, note_id, db)
+    assert db.notes.find_one({'_id': note_id})['version'] > version
+    assert conditional_get(client, auth_headers, url, etag).status_code == 200
+
+
+# Every write that changes what GET /flashcards/decks/<id> returns
+DECK_WRITES = {
+    'rename': lambda client, headers, deck_id, db: client.put(f'/flashcards/decks/{deck_id}', headers=headers, json={'title': 'Tissues'}),
+    'put_progress': lambda client, headers, deck_id, db: client.put(f'/flashcards/decks/{deck_id}/progress', headers=headers, json={
+        'progress': {'learned': [0], 'mastered': [], 'unfamiliar': [1]},
+        'cardStates': {'0': {'streak': 1, 'status': 'learned', 'lastAnswered': None}},
+    }),
+    'patch_progress': lambda client, headers, deck_id, db: client.patch(f'/flashcards/decks/{deck_id}/progress', headers=headers, json={
+        'events': [{'index': 0, 'correct': True}],
+    }),
+    'backfill_schedules': lambda client, headers, deck_id, db: (
+        db.flashcards_decks.update_one({'_id': deck_id}, {'$unset': {'schedules_seeded': ''}}),
+        card_scheduler.backfill_decks(db.flashcards_decks),
+    ),
+}
+
+
+@pytest.mark.parametrize('write', DECK_WRITES.values(), ids=DECK_WRITES.keys())
+def test_deck_writes_bump_the_version(client, auth_headers, db, deck_id, write):
+    url = f'/flashcards/decks/{deck_id}'
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+    version = db.flashcards_decks.find_one({'_id': deck_id})['version']
+
+    write(client, auth_headers, deck_id, db)
+    assert db.flashcards_decks.find_one({'_id': deck_id})['version'] > version
+    assert conditional_get(client, auth_headers, url, etag).status_code == 200
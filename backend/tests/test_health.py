@@ -0,0 +1,129 @@
+# backend/tests/test_health.py
+"""HealthMonitor with fake probes: readiness, hung probes, stale results and state-change listeners."""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+from utils.health import HealthMonitor
+
+TIMEOUT = 0.2
+
+
+class FakeProbe:
+    """A probe that passes, fails or hangs on demand, counting its calls."""
+
+    def __init__(self, ok: bool = True):
+        self.ok = ok
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def hang(self):
+        self.release.clear()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait()
+        if not self.ok:
+            raise ConnectionError('Connection refused')
+
+
+@pytest.fixture
+def probes():
+    return {'mongodb': FakeProbe(), 's3': FakeProbe(), 'openai': FakeProbe()}
+
+
+@pytest.fixture
+def monitor(probes):
+    monitor = HealthMonitor(probes, interval=60, timeout=TIMEOUT, required=['mongodb', 's3', 'textract'])
+    # Probes run when the tests call check_all(), never on a background thread
+    monitor.start = lambda: None
+    yield monitor
+    for probe in probes.values():
+        probe.release.set()
+
+
+@pytest.fixture
+def readyz(client, monitor, monkeypatch):
+    monkeypatch.setattr(app_module, 'health_monitor', monitor)
+    return lambda: client.get('/readyz')
+
+
+def test_not_ready_until_required_probes_pass(monitor, probes, readyz):
+    response = readyz()
+    assert response.status_code == 503
+    assert response.get_json()['checks']['mongodb']['error'] == 'Not checked yet'
+
+    probes['s3'].ok = False
+    probes['openai'].ok = False
+    monitor.check_all()
+    response = readyz()
+    assert response.status_code == 503
+    assert response.get_json()['checks']['s3']['error'] == 'Connection refused'
+
+    probes['s3'].ok = True
+    monitor.check_all()
+    response = readyz()
+    # openai is probed but not required; textract is required but has no probe here
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'ready' and monitor.required == ('mongodb', 's3')
+    assert (body['checks']['openai']['ok'], body['checks']['openai']['required']) == (False, False)
+
+
+def test_hung_probe_times_out_and_is_not_resubmitted(monitor, probes):
+    probes['s3'].hang()
+    monitor.check_all()
+    monitor.check_all()
+
+    check = monitor.status()['checks']['s3']
+    assert check['ok'] is False and check['error'] == f'Timed out after {TIMEOUT:g}s'
+    assert probes['s3'].calls == 1
+    assert probes['mongodb'].calls == 2
+
+    probes['s3'].release.set()
+    monitor._in_flight['s3'].result(timeout=1)
+    monitor.check_all()
+    assert probes['s3'].calls == 2
+    assert monitor.status()['checks']['s3']['ok'] is True
+
+
+def test_stale_results_are_not_ok(monitor):
+    monitor.check_all()
+    assert monitor.status()['ready'] is True
+
+    checked_at = datetime.utcnow() - timedelta(seconds=monitor.stale_after + 5)
+    for result in monitor._results.values():
+        result['checked_at'] = checked_at
+    status = monitor.status()
+    assert status['ready'] is False
+    assert status['checks']['mongodb']['error'].startswith('Last checked')
+    # The stored result is left as it was probed
+    assert monitor._results['mongodb']['ok'] is True
+
+
+def test_listeners_fire_only_on_state_changes(monitor, probes):
+    changes = []
+    monitor.add_listener(lambda name, result, previous: changes.append((name, result['ok'], previous and previous['ok'])))
+
+    monitor.check_all()
+    assert sorted(changes) == [('mongodb', True, None), ('openai', True, None), ('s3', True, None)]
+
+    del changes[:]
+    monitor.check_all()
+    assert changes == []
+
+    probes['mongodb'].ok = False
+    monitor.check_all()
+    monitor.check_all()
+    assert changes == [('mongodb', False, True)]
+
+
+def test_failing_listener_does_not_stop_the_others(monitor):
+    changes = []
+    monitor.add_listener(lambda name, result, previous: 1 / 0)
+    monitor.add_listener(lambda name, result, previous: changes.append(name))
+    monitor.check_all()
+    assert sorted(changes) == ['mongodb', 'openai', 's3']
@@ -0,0 +1,146 @@
+# backend/tests/test_jobs.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from bson import ObjectId
+
+from config import Config
+from routes.notes import run_note_generation
+from utils.gpt_api import gpt_manager
+from utils.jobs import JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_PROCESSING, job_queue
+
+
+def insert_job(db, user_id, status, age_seconds, **payload):
+    updated_at = datetime.utcnow() - timedelta(seconds=age_seconds)
+    return str(db.jobs.insert_one({
+        'type': 'generate_notes', 'user_id': user_id, 'payload': payload, 'status': status,
+        'result': None, 'error': None, 'created_at': updated_at, 'updated_at': updated_at,
+    }).inserted_id)
+
+
+def test_polling_a_stranded_job_fails_it(client, auth_headers, user_id, db):
+    stale = insert_job(db, user_id, JOB_PROCESSING, job_queue.stale_after + 60)
+    running = insert_job(db, user_id, JOB_PROCESSING, 5)
+
+    body = client.get(f'/notes/jobs/{stale}', headers=auth_headers).get_json()
+    assert body['status'] == JOB_FAILED
+    assert 'did not finish' in body['error']
+    assert db.jobs.find_one({'status': JOB_FAILED})['finished_at'] is not None
+
+    assert client.get(f'/notes/jobs/{running}', headers=auth_headers).get_json()['status'] == JOB_PROCESSING
+
+
+def test_fail_stale_jobs_only_touches_old_unfinished_jobs(db, user_id):
+    old = job_queue.stale_after + 60
+    stale_ids = {insert_job(db, user_id, JOB_PENDING, old), insert_job(db, user_id, JOB_PROCESSING, old)}
+    insert_job(db, user_id, JOB_PROCESSING, 5)
+    insert_job(db, user_id, JOB_DONE, old)
+
+    assert job_queue.fail_stale_jobs() == 2
+    assert {str(job['_id']) for job in db.jobs.find({'status': JOB_FAILED})} == stale_ids
+
+
+def test_finished_jobs_expire(db):
+    ttl = db.jobs.index_information()['finished_at_ttl']
+    assert ttl['key'] == [('finished_at', 1)]
+    assert ttl['expireAfterSeconds'] == Config.JOB_RETENTION_SECONDS
+
+
+def insert_note(db, user_id, status, job_id=None):
+    note = {'user_id': user_id, 'title': 'Cells', 'status': status, 'created_at': datetime.utcnow()}
+    if job_id:
+        note['job_id'] = job_id
+    return db.notes.insert_one(note).inserted_id
+
+
+@pytest.mark.parametrize('note_status, bound', [('processing', True), ('pending', False)])
+def test_failing_a_stranded_job_fails_its_note(db, user_id, note_status, bound):
+    old = job_queue.stale_after + 60
+    note_id = insert_note(db, user_id, note_status)
+    job_id = insert_job(db, user_id, JOB_PROCESSING, old, note_id=str(note_id))
+    if bound:
+        db.notes.update_one({'_id': note_id}, {'$set': {'job_id': job_id}})
+
+    assert job_queue.fail_stale_jobs() == 1
+    assert db.notes.find_one({'_id': note_id})['status'] == 'failed'
+
+
+def test_polling_a_stranded_job_fails_its_note(client, auth_headers, user_id, db):
+    note_id = insert_note(db, user_id, 'processing')
+    job_id = insert_job(db, user_id, JOB_PROCESSING, job_queue.stale_after + 60, note_id=str(note_id))
+    db.notes.update_one({'_id': note_id}, {'$set': {'job_id': job_id}})
+
+    assert client.get(f'/notes/jobs/{job_id}', headers=auth_headers).get_json()['status'] == JOB_FAILED
+    assert db.notes.find_one({'_id': note_id})['status'] == 'failed'
+
+
+def test_note_moved_on_to_another_job_is_left_alone(db, user_id):
+    note_id = insert_note(db, user_id, 'processing', job_id='newer-job')
+    insert_job(db, user_id, JOB_PROCESSING, job_queue.stale_after + 60, note_id=str(note_id))
+    done_id = insert_note(db, user_id, 'done')
+    insert_job(db, user_id, JOB_PENDING, job_queue.stale_after + 60, note_id=str(done_id))
+
+    assert job_queue.fail_stale_jobs() == 2
+    assert db.notes.find_one({'_id': note_id})['status'] == 'processing'
+    assert db.notes.find_one({'_id': done_id})['status'] == 'done'
+
+
+def fail_as_stale(db, job_id):
+    """What fail_stale_jobs() in another process does to a job it considers stranded."""
+    db.jobs.update_one({'_id': ObjectId(job_id)}, {'$set': {'status': JOB_FAILED, 'error': 'Job did not finish'}})
+
+
+def test_job_failed_as_stale_keeps_its_failure(db, user_id):
+    def handler(job_id, user_id):
+        fail_as_stale(db, job_id)
+        return {'summary': 'late'}
+
+    job = db.jobs.find_one({'_id': ObjectId(job_queue.submit('generate_notes', handler, user_id))})
+    assert (job['status'], job['result'], job['error']) == (JOB_FAILED, None, 'Job did not finish')
+
+
+def test_job_failed_as_stale_before_it_starts_is_not_run(db, user_id):
+    ran = []
+    job_id = insert_job(db, user_id, JOB_PENDING, job_queue.stale_after + 60)
+    fail_as_stale(db, job_id)
+
+    # The worker thread finally picks the job up
+    job_queue._run(job_id, lambda **kwargs: ran.append(kwargs), user_id, {})
+    assert ran == []
+    assert db.jobs.find_one({'_id': ObjectId(job_id)})['status'] == JOB_FAILED
+
+
+@pytest.mark.parametrize('outcome', ['done', 'failed'])
+def test_note_moved_on_to_a_newer_job_keeps_its_status(db, user_id, monkeypatch, outcome):
+    note_id = insert_note(db, user_id, 'pending')
+    db.notes.update_one({'_id': note_id}, {'$set': {'extracted_text': 'Cells'}})
+
+    def generate_notes(text, use_cache=True):
+        # The user regenerated the note while this job was still running
+        db.notes.update_one({'_id': note_id}, {'$set': {'status': 'processing', 'job_id': 'newer-job'}})
+        if outcome == 'failed':
+            raise RuntimeError('OpenAI unavailable')
+        return {'summary': '<h1>Cells</h1>'}
+
+    monkeypatch.setattr(gpt_manager, 'generate_notes', generate_notes)
+    job_id = job_queue.submit('generate_notes', run_note_generation, user_id, note_id=str(note_id))
+
+    assert db.jobs.find_one({'_id': ObjectId(job_id)})['status'] == outcome
+    note = db.notes.find_one({'_id': note_id})
+    assert (note['status'], note['job_id']) == ('processing', 'newer-job')
+
+
+@pytest.mark.parametrize('outcome', ['done', 'failed'])
+def test_note_of_the_current_job_follows_it(db, user_id, monkeypatch, outcome):
+    note_id = insert_note(db, user_id, 'pending')
+    db.notes.update_one({'_id': note_id}, {'$set': {'extracted_text': 'Cells'}})
+
+    def generate_notes(text, use_cache=True):
+        if outcome == 'failed':
+            raise RuntimeError('OpenAI unavailable')
+        return {'summary': '<h1>Cells</h1>'}
+
+    monkeypatch.setattr(gpt_manager, 'generate_notes', generate_notes)
+    job_queue.submit('generate_notes', run_note_generation, user_id, note_id=str(note_id))
+    assert db.notes.find_one({'_id': note_id})['status'] == outcome
@@ -0,0 +1,60 @@
+# backend/tests/test_log_buffer.py
+"""LogBuffer keeps the newest entries only; /logs?since=<seq> returns what the status page has not seen."""
+import pytest
+
+import app as app_module
+from utils.log_buffer import LogBuffer
+
+
+def filled(capacity, count):
+    buffer = LogBuffer(capacity)
+    for i in range(count):
+        buffer.append('✅', f'Message {i + 1}')
+    return buffer
+
+
+def test_capacity_bounds_the_buffer():
+    buffer = filled(3, 5)
+    assert [entry['seq'] for entry in buffer.snapshot()] == [3, 4, 5]
+    assert buffer.snapshot()[-1]['message'] == 'Message 5'
+
+
+def test_since_returns_only_newer_entries():
+    buffer = filled(10, 5)
+    page = buffer.since(3)
+    assert [entry['seq'] for entry in page['entries']] == [4, 5]
+    assert (page['last_seq'], page['truncated']) == (5, False)
+    assert buffer.since(5) == {'entries': [], 'last_seq': 5, 'truncated': False}
+
+
+@pytest.mark.parametrize('seq, truncated', [(0, True), (1, True), (2, False), (4, False)])
+def test_truncated_when_entries_after_seq_were_evicted(seq, truncated):
+    buffer = filled(3, 5)
+    page = buffer.since(seq)
+    assert page['truncated'] is truncated
+    assert [entry['seq'] for entry in page['entries']] == [s for s in (3, 4, 5) if s > seq]
+
+
+def test_empty_buffer():
+    assert LogBuffer(3).since(0) == {'entries': [], 'last_seq': 0, 'truncated': False}
+
+
+@pytest.fixture
+def logs(client, monkeypatch):
+    buffer = filled(3, 5)
+    monkeypatch.setattr(app_module, 'log_buffer', buffer)
+    return buffer
+
+
+def test_logs_endpoint_returns_entries_since(client, logs):
+    body = client.get('/logs?since=3').get_json()
+    assert [entry['message'] for entry in body['entries']] == ['Message 4', 'Message 5']
+    assert (body['last_seq'], body['truncated']) == (5, False)
+    assert client.get('/logs').get_json()['truncated'] is True
+
+
+@pytest.mark.parametrize('since', ['abc', '1.5', ''])
+def test_logs_endpoint_rejects_a_non_integer_since(client, logs, since):
+    response = client.get(f'/logs?since={since}')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'since must be an integer'}
@@ -0,0 +1,85 @@
+# backend/tests/test_note_chunks.py
+"""
+Long documents are summarized chunk by chunk. The merged notes must read as
+one document, and a stream closed early must not wait for the remaining
+chunks.
+"""
+import json
+import threading
+import time
+
+import pytest
+
+from config import Config
+from utils.gpt_api import gpt_manager, section_fragment
+
+PARTS = 6
+
+
+def chunk_completion(messages):
+    part = messages[1]['content'].split('part ', 1)[1].split(' ', 1)[0]
+    return f"```html\n<!DOCTYPE html><html><head><title>Notes</title></head><body><h1>Part {part}</h1><p>Body {part}</p></body></html>\n```"
+
+
+@pytest.fixture
+def long_text(monkeypatch):
+    monkeypatch.setattr(Config, 'LLM_CHUNK_TOKENS', 50)
+    return '\n\n'.join(f"Paragraph {i}. " + 'The cell is the basic unit of life. ' * 4 for i in range(PARTS))
+
+
+class FakeLLM:
+    """Stands in for GPTManager._chat_completion, recording the model of every call."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, messages, temperature, max_tokens, model='gpt-4', use_cache=True):
+        with self._lock:
+            self.calls.append(model)
+        if model == Config.LLM_OUTLINE_MODEL:
+            parts = messages[1]['content'].count('Part ')
+            content = json.dumps({'title': 'Cell <biology>', 'outline': [f"Part {i + 1}" for i in range(parts)]})
+        else:
+            time.sleep(self.latency)
+            content = chunk_completion(messages)
+        return {'content': content, 'tokens_used': 10, 'cached': False}, None
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(gpt_manager, '_chat_completion', fake)
+    return fake
+
+
+def test_section_fragment_strips_document_wrappers():
+    assert section_fragment(chunk_completion([{}, {'content': 'This is part 2 of 3'}])) == '<h2>Part 2</h2><p>Body 2</p>'
+
+
+def test_chunked_notes_have_one_title_and_outline(long_text, fake_llm):
+    summary = gpt_manager.generate_notes(long_text)['summary']
+
+    assert summary.count('<h1>') == 1
+    assert summary.startswith('<h1>Cell &lt;biology&gt;</h1>\n<ul><li>Part 1</li>')
+    for tag in ('<html', '<body', '<head', '<!DOCTYPE', '```'):
+        assert tag not in summary
+    sections = [summary.index(f"<h2>Part {i}</h2>") for i in range(1, PARTS + 1)]
+    assert sections == sorted(sections)
+    assert fake_llm.calls.count(Config.LLM_OUTLINE_MODEL) == 1
+
+
+def test_closing_the_stream_cancels_pending_chunks(long_text, fake_llm, monkeypatch):
+    monkeypatch.setattr(Config, 'LLM_MAX_PARALLEL_CHUNKS', 2)
+    fake_llm.latency = 0.2
+
+    stream = gpt_manager.stream_notes(long_text, use_cache=False)
+    assert next(stream).startswith('<h1>')
+    started = time.perf_counter()
+    stream.close()
+    assert time.perf_counter() - started < fake_llm.latency
+
+    time.sleep(fake_llm.latency * 2)
+    # The header and the two chunks already running; the rest were never sent
+    assert len(fake_llm.calls) <= 3
@@ -0,0 +1,101 @@
+# backend/tests/test_note_stream.py
+"""/notes/generate/stream: the Server-Sent Events sent while notes are generated, and the note's status afterwards."""
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from config import Config
+from utils.gpt_api import gpt_manager
+
+FRAGMENTS = ['<h1>Cells</h1>', '<p>The cell is the basic unit of life.</p>']
+
+
+@pytest.fixture
+def note_id(db, user_id):
+    return db.notes.insert_one({
+        'user_id': user_id, 'title': 'Cells', 'subject_id': str(ObjectId()), 'status': 'pending',
+        's3_url': 'https://test-bucket.s3.amazonaws.com/users/student@example.com/cells.png',
+        'filename': 'cells.png', 'content_type': 'image/png', 'extracted_text': 'Cells', 'created_at': datetime.utcnow(),
+    }).inserted_id
+
+
+def parse_event(raw: bytes):
+    event, data = raw.decode('utf-8').strip().split('\n')
+    return event[len('event: '):], json.loads(data[len('data: '):])
+
+
+def open_stream(client, auth_headers, note_id):
+    response = client.post('/notes/generate/stream', headers=auth_headers, json={'note_id': str(note_id)}, buffered=False)
+    assert response.status_code == 200 and response.mimetype == 'text/event-stream'
+    return response
+
+
+def test_disconnect_mid_stream_fails_the_note(client, auth_headers, db, note_id, monkeypatch):
+    monkeypatch.setattr(gpt_manager, 'stream_notes', lambda text, use_cache=True: iter(FRAGMENTS))
+    response = open_stream(client, auth_headers, note_id)
+    events = iter(response.response)
+    assert parse_event(next(events)) == ('status', {'status': 'extracting'})
+    assert db.notes.find_one({'_id': note_id})['status'] == 'processing'
+
+    # The browser went away: Werkzeug closes the generator
+    response.close()
+    assert db.notes.find_one({'_id': note_id})['status'] == 'failed'
+    assert db.generated_notes.count_documents({}) == 0
+
+
+def failing_stream(text, use_cache=True):
+    yield FRAGMENTS[0]
+    raise RuntimeError('OpenAI connection reset')
+
+
+def test_events_arrive_in_order_and_the_notes_are_saved(client, auth_headers, db, note_id, monkeypatch):
+    monkeypatch.setattr(gpt_manager, 'stream_notes', lambda text, use_cache=True: iter(FRAGMENTS))
+    events = [parse_event(raw) for raw in open_stream(client, auth_headers, note_id).response]
+
+    assert events == [
+        ('status', {'status': 'extracting'}),
+        ('status', {'status': 'generating'}),
+        ('chunk', {'html': FRAGMENTS[0]}),
+        ('chunk', {'html': FRAGMENTS[1]}),
+        ('done', {'note_id': str(note_id), 'status': 'done'}),
+    ]
+    assert db.notes.find_one({'_id': note_id})['status'] == 'done'
+    assert db.generated_notes.find_one({'original_note_id': note_id})['content'] == ''.join(FRAGMENTS)
+
+
+def test_generation_failure_sends_an_error_event(client, auth_headers, db, note_id, monkeypatch):
+    monkeypatch.setattr(gpt_manager, 'stream_notes', failing_stream)
+    events = [parse_event(raw) for raw in open_stream(client, auth_headers, note_id).response]
+
+    assert [event for event, _ in events] == ['status', 'status', 'chunk', 'error']
+    assert events[-1][1] == {'error': 'Internal server error', 'status': 'failed'}
+    assert db.notes.find_one({'_id': note_id})['status'] == 'failed'
+    assert db.generated_notes.count_documents({}) == 0
+
+
+def test_scanned_pdf_is_handed_to_an_extraction_job(client, auth_headers, db, user_id, s3, textract, monkeypatch):
+    monkeypatch.setattr(Config, 'TEXTRACT_POLL_INTERVAL', 0)
+    monkeypatch.setattr(gpt_manager, 'stream_notes', lambda text, use_cache=True: iter([f'<p>{text}</p>']))
+    s3.objects['users/student@example.com/cells.pdf'] = b'%PDF-1.4 scanned'
+    textract.detection_responses = [{'JobStatus': 'SUCCEEDED', 'Blocks': [{'BlockType': 'LINE', 'Text': 'Cells', 'Page': 1}]}]
+    note_id = db.notes.insert_one({
+        'user_id': user_id, 'title': 'Cells', 'status': 'pending',
+        's3_url': 'https://test-bucket.s3.amazonaws.com/users/student@example.com/cells.pdf',
+        'filename': 'cells.pdf', 'content_type': 'application/pdf', 'created_at': datetime.utcnow(),
+    }).inserted_id
+
+    response = client.post('/notes/generate/stream', headers=auth_headers, json={'note_id': str(note_id)})
+    assert response.status_code == 202 and response.mimetype == 'application/json'
+    job = client.get(f"/notes/jobs/{response.get_json()['job_id']}", headers=auth_headers).get_json()
+    assert job['status'] == 'done'
+
+    # Once the text is saved the retried request streams
+    events = [parse_event(raw) for raw in open_stream(client, auth_headers, note_id).response]
+    assert events[-2:] == [('chunk', {'html': '<p>Cells</p>'}), ('done', {'note_id': str(note_id), 'status': 'done'})]
+
+
+def test_unknown_note_is_not_streamed(client, auth_headers, db):
+    response = client.post('/notes/generate/stream', headers=auth_headers, json={'note_id': str(ObjectId())})
+    assert response.status_code == 404
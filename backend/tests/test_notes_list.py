@@ -0,0 +1,63 @@
+# backend/tests/test_notes_list.py
+"""
+/notes/list must cost the same number of MongoDB and S3 round trips whether
+a page holds ten notes or a hundred: subject names are resolved with one $in
+query (attach_subject_names) and presigned URLs are signed locally.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import Config
+
+SUBJECT_COUNT = 5
+
+
+def seed_notes(db, user_id, count):
+    subject_ids = db.subjects.insert_many([
+        {'user_id': user_id, 'subject_name': f"Subject {i}", 'created_at': datetime.utcnow()}
+        for i in range(SUBJECT_COUNT)
+    ]).inserted_ids
+    started = datetime.utcnow()
+    db.notes.insert_many([
+        {
+            'user_id': user_id,
+            'title': f"Note {i}",
+            'subject_id': str(subject_ids[i % SUBJECT_COUNT]),
+            's3_url': f"https://{Config.S3_BUCKET}.s3.amazonaws.com/users/{user_id}/note-{i}.txt",
+            'extracted_text': 'x' * 100,
+            'created_at': started - timedelta(seconds=i),
+        }
+        for i in range(count)
+    ])
+
+
+def list_notes_round_trips(client, auth_headers, user_id, db, s3, mongo_calls, count):
+    seed_notes(db, user_id, count)
+    del mongo_calls[:]
+    s3.calls.clear()
+
+    response = client.get(f'/notes/list?limit={Config.LIST_MAX_PAGE_SIZE}', headers=auth_headers)
+    assert response.status_code == 200
+    notes = response.get_json()['notes']
+    assert len(notes) == count
+    assert all(note['subject_name'].startswith('Subject ') and note['image_url'] for note in notes)
+    # The token revocation check is per request and cached, so it is left out of the count
+    listing_calls = [call for call in mongo_calls if call.collection != 'revoked_tokens']
+    return listing_calls, s3.round_trips
+
+
+@pytest.mark.parametrize('count', [10, 100])
+def test_list_notes_round_trips(client, auth_headers, user_id, db, s3, mongo_calls, count):
+    listing_calls, s3_round_trips = list_notes_round_trips(client, auth_headers, user_id, db, s3, mongo_calls, count)
+    # One find for the page and one $in find for its subjects; URLs are signed without calling S3
+    assert [(call.collection, call.operation) for call in listing_calls] == [('notes', 'find'), ('subjects', 'find')]
+    assert s3_round_trips == 0
+
+
+def test_list_notes_round_trips_do_not_grow_with_page_size(client, auth_headers, user_id, db, s3, mongo_calls):
+    small_calls, small_s3 = list_notes_round_trips(client, auth_headers, user_id, db, s3, mongo_calls, 10)
+    db.notes.delete_many({})
+    db.subjects.delete_many({})
+    large_calls, large_s3 = list_notes_round_trips(client, auth_headers, user_id, db, s3, mongo_calls, 100)
+    assert (len(small_calls), small_s3) == (len(large_calls), large_s3)
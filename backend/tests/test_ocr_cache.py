@@ -0,0 +1,70 @@
+# backend/tests/test_ocr_cache.py
+"""Uploads with the same bytes share one OCR result, keyed by their SHA-256."""
+import hashlib
+import io
+
+import pytest
+
+from config import Config
+from utils.ocr_cache import sha256_of_file
+
+SCAN = b'\x89PNG\r\n\x1a\n' + b'scanned lecture slide' * 64
+
+
+@pytest.fixture
+def subject_id(client, auth_headers, db):
+    return client.post('/subjects/create', headers=auth_headers, json={'subject_name': 'Biology'}).get_json()['subject_id']
+
+
+def upload(client, auth_headers, subject_id, data):
+    response = client.post('/notes/upload', headers=auth_headers, content_type='multipart/form-data', data={
+        'title': 'Cells', 'description': 'Lecture', 'subject_id': subject_id,
+        'file': (io.BytesIO(data), 'slide.png', 'image/png'),
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['note_id']
+
+
+def extract(client, auth_headers, note_id):
+    response = client.post('/notes/extract_text', headers=auth_headers, json={'note_id': note_id})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def ocr_calls(textract):
+    return [name for name, _ in textract.calls if name == 'detect_document_text']
+
+
+def test_same_bytes_skip_textract(client, auth_headers, db, s3, textract, subject_id):
+    textract.image_text = 'Mitochondria\nRibosome'
+    first = extract(client, auth_headers, upload(client, auth_headers, subject_id, SCAN))
+    second = extract(client, auth_headers, upload(client, auth_headers, subject_id, SCAN))
+
+    assert (first['extraction_method'], second['extraction_method']) == ('textract', 'cache')
+    assert second['extracted_text'] == 'Mitochondria\nRibosome'
+    assert len(ocr_calls(textract)) == 1
+    assert db.ocr_cache.find_one({'_id': hashlib.sha256(SCAN).hexdigest()})['text'] == 'Mitochondria\nRibosome'
+
+
+def test_different_bytes_miss_the_cache(client, auth_headers, db, s3, textract, subject_id):
+    textract.image_text = 'Mitochondria'
+    extract(client, auth_headers, upload(client, auth_headers, subject_id, SCAN))
+    textract.image_text = 'Golgi apparatus'
+    other = extract(client, auth_headers, upload(client, auth_headers, subject_id, SCAN + b'!'))
+
+    assert (other['extraction_method'], other['extracted_text']) == ('textract', 'Golgi apparatus')
+    assert len(ocr_calls(textract)) == 2
+    assert db.ocr_cache.count_documents({}) == 2
+
+
+def test_hashing_rewinds_the_upload():
+    file = io.BytesIO(SCAN)
+    file.seek(5)
+    assert sha256_of_file(file) == hashlib.sha256(SCAN).hexdigest()
+    assert file.read() == SCAN
+
+
+def test_cached_text_expires(db):
+    ttl = db.ocr_cache.index_information()['created_at_ttl']
+    assert ttl['key'] == [('created_at', 1)]
+    assert ttl['expireAfterSeconds'] == Config.OCR_CACHE_TTL_SECONDS
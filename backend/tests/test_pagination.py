@@ -0,0 +1,29 @@
+# backend/tests/test_pagination.py
+import pytest
+
+from utils.pagination import PageRequest
+
+HIDDEN = ('cards', 'cardStates', 'progress')
+
+
+@pytest.mark.parametrize('fields', ['cards', 'cards.0', 'cards.term', 'cardStates.3.streak', ' progress.learned ', '$where'])
+def test_fields_cannot_reach_hidden_paths(fields):
+    page = PageRequest.from_args({'fields': f"title,{fields}"}, HIDDEN)
+    assert page.fields == ['title']
+
+
+def test_fields_sharing_a_prefix_with_a_hidden_name_are_allowed():
+    page = PageRequest.from_args({'fields': 'cards_count, progress_counts.total'}, HIDDEN)
+    assert page.fields == ['cards_count', 'progress_counts.total']
+
+
+@pytest.mark.parametrize('fields, required, expected', [
+    ('title,title.x', (), {'_id': 1, 'created_at': 1, 'title': 1}),
+    ('title.x,title', (), {'_id': 1, 'created_at': 1, 'title': 1}),
+    ('title,title', (), {'_id': 1, 'created_at': 1, 'title': 1}),
+    ('generated', ('generated.content', 'generated.summary'), {'_id': 1, 'created_at': 1, 'generated': 1}),
+    ('generated.summary', ('generated.content',), {'_id': 1, 'created_at': 1, 'generated.content': 1, 'generated.summary': 1}),
+    ('_id.x,created_at.y,title', (), {'_id': 1, 'created_at': 1, 'title': 1}),
+])
+def test_overlapping_paths_collapse_to_the_outermost(fields, required, expected):
+    assert PageRequest.from_args({'fields': fields}).projection(required_fields=required) == expected
@@ -0,0 +1,86 @@
+# backend/tests/test_presigned_urls.py
+"""S3Manager reuses presigned GET URLs while enough of their lifetime remains, in a bounded LRU."""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import utils.s3_manager as s3_module
+from config import Config
+from utils.s3_manager import S3Manager
+
+LIFETIME = 100
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(s3_module, 'time', SimpleNamespace(time=clock.time, perf_counter=time.perf_counter))
+    return clock
+
+
+@pytest.fixture
+def manager(s3, monkeypatch):
+    monkeypatch.setattr(Config, 'PRESIGNED_URL_CACHE_SIZE', 2)
+    monkeypatch.setattr(Config, 'PRESIGNED_URL_REUSE_FRACTION', 0.5)
+    manager = S3Manager(Config)
+    manager._s3 = s3
+    return manager
+
+
+def test_url_is_reused_while_half_its_lifetime_remains(manager, clock):
+    url = manager.generate_presigned_url('notes/cells.png', LIFETIME)
+    clock.now += LIFETIME / 2
+    assert manager.generate_presigned_url('notes/cells.png', LIFETIME) == url
+    assert manager.presigned_url_cache_stats()['hits'] == 1
+
+
+def test_url_is_signed_again_once_less_remains(manager, clock):
+    url = manager.generate_presigned_url('notes/cells.png', LIFETIME)
+    clock.now += LIFETIME / 2 + 1
+    fresh = manager.generate_presigned_url('notes/cells.png', LIFETIME)
+    assert fresh != url
+    # The new URL's lifetime starts now
+    clock.now += LIFETIME / 2
+    assert manager.generate_presigned_url('notes/cells.png', LIFETIME) == fresh
+    stats = manager.presigned_url_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 2, 1)
+
+
+def test_each_expiration_is_cached_separately(manager, clock):
+    assert manager.generate_presigned_url('notes/cells.png', LIFETIME) != manager.generate_presigned_url('notes/cells.png', LIFETIME * 2)
+
+
+def test_least_recently_used_url_is_evicted(manager, clock):
+    urls = {key: manager.generate_presigned_url(key, LIFETIME) for key in ('a.png', 'b.png')}
+    manager.generate_presigned_url('a.png', LIFETIME)
+    manager.generate_presigned_url('c.png', LIFETIME)
+
+    assert manager.generate_presigned_url('a.png', LIFETIME) == urls['a.png']
+    assert manager.generate_presigned_url('b.png', LIFETIME) != urls['b.png']
+    stats = manager.presigned_url_cache_stats()
+    assert (stats['size'], stats['evictions']) == (2, 2)
+
+
+def test_deleting_an_object_drops_its_urls(manager, s3, clock):
+    s3.objects['a.png'] = b'image'
+    url = manager.generate_presigned_url('a.png', LIFETIME)
+    manager.delete_file('a.png')
+    assert manager.generate_presigned_url('a.png', LIFETIME) != url
+
+
+def test_counters_are_exposed(client, s3):
+    before = client.get('/cache_stats').get_json()['presigned_urls']
+    s3_module.s3_manager.generate_presigned_url('counted.png', LIFETIME)
+    s3_module.s3_manager.generate_presigned_url('counted.png', LIFETIME)
+    after = client.get('/cache_stats').get_json()['presigned_urls']
+    assert (after['hits'] - before['hits'], after['misses'] - before['misses']) == (1, 1)
+    assert 0 < after['hit_rate'] <= 1
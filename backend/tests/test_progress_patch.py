@@ -0,0 +1,140 @@
+# backend/tests/test_progress_patch.py
+"""PATCH /flashcards/decks/<id>/progress: counter deltas, progress lists, legacy decks, card ids, retries and resent batches."""
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from routes.flashcards import PROGRESS_PATCH_RETRIES, flashcards_collection
+
+CARDS = [{'id': 'mito', 'term': 'Mitochondria'}, {'id': 'ribo', 'term': 'Ribosome'}, {'id': 'golgi', 'term': 'Golgi'}]
+
+
+@pytest.fixture
+def deck_id(client, auth_headers, db):
+    response = client.post('/flashcards/decks', headers=auth_headers, json={
+        'title': 'Cells', 'description': 'Organelles', 'cards': CARDS})
+    return response.get_json()['_id']
+
+
+def patch(client, auth_headers, deck_id, events, **body):
+    return client.patch(f'/flashcards/decks/{deck_id}/progress', headers=auth_headers, json={'events': events, **body})
+
+
+def counts(response):
+    assert response.status_code == 200, response.get_json()
+    return {k: v for k, v in response.get_json()['progress_counts'].items() if k != 'total'}
+
+
+def test_counters_follow_status_changes(client, auth_headers, deck_id):
+    assert counts(patch(client, auth_headers, deck_id, [{'index': 0, 'correct': True}])) == {
+        'learned': 1, 'mastered': 0, 'unfamiliar': 2}
+    response = patch(client, auth_headers, deck_id, [{'index': 0, 'correct': True}] * 2 + [{'index': 1, 'correct': False}])
+    assert counts(response) == {'learned': 0, 'mastered': 1, 'unfamiliar': 2}
+    card_state = response.get_json()['cardStates']['1']
+    assert (card_state['streak'], card_state['status']) == (-1, 'unfamiliar')
+
+
+
+def progress_lists(client, auth_headers, deck_id):
+    deck = client.get(f'/flashcards/decks/{deck_id}', headers=auth_headers).get_json()
+    lists = {status: sorted(indexes) for status, indexes in deck['progress'].items()}
+    # The lists agree with the card states they summarise
+    for status, indexes in lists.items():
+        assert all(deck['cardStates'][str(i)]['status'] == status for i in indexes)
+    return lists
+
+
+def test_progress_lists_follow_status_changes(client, auth_headers, deck_id):
+    patch(client, auth_headers, deck_id, [{'index': 0, 'correct': True}])
+    assert progress_lists(client, auth_headers, deck_id) == {'learned': [0], 'mastered': [], 'unfamiliar': [1, 2]}
+
+    # 'learned' loses card 0 and gains card 1 in one batch
+    patch(client, auth_headers, deck_id, [{'index': 0, 'correct': True}] * 2 + [{'index': 1, 'correct': True}])
+    assert progress_lists(client, auth_headers, deck_id) == {'learned': [1], 'mastered': [0], 'unfamiliar': [2]}
+
+    patch(client, auth_headers, deck_id, [{'index': 1, 'correct': False}] * 3)
+    assert progress_lists(client, auth_headers, deck_id) == {'learned': [], 'mastered': [0], 'unfamiliar': [1, 2]}
+
+def test_cards_can_be_named_by_id(client, auth_headers, deck_id):
+    response = patch(client, auth_headers, deck_id, [{'card_id': 'golgi', 'correct': True}])
+    assert counts(response)['learned'] == 1
+    assert list(response.get_json()['cardStates']) == ['2']
+    assert patch(client, auth_headers, deck_id, [{'card_id': 'nucleus', 'correct': True}]).status_code == 400
+
+
+@pytest.mark.parametrize('event', [{'card_id': 'mito', 'correct': True}, {'index': 0, 'correct': True}], ids=['card_id', 'index'])
+def test_missing_deck_is_not_found(client, auth_headers, db, user_id, event):
+    assert patch(client, auth_headers, ObjectId(), [event]).status_code == 404
+    # Another user's deck is just as missing
+    other = db.flashcards_decks.insert_one({
+        'user_id': 'other@example.com', 'title': 'Cells', 'cards': CARDS, 'created_at': datetime.utcnow()}).inserted_id
+    assert patch(client, auth_headers, other, [event]).status_code == 404
+
+
+def test_legacy_deck_counters_are_seeded(client, auth_headers, db, user_id):
+    deck_id = db.flashcards_decks.insert_one({
+        'user_id': user_id, 'title': 'Legacy', 'cards': CARDS, 'created_at': datetime.utcnow(),
+        'cardStates': {'1': {'streak': 1, 'status': 'learned', 'lastAnswered': None}},
+    }).inserted_id
+    assert counts(patch(client, auth_headers, deck_id, [{'index': 0, 'correct': True}])) == {
+        'learned': 2, 'mastered': 0, 'unfamiliar': 1}
+    assert db.flashcards_decks.find_one({'_id': deck_id})['progress_counts']['learned'] == 2
+
+
+def test_unknown_stored_status_counts_as_unfamiliar(client, auth_headers, db, deck_id):
+    db.flashcards_decks.update_one({'_id': ObjectId(deck_id)}, {'$set': {
+        'cardStates.0': {'streak': 0, 'status': 'archived', 'lastAnswered': None}}})
+    assert counts(patch(client, auth_headers, deck_id, [{'index': 0, 'correct': True}])) == {
+        'learned': 1, 'mastered': 0, 'unfamiliar': 2}
+
+
+def test_resent_batch_is_applied_once(client, auth_headers, db, deck_id):
+    events = [{'index': 0, 'correct': True}]
+    first = counts(patch(client, auth_headers, deck_id, events, batch_id='batch-1'))
+    resent = patch(client, auth_headers, deck_id, events, batch_id='batch-1')
+    assert counts(resent) == first and resent.get_json()['message'] == 'Batch already applied'
+    assert db.flashcards_decks.find_one({'_id': ObjectId(deck_id)})['cardStates']['0']['streak'] == 1
+    assert counts(patch(client, auth_headers, deck_id, events, batch_id='batch-2'))['learned'] == 1
+    assert db.flashcards_decks.find_one({'_id': ObjectId(deck_id)})['cardStates']['0']['streak'] == 2
+
+
+class ConflictingCollection:
+    """Another session changes card 0 just before every conditional write."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.attempts = 0
+
+    def __getattr__(self, attr):
+        return getattr(self._collection, attr)
+
+    def find_one_and_update(self, update_filter, *args, **kwargs):
+        self.attempts += 1
+        self._collection.update_one({'_id': update_filter['_id']}, {'$inc': {'cardStates.0.streak': 1}})
+        return self._collection.find_one_and_update(update_filter, *args, **kwargs)
+
+
+def test_conflict_after_every_retry_returns_409(client, auth_headers, db, mongo_client, deck_id, monkeypatch):
+    conflicting = ConflictingCollection(db.flashcards_decks)
+    monkeypatch.setattr(flashcards_collection, '_resolved', (mongo_client, conflicting))
+    response = patch(client, auth_headers, deck_id, [{'index': 0, 'correct': True}])
+    assert response.status_code == 409
+    assert conflicting.attempts == PROGRESS_PATCH_RETRIES
+
+
+def test_get_deck_returns_stored_counters(client, auth_headers, db, deck_id):
+    stored = {'learned': 2, 'mastered': 1, 'unfamiliar': 0, 'total': 3}
+    db.flashcards_decks.update_one({'_id': ObjectId(deck_id)}, {'$set': {'progress_counts': stored}})
+    deck = client.get(f'/flashcards/decks/{deck_id}', headers=auth_headers).get_json()
+    assert deck['progress_counts'] == stored
+    assert 'applied_batches' not in deck
+
+
+def test_get_deck_derives_counters_for_legacy_decks(client, auth_headers, db, user_id):
+    deck_id = db.flashcards_decks.insert_one({
+        'user_id': user_id, 'title': 'Legacy', 'cards': CARDS, 'created_at': datetime.utcnow(),
+        'cardStates': {'1': {'streak': 3, 'status': 'mastered', 'lastAnswered': None}},
+    }).inserted_id
+    deck = client.get(f'/flashcards/decks/{deck_id}', headers=auth_headers).get_json()
+    assert deck['progress_counts'] == {'learned': 0, 'mastered': 1, 'unfamiliar': 2, 'total': 3}
@@ -0,0 +1,221 @@
+# backend/tests/test_query_plans.py
+"""
+Every query the blueprints issue must be served by an index.
+
+exercise_every_route() drives each route once while the db fixture records
+the filters and pipelines sent to MongoDB. Against a real server
+(MONGODB_TEST_URI) each one is explained and any collection scan fails the
+test; everywhere else they are checked against the manifest in
+utils/indexes.py.
+"""
+import io
+import os
+
+import pytest
+from bson import ObjectId
+
+from routes.notes import generated_notes_collection
+from utils.gpt_api import gpt_manager
+from utils.indexes import INDEXES
+
+REAL_SERVER = bool(os.getenv('MONGODB_TEST_URI'))
+
+SAMPLE_CARDS = [
+    {'id': 'c1', 'front': 'Mitochondria', 'back': 'Powerhouse of the cell'},
+    {'id': 'c2', 'front': 'Ribosome', 'back': 'Builds proteins'},
+]
+
+
+@pytest.fixture
+def stub_gpt(monkeypatch):
+    monkeypatch.setattr(gpt_manager, 'generate_notes', lambda text, use_cache=True: {'summary': '<h1>Cells</h1><p>Notes</p>'})
+    monkeypatch.setattr(gpt_manager, 'stream_notes', lambda text, use_cache=True: iter(['<h1>Cells</h1>', '<p>Notes</p>']))
+    monkeypatch.setattr(gpt_manager, 'generate_flashcards', lambda text, use_cache=True: list(SAMPLE_CARDS))
+    monkeypatch.setattr(gpt_manager, 'get_text_from_s3', lambda url: 'text', raising=False)
+
+
+def _ok(response, *statuses):
+    assert response.status_code in (statuses or (200,)), (response.request.path, response.status_code, response.get_data(as_text=True))
+    return response.get_json(silent=True)
+
+
+def exercise_every_route(client, headers, user_id):
+    """Call every blueprint route at least once, including second pages."""
+    # auth
+    _ok(client.post('/auth/signup', json={'email': user_id, 'password': 'Passw0rdA', 'full_name': 'Student'}), 201)
+    tokens = _ok(client.post('/auth/login', json={'email': user_id, 'password': 'Passw0rdA'}))
+    _ok(client.post('/auth/refresh', headers={'Authorization': f"Bearer {tokens['refresh_token']}"}))
+    _ok(client.get('/auth/me', headers=headers))
+
+    # subjects
+    subject_id = _ok(client.post('/subjects/create', headers=headers, json={'subject_name': 'Biology'}), 201)['subject_id']
+    _ok(client.post('/subjects/create', headers=headers, json={'subject_name': 'Chemistry'}), 201)
+    first = _ok(client.get('/subjects/list?limit=1', headers=headers))
+    _ok(client.get(f"/subjects/list?limit=1&cursor={first['next_cursor']}", headers=headers))
+
+    # notes
+    uploaded = []
+    for title in ('Cells', 'Tissues'):
+        uploaded.append(_ok(client.post('/notes/upload', headers=headers, content_type='multipart/form-data', data={
+            'title': title, 'description': 'Lecture', 'subject_id': subject_id,
+            'file': (io.BytesIO(b'The cell is the basic unit of life.'), f'{title.lower()}.txt', 'text/plain'),
+        }), 201)['note_id'])
+    note_id = uploaded[0]
+    for nid in uploaded:
+        _ok(client.post('/notes/add_to_subject', headers=headers, json={'note_id': nid, 'subject_id': subject_id}))
+
+    init = _ok(client.post('/notes/upload/init', headers=headers, json={
+        'subject_id': subject_id, 'file': {'filename': 'scan.txt', 'content_type': 'text/plain', 'size': 4}}))
+    from utils.s3_manager import s3_manager
+    s3_manager.s3.objects[init['file']['key']] = b'scan'
+    _ok(client.post('/notes/upload/confirm', headers=headers, json={
+        'subject_id': subject_id, 'title': 'Scan', 'description': 'Direct', 'key': init['file']['key']}), 201)
+
+    job = _ok(client.post('/notes/generate', headers=headers, json={'note_id': note_id}), 202)
+    _ok(client.get(f"/notes/jobs/{job['job_id']}", headers=headers))
+    stream = client.post('/notes/generate/stream', headers=headers, json={'note_id': uploaded[1]})
+    assert 'event: done' in stream.get_data(as_text=True)
+    _ok(client.post('/notes/extract_text', headers=headers, json={'note_id': note_id}))
+
+    first = _ok(client.get('/notes/list?limit=1', headers=headers))
+    _ok(client.get(f"/notes/list?limit=1&cursor={first['next_cursor']}", headers=headers))
+    first = _ok(client.get(f'/notes/subject_notes/{subject_id}?limit=1&content=summary', headers=headers))
+    assert [note['title'] for note in first['notes']] == ['Tissues'] and 'generated_summary' in first['notes'][0]
+    page = _ok(client.get(f"/notes/subject_notes/{subject_id}?limit=1&cursor={first['next_cursor']}", headers=headers))
+    assert [note['title'] for note in page['notes']] == ['Cells'] and 'generated_content' in page['notes'][0]
+    generated = _ok(client.get(f'/notes/generated_notes/{subject_id}', headers=headers))
+    assert len(generated['generated_notes']) == 2
+
+    notebook = client.get(f'/notes/get/{note_id}', headers=headers)
+    _ok(notebook)
+    _ok(client.get(f'/notes/get/{note_id}', headers={**headers, 'If-None-Match': notebook.headers['ETag']}), 304)
+    _ok(client.put(f'/notes/update/{note_id}', headers=headers, json={'title': 'Cells 101'}))
+    _ok(client.put(f'/notes/update_generated_notes/{note_id}', headers=headers, json={'generated_content': '<p>Edited</p>'}))
+
+    # maintenance command, on generated notes written before they carried subject_id
+    generated_notes_collection.update_many({'original_note_id': ObjectId(note_id)}, {'$unset': {'subject_id': ''}})
+    backfill = client.application.test_cli_runner().invoke(args=['backfill-generated-subjects'])
+    assert 'Set subject_id on 1 generated note(s)' in backfill.output, backfill.output
+
+    _ok(client.post(f'/quiz/generate/{subject_id}', headers=headers))
+
+    # flashcards
+    deck_id = _ok(client.post('/flashcards/decks', headers=headers, json={
+        'title': 'Cells', 'description': 'Organelles', 'cards': SAMPLE_CARDS}), 201)['_id']
+    _ok(client.post('/flashcards/generate_from_note', headers=headers, json={'note_id': note_id}))
+    first = _ok(client.get('/flashcards/decks?limit=1', headers=headers))
+    _ok(client.get(f"/flashcards/decks?limit=1&cursor={first['next_cursor']}", headers=headers))
+    deck = client.get(f'/flashcards/decks/{deck_id}', headers=headers)
+    _ok(deck)
+    _ok(client.get(f'/flashcards/decks/{deck_id}', headers={**headers, 'If-None-Match': deck.headers['ETag']}), 304)
+    updated = _ok(client.put(f'/flashcards/decks/{deck_id}', headers=headers, json={'title': 'Cell biology', 'cards': SAMPLE_CARDS}))
+    assert updated['title'] == 'Cell biology' and updated['progress_counts']['unfamiliar'] == len(SAMPLE_CARDS)
+    _ok(client.patch(f'/flashcards/decks/{deck_id}/progress', headers=headers, json={'events': [
+        {'index': 0, 'correct': True}, {'card_id': 'c2', 'correct': False}]}))
+    _ok(client.put(f'/flashcards/decks/{deck_id}/progress', headers=headers, json={
+        'progress': {'learned': [], 'mastered': [], 'unfamiliar': [0, 1]}, 'cardStates': {}}))
+    _ok(client.get('/flashcards/due', headers=headers))
+    _ok(client.delete(f'/flashcards/decks/{deck_id}', headers=headers))
+
+    # deletes and logout last
+    _ok(client.delete(f'/notes/delete/{note_id}', headers=headers))
+    _ok(client.delete(f'/subjects/delete/{subject_id}', headers=headers))
+    _ok(client.post('/auth/logout', headers={'Authorization': f"Bearer {tokens['access_token']}"}))
+
+
+def _leading_keys(collection):
+    return {'_id'} | {keys[0][0] for keys, _ in INDEXES.get(collection, [])}
+
+
+def _indexable(query, leading):
+    """True if the planner can answer the filter from an index whose first key is in leading."""
+    if not isinstance(query, dict):
+        return False
+    for field, value in query.items():
+        if field == '$and' and any(_indexable(branch, leading) for branch in value):
+            return True
+        if field == '$or' and value and all(_indexable(branch, leading) for branch in value):
+            return True
+        if field in leading:
+            return True
+    return False
+
+
+def _expr_fields(expr):
+    """Fields compared with $eq inside a $lookup sub-pipeline's $expr."""
+    if isinstance(expr, dict):
+        if '$eq' in expr:
+            return {operand[1:] for operand in expr['$eq'] if isinstance(operand, str) and operand.startswith('$') and not operand.startswith('$$')}
+        return set().union(*(_expr_fields(value) for value in expr.values()))
+    if isinstance(expr, list):
+        return set().union(*(_expr_fields(value) for value in expr)) if expr else set()
+    return set()
+
+
+def manifest_violations(call):
+    """Reasons a recorded call would scan a whole collection, judged against INDEXES."""
+    if call.query is None:
+        return []
+    if call.operation != 'aggregate':
+        return [] if _indexable(call.query, _leading_keys(call.collection)) else [f"{call.collection}.{call.operation}({call.query})"]
+
+    violations = []
+    first = call.query[0] if call.query else {}
+    if not _indexable(first.get('$match'), _leading_keys(call.collection)):
+        violations.append(f"{call.collection}.aggregate starts with {first}")
+    for stage in call.query:
+        lookup = stage.get('$lookup')
+        if not lookup:
+            continue
+        if 'foreignField' in lookup:
+            fields = {lookup['foreignField']}
+        else:
+            match = lookup['pipeline'][0].get('$match', {}) if lookup.get('pipeline') else {}
+            fields = _expr_fields(match.get('$expr')) | set(match)
+        if not fields & _leading_keys(lookup['from']):
+            violations.append(f"$lookup into {lookup['from']} on {sorted(fields)}")
+    return violations
+
+
+def _plan_violations(explain, path='plan'):
+    """Collection scans anywhere in explain output, including inside $lookup stages."""
+    found = []
+    if isinstance(explain, dict):
+        if explain.get('stage') == 'COLLSCAN':
+            found.append(f"COLLSCAN at {path}")
+        if explain.get('collectionScans'):
+            found.append(f"{explain['collectionScans']} collection scan(s) at {path}")
+        for key, value in explain.items():
+            found.extend(_plan_violations(value, f"{path}.{key}"))
+    elif isinstance(explain, list):
+        for i, value in enumerate(explain):
+            found.extend(_plan_violations(value, f"{path}[{i}]"))
+    return found
+
+
+@pytest.fixture
+def recorded_calls(client, auth_headers, user_id, db, s3, stub_gpt, mongo_calls):
+    exercise_every_route(client, auth_headers, user_id)
+    return [call for call in mongo_calls if call.query is not None]
+
+
+def test_every_query_matches_an_index_in_the_manifest(recorded_calls):
+    violations = [v for call in recorded_calls for v in manifest_violations(call)]
+    assert not violations, "Queries without a supporting index:\n" + "\n".join(violations)
+
+
+def test_no_query_plan_scans_a_collection(recorded_calls, db):
+    if not REAL_SERVER:
+        # CI runs this against a real mongod, so a missing server there is a failure
+        if os.getenv('CI'):
+            pytest.fail('MONGODB_TEST_URI must point at a MongoDB server in CI')
+        pytest.skip('explain() needs a real server; set MONGODB_TEST_URI')
+    violations = []
+    for call in recorded_calls:
+        if call.operation == 'aggregate':
+            command = {'aggregate': call.collection, 'pipeline': call.query, 'cursor': {}}
+        else:
+            command = {'find': call.collection, 'filter': call.query}
+        explain = db.command('explain', command, verbosity='executionStats')
+        violations.extend(f"{call.collection}.{call.operation}: {v}" for v in _plan_violations(explain))
+    assert not violations, "Collection scans:\n" + "\n".join(violations)
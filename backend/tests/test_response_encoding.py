@@ -0,0 +1,113 @@
+# backend/tests/test_response_encoding.py
+"""BSON-aware JSON responses, and per-request brotli/gzip compression negotiated from Accept-Encoding."""
+import gzip
+import json
+from datetime import datetime, timezone
+
+import brotli
+import pytest
+from bson import ObjectId
+from flask import Flask, Response, jsonify
+
+from config import Config
+from utils.compression import init_compression
+from utils.json_provider import BSONJSONProvider
+
+NOTE_ID = ObjectId('65f1c2a4e13b5a7d9c0f1234')
+CREATED_AT = datetime(2026, 3, 1, 9, 30, 15, 250000)
+LARGE = {'notes': [{'_id': NOTE_ID, 'title': f'Cells {i}', 'created_at': CREATED_AT} for i in range(100)]}
+
+
+@pytest.fixture(scope='module')
+def encoding_client():
+    """A bare app with the JSON provider and compression hook, serving bodies of known size."""
+    app = Flask(__name__)
+    app.json_provider_class = BSONJSONProvider
+    app.json = BSONJSONProvider(app)
+    init_compression(app)
+
+    @app.route('/large')
+    def large():
+        response = jsonify(LARGE)
+        response.set_etag('notes-v1')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify({'_id': NOTE_ID})
+
+    @app.route('/stream')
+    def stream():
+        events = (f"data: {json.dumps({'part': i, 'text': 'x' * 200})}\n\n" for i in range(20))
+        return Response(events, mimetype='text/event-stream')
+
+    @app.route('/events')
+    def events():
+        # Buffered, but still an event stream the browser reads incrementally
+        return Response('data: ' + 'x' * 4096 + '\n\n', mimetype='text/event-stream')
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize('accept, encoding', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip;q=1.0, br;q=0.5', 'gzip'),
+    ('gzip', 'gzip'),
+    ('br', 'br'),
+])
+def test_best_accepted_encoding_is_used(encoding_client, accept, encoding):
+    response = encoding_client.get('/large', headers={'Accept-Encoding': accept})
+    assert response.headers['Content-Encoding'] == encoding
+    decompress = brotli.decompress if encoding == 'br' else gzip.decompress
+    assert json.loads(decompress(response.get_data()))['notes'][0]['title'] == 'Cells 0'
+
+
+@pytest.mark.parametrize('accept', [None, 'identity', 'deflate'])
+def test_unsupported_encodings_get_the_plain_body(encoding_client, accept):
+    response = encoding_client.get('/large', headers={'Accept-Encoding': accept} if accept else {})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()['notes'][0]['title'] == 'Cells 0'
+    assert 'Accept-Encoding' in response.vary
+
+
+def test_small_bodies_are_not_compressed(encoding_client):
+    response = encoding_client.get('/small', headers={'Accept-Encoding': 'br, gzip'})
+    assert len(response.get_data()) < Config.COMPRESS_MIN_BYTES
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+
+
+@pytest.mark.parametrize('path', ['/stream', '/events'])
+def test_event_streams_are_not_compressed(encoding_client, path):
+    response = encoding_client.get(path, headers={'Accept-Encoding': 'br, gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True).startswith('data: ')
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_encoded_responses_vary_and_suffix_their_etag(encoding_client, encoding):
+    response = encoding_client.get('/large', headers={'Accept-Encoding': encoding})
+    assert 'Accept-Encoding' in response.vary
+    assert response.get_etag() == (f'notes-v1-{encoding}', False)
+    assert encoding_client.get('/large').get_etag() == ('notes-v1', False)
+
+
+def test_object_ids_and_datetimes_are_encoded():
+    app = Flask(__name__)
+    provider = BSONJSONProvider(app)
+    doc = {'_id': NOTE_ID, 'created_at': CREATED_AT, 'due': datetime(2026, 3, 2, tzinfo=timezone.utc)}
+    expected = {'_id': str(NOTE_ID), 'created_at': '2026-03-01T09:30:15.250000Z', 'due': '2026-03-02T00:00:00Z'}
+    assert json.loads(provider.dumps(doc)) == expected
+    # Passing json.dumps options takes the standard library path, which must agree
+    assert json.loads(provider.dumps(doc, indent=2)) == expected
+
+
+def test_deck_etag_revalidates_in_any_encoding(client, auth_headers, db):
+    cards = [{'id': f'c{i}', 'term': f'Term {i}', 'definition': 'A part of the cell. ' * 5} for i in range(30)]
+    deck_id = client.post('/flashcards/decks', headers=auth_headers, json={'title': 'Cells', 'description': 'Organelles', 'cards': cards}).get_json()['_id']
+    url = f'/flashcards/decks/{deck_id}'
+
+    encoded = client.get(url, headers={**auth_headers, 'Accept-Encoding': 'br'})
+    assert encoded.headers['Content-Encoding'] == 'br' and encoded.get_etag()[0].endswith('-br')
+    revalidated = client.get(url, headers={**auth_headers, 'Accept-Encoding': 'gzip', 'If-None-Match': encoded.headers['ETag']})
+    assert revalidated.status_code == 304
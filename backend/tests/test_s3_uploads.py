@@ -0,0 +1,102 @@
+# backend/tests/test_s3_uploads.py
+"""Checksummed direct uploads confirmed through /notes/upload/confirm, and streamed base64 decoding."""
+import base64
+import binascii
+import hashlib
+import io
+import tempfile
+from datetime import datetime
+
+import pytest
+
+from utils.s3_manager import BASE64_DECODE_CHUNK, decode_base64_into, s3_manager
+
+BODY = b'%PDF-1.4 lecture notes on cell biology'
+SHA256 = hashlib.sha256(BODY).hexdigest()
+
+
+@pytest.fixture
+def subject_id(db, user_id):
+    return str(db.subjects.insert_one({'user_id': user_id, 'subject_name': 'Biology', 'created_at': datetime.utcnow()}).inserted_id)
+
+
+def put_upload(s3, key, body=BODY, checksum=True):
+    """An object as the browser's presigned POST leaves it in S3."""
+    s3.objects[key] = body
+    if checksum:
+        s3.checksums[key] = base64.b64encode(hashlib.sha256(body).digest()).decode('ascii')
+    return key
+
+
+def confirm(client, auth_headers, subject_id, key, **body):
+    return client.post('/notes/upload/confirm', headers=auth_headers, json={
+        'title': 'Cells', 'description': 'Lecture', 'subject_id': subject_id, 'key': key, **body})
+
+
+def test_matching_checksum_is_stored_on_the_note(client, auth_headers, db, s3, user_id, subject_id):
+    key = put_upload(s3, f'users/{user_id}/uploads/abc_cells.pdf')
+    response = confirm(client, auth_headers, subject_id, key, sha256=SHA256.upper())
+    assert response.status_code == 201, response.get_json()
+    note = db.notes.find_one()
+    assert (note['file_sha256'], note['filename']) == (SHA256, 'cells.pdf')
+
+
+@pytest.mark.parametrize('declared, checksum', [
+    (hashlib.sha256(b'other bytes').hexdigest(), True),
+    ('not-a-digest', True),
+    # The object was uploaded without the pinned checksum
+    (SHA256, False),
+], ids=['mismatch', 'malformed', 'unchecksummed'])
+def test_checksum_mismatch_is_rejected(client, auth_headers, db, s3, user_id, subject_id, declared, checksum):
+    key = put_upload(s3, f'users/{user_id}/uploads/abc_cells.pdf', checksum=checksum)
+    response = confirm(client, auth_headers, subject_id, key, sha256=declared)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Uploaded file checksum does not match'
+    assert db.notes.count_documents({}) == 0
+
+
+@pytest.mark.parametrize('key', [
+    'users/someone-else@example.com/uploads/abc_cells.pdf',
+    'users/student@example.com/cells.pdf',
+    'users/student@example.com/uploadsabc_cells.pdf',
+    None,
+])
+def test_keys_outside_the_users_uploads_are_rejected(client, auth_headers, db, s3, subject_id, key):
+    if key:
+        put_upload(s3, key)
+    response = confirm(client, auth_headers, subject_id, key)
+    assert response.status_code == 400
+    assert 'head_object' not in s3.calls
+    assert db.notes.count_documents({}) == 0
+
+
+@pytest.mark.parametrize('text', ['abcde', 'QUJD=A', '=AAA'])
+def test_invalid_base64_raises(text):
+    with pytest.raises(binascii.Error):
+        decode_base64_into(text, io.BytesIO())
+
+
+def test_invalid_base64_image_is_not_uploaded(s3, user_id):
+    with pytest.raises(binascii.Error):
+        s3_manager.upload_base64('abcde', user_id, 'card.png')
+    assert s3.objects == {}
+
+
+def test_large_payload_decodes_across_slices():
+    payload = bytes(range(256)) * (3 * BASE64_DECODE_CHUNK // 256 + 7)
+    # Line breaks every 76 characters move the slice boundaries off the 4-character groups
+    text = base64.encodebytes(payload).decode('ascii')
+    with tempfile.SpooledTemporaryFile(max_size=BASE64_DECODE_CHUNK) as buffer:
+        decode_base64_into(text, buffer)
+        assert buffer._rolled
+        buffer.seek(0)
+        assert buffer.read() == payload
+
+
+def test_large_image_is_uploaded_intact(s3, user_id, monkeypatch):
+    monkeypatch.setattr(s3_manager, 'spool_max_memory', 1024)
+    payload = bytes(range(256)) * 1024
+    url = s3_manager.upload_base64(base64.b64encode(payload).decode('ascii'), user_id, 'card.png')
+    key = url.split('.amazonaws.com/', 1)[1]
+    assert s3.objects[key] == payload
+    assert s3.checksums[key] == base64.b64encode(hashlib.sha256(payload).digest()).decode('ascii')
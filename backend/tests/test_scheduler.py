@@ -0,0 +1,140 @@
+# backend/tests/test_scheduler.py
+"""SM-2 scheduling, conditional schedule writes, due cards and the legacy deck backfill."""
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from utils.scheduler import DEFAULT_EASE, MIN_EASE, SCHEDULE_WRITE_RETRIES, CardScheduler, default_schedule, sm2_review
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def review_many(qualities, schedule=None):
+    schedule = schedule or default_schedule(NOW)
+    for quality in qualities:
+        schedule = sm2_review(schedule, quality, NOW)
+    return schedule
+
+
+def test_intervals_grow_one_six_then_by_ease():
+    schedules = [review_many([5] * n) for n in range(1, 5)]
+    assert [s['interval'] for s in schedules[:2]] == [1, 6]
+    assert schedules[2]['interval'] == round(6 * schedules[1]['ease'])
+    assert schedules[3]['interval'] == round(schedules[2]['interval'] * schedules[2]['ease'])
+    assert schedules[3]['next_due'] == NOW + timedelta(days=schedules[3]['interval'])
+    assert schedules[3]['reviews'] == 4
+
+
+def test_lapse_restarts_the_card_and_lowers_ease():
+    learned = review_many([4, 4, 4])
+    lapsed = sm2_review(learned, 1, NOW)
+    assert (lapsed['repetitions'], lapsed['interval']) == (0, 1)
+    assert lapsed['ease'] < learned['ease']
+    assert sm2_review(lapsed, 4, NOW)['interval'] == 1
+
+
+def test_ease_never_drops_below_the_floor():
+    assert review_many([0] * 10)['ease'] == MIN_EASE
+    assert review_many([3])['ease'] < DEFAULT_EASE
+
+
+@pytest.fixture
+def scheduler(db):
+    return CardScheduler()
+
+
+def test_record_reviews_applies_answers_in_order(scheduler, user_id):
+    deck_id = ObjectId()
+    scheduler.seed_deck(user_id, deck_id, 2, NOW)
+    updated = scheduler.record_reviews(user_id, deck_id, [(0, 5, NOW), (0, 5, NOW), (1, 1, NOW)])
+    assert updated[0] == review_many([5, 5])
+    assert updated[1]['interval'] == 1 and updated[1]['repetitions'] == 0
+    stored = scheduler.collection.find_one({'deck_id': deck_id, 'card_index': 0})
+    assert stored['reviews'] == 2 and stored['interval'] == 6
+
+
+class RacingCollection:
+    """Lets `races` other writers review the card between each read and the write that follows."""
+
+    def __init__(self, collection, races):
+        self._collection = collection
+        self.races = races
+
+    def __getattr__(self, attr):
+        return getattr(self._collection, attr)
+
+    def find_one(self, *args, **kwargs):
+        found = self._collection.find_one(*args, **kwargs)
+        if self.races:
+            self.races -= 1
+            self._collection.update_one(args[0], {'$inc': {'reviews': 1}})
+        return found
+
+
+def test_conflicting_write_is_retried_on_fresh_state(scheduler, user_id):
+    deck_id = ObjectId()
+    scheduler.seed_deck(user_id, deck_id, 1, NOW)
+    scheduler.collection = RacingCollection(scheduler.collection, races=2)
+    updated = scheduler.record_reviews(user_id, deck_id, [(0, 5, NOW)])
+    # Two writers got in first, so the review lands on top of theirs instead of replacing them
+    assert updated[0]['reviews'] == 3
+    assert scheduler.collection.find_one({'deck_id': deck_id})['reviews'] == 3
+
+
+def test_record_reviews_gives_up_after_the_retry_budget(scheduler, user_id):
+    deck_id = ObjectId()
+    scheduler.seed_deck(user_id, deck_id, 1, NOW)
+    scheduler.collection = RacingCollection(scheduler.collection, races=SCHEDULE_WRITE_RETRIES)
+    assert scheduler.record_reviews(user_id, deck_id, [(0, 5, NOW)]) == {}
+    assert scheduler.collection.find_one({'deck_id': deck_id})['reviews'] == SCHEDULE_WRITE_RETRIES
+
+
+def test_due_cards_are_the_users_oldest_due_first(scheduler, user_id):
+    deck_id = ObjectId()
+    scheduler.seed_deck(user_id, deck_id, 3, NOW)
+    scheduler.seed_deck('other@example.com', ObjectId(), 2, NOW)
+    scheduler.collection.update_one({'deck_id': deck_id, 'card_index': 0}, {'$set': {'next_due': NOW - timedelta(days=1)}})
+    scheduler.collection.update_one({'deck_id': deck_id, 'card_index': 2}, {'$set': {'next_due': NOW + timedelta(days=1)}})
+
+    due = scheduler.due_cards(user_id, 10, NOW)
+    assert [(entry['deck_id'], entry['card_index']) for entry in due] == [(deck_id, 0), (deck_id, 1)]
+    assert len(scheduler.due_cards(user_id, 1, NOW)) == 1
+
+
+def test_backfill_schedules_legacy_decks_once(scheduler, db, user_id):
+    legacy, partial, current = db.flashcards_decks.insert_many([
+        {'user_id': user_id, 'cards': [{'id': 'a'}, {'id': 'b'}]},
+        {'user_id': user_id, 'cards': [{'id': 'c'}, {'id': 'd'}]},
+        {'user_id': user_id, 'cards': [{'id': 'e'}], 'schedules_seeded': True},
+    ]).inserted_ids
+    scheduler.seed_deck(user_id, partial, 1, NOW - timedelta(days=3))
+
+    assert scheduler.backfill_decks(db.flashcards_decks, NOW) == 2
+    assert scheduler.backfill_decks(db.flashcards_decks, NOW) == 0
+    assert scheduler.collection.count_documents({'deck_id': legacy}) == 2
+    assert scheduler.collection.count_documents({'deck_id': current}) == 0
+    # Existing schedules are kept
+    assert scheduler.collection.find_one({'deck_id': partial, 'card_index': 0})['next_due'] == NOW - timedelta(days=3)
+    assert scheduler.collection.find_one({'deck_id': partial, 'card_index': 1})['next_due'] == NOW
+
+
+def test_legacy_progress_put_goes_through_the_scheduler(client, auth_headers, db, user_id):
+    deck_id = client.post('/flashcards/decks', headers=auth_headers, json={
+        'title': 'Cells', 'description': 'Organelles', 'cards': [{'id': 'a'}, {'id': 'b'}]}).get_json()['_id']
+    schedules = db.card_schedules
+
+    answered = {'0': {'streak': 1, 'status': 'learned', 'lastAnswered': '2026-01-02T09:00:00Z'}}
+    response = client.put(f'/flashcards/decks/{deck_id}/progress', headers=auth_headers, json={
+        'progress': {'learned': [0], 'mastered': [], 'unfamiliar': [1]}, 'cardStates': answered})
+    assert response.status_code == 200
+    card = schedules.find_one({'deck_id': ObjectId(deck_id), 'card_index': 0})
+    assert (card['reviews'], card['interval']) == (1, 1)
+    assert card['next_due'] == datetime(2026, 1, 3, 9, 0)
+
+    # The study page's reset sends no cardStates, so answered cards start over
+    response = client.put(f'/flashcards/decks/{deck_id}/progress', headers=auth_headers, json={
+        'progress': {'learned': [], 'mastered': [], 'unfamiliar': [0, 1]}})
+    assert response.status_code == 200
+    card = schedules.find_one({'deck_id': ObjectId(deck_id), 'card_index': 0})
+    assert (card['reviews'], card['interval']) == (0, 0)
@@ -0,0 +1,51 @@
+# backend/tests/test_startup.py
+"""Importing the app and calling create_app() builds no AWS or OpenAI client; they are created on first use."""
+import os
+import subprocess
+import sys
+
+from utils.startup_profile import BACKEND_DIR
+
+# Run in a fresh interpreter: the test session has long since imported openai and built clients
+LAZY_CLIENTS_SCRIPT = """
+import sys
+import boto3
+import boto3.session
+
+built = []
+def refuse(service_name, *args, **kwargs):
+    built.append(service_name)
+    raise RuntimeError(f'{service_name} client built')
+boto3.client = refuse
+boto3.session.Session.client = lambda session, service_name, *args, **kwargs: refuse(service_name)
+
+from utils.health import health_monitor
+# The probes are the first use of every client; they run on a background thread after startup
+health_monitor.start = lambda: None
+
+import app
+app.create_app()
+from utils.gpt_api import gpt_manager
+from utils.s3_manager import s3_manager
+assert not built, built
+assert s3_manager._s3 is None and gpt_manager._textract is None
+assert 'openai' not in sys.modules, 'openai imported at startup'
+
+# First use does build them
+for name, first_use in (('s3', lambda: s3_manager.s3), ('textract', lambda: gpt_manager.textract)):
+    try:
+        first_use()
+    except RuntimeError:
+        pass
+assert built == ['s3', 'textract'], built
+print('lazy')
+"""
+
+
+def test_startup_builds_no_clients():
+    result = subprocess.run(
+        [sys.executable, '-c', LAZY_CLIENTS_SCRIPT],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith('lazy')
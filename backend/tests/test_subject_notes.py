@@ -0,0 +1,134 @@
+# backend/tests/test_subject_notes.py
+"""/notes/subject_notes/<id> returns each note with its generated content, summary or length."""
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from routes.notes import GENERATED_SUMMARY_LENGTH, backfill_generated_subjects, store_generated_notes
+
+HTML = '<h1>Cells</h1><p>' + 'The cell is the basic unit of life. ' * 20 + '</p>'
+
+
+@pytest.fixture
+def subject_notes(db, user_id):
+    """Three notes in one subject: generated notes stored now, stored before summaries were, and none."""
+    subject_id = ObjectId()
+    started = datetime.utcnow()
+    ids = db.notes.insert_many([
+        {'user_id': user_id, 'subject_id': subject_id, 'title': title, 'extracted_text': 'text', 'created_at': started - timedelta(seconds=i)}
+        for i, title in enumerate(('Current', 'Legacy', 'Ungenerated'))
+    ]).inserted_ids
+    store_generated_notes(ids[0], user_id, HTML, subject_id)
+    db.generated_notes.insert_one({'user_id': user_id, 'original_note_id': ids[1], 'content': HTML, 'created_at': started})
+    return subject_id
+
+
+def fetch(client, auth_headers, subject_id, content):
+    response = client.get(f'/notes/subject_notes/{subject_id}?content={content}', headers=auth_headers)
+    assert response.status_code == 200
+    return {note['title']: note for note in response.get_json()['notes']}
+
+
+def test_full_returns_the_html(client, auth_headers, subject_notes):
+    notes = fetch(client, auth_headers, subject_notes, 'full')
+    for title in ('Current', 'Legacy'):
+        assert notes[title]['generated_content'] == HTML
+        assert notes[title]['generated_content_length'] == len(HTML)
+        assert 'extracted_text' not in notes[title]
+    assert 'generated_content' not in notes['Ungenerated']
+
+
+def test_summary_returns_plain_text_without_the_html(client, auth_headers, subject_notes):
+    notes = fetch(client, auth_headers, subject_notes, 'summary')
+    for title in ('Current', 'Legacy'):
+        summary = notes[title]['generated_summary']
+        assert summary.startswith('Cells The cell is') and summary.endswith('...')
+        assert len(summary) <= GENERATED_SUMMARY_LENGTH + 3
+        assert 'generated_content' not in notes[title]
+    assert 'generated_summary' not in notes['Ungenerated']
+
+
+def test_none_returns_only_the_length(client, auth_headers, subject_notes):
+    notes = fetch(client, auth_headers, subject_notes, 'none')
+    assert notes['Current']['generated_content_length'] == len(HTML)
+    assert not {'generated_content', 'generated_summary'} & set(notes['Current'])
+
+
+def round_trips(mongo_calls):
+    return [(call.collection, call.operation) for call in mongo_calls if call.collection != 'revoked_tokens']
+
+
+def test_notes_and_generated_notes_are_fetched_in_one_aggregation(client, auth_headers, subject_notes, db, mongo_calls):
+    db.generated_notes.update_many({}, {'$set': {'content_length': len(HTML), 'summary': 'Cells'}})
+    del mongo_calls[:]
+    fetch(client, auth_headers, subject_notes, 'summary')
+    assert round_trips(mongo_calls) == [('notes', 'aggregate')]
+    lookup = next(stage['$lookup'] for stage in mongo_calls[-1].query if '$lookup' in stage)
+    assert (lookup['from'], lookup['foreignField']) == ('generated_notes', 'original_note_id')
+
+
+@pytest.mark.parametrize('content, queries', [
+    # The joined documents already carry the HTML the legacy fields are computed from
+    ('full', [('notes', 'aggregate')]),
+    ('summary', [('notes', 'aggregate'), ('generated_notes', 'find')]),
+])
+def test_legacy_generated_notes_are_only_refetched_without_their_html(client, auth_headers, subject_notes, mongo_calls, content, queries):
+    del mongo_calls[:]
+    fetch(client, auth_headers, subject_notes, content)
+    assert round_trips(mongo_calls) == queries
+
+
+def test_selected_fields_keep_the_generated_content(client, auth_headers, subject_notes):
+    response = client.get(f'/notes/subject_notes/{subject_notes}?fields=title,generated', headers=auth_headers)
+    assert response.status_code == 200
+    notes = {note['title']: note for note in response.get_json()['notes']}
+    assert set(notes['Current']) == {'_id', 'created_at', 'title', 'generated_content', 'generated_content_length'}
+    assert set(notes['Ungenerated']) == {'_id', 'created_at', 'title'}
+
+
+def test_unknown_content_mode_is_rejected(client, auth_headers, subject_notes):
+    assert client.get(f'/notes/subject_notes/{subject_notes}?content=raw', headers=auth_headers).status_code == 400
+
+
+def generated_titles(client, auth_headers, db, subject_id):
+    response = client.get(f'/notes/generated_notes/{subject_id}', headers=auth_headers)
+    assert response.status_code == 200
+    note_ids = [ObjectId(doc['original_note_id']) for doc in response.get_json()['generated_notes']]
+    return sorted(note['title'] for note in db.notes.find({'_id': {'$in': note_ids}}))
+
+
+def test_generated_notes_follow_their_note_between_subjects(client, auth_headers, db, user_id, subject_notes):
+    assert generated_titles(client, auth_headers, db, subject_notes) == ['Current']
+
+    other = db.subjects.insert_one({'user_id': user_id, 'subject_name': 'Chemistry', 'created_at': datetime.utcnow()}).inserted_id
+    note_id = db.notes.find_one({'title': 'Current'})['_id']
+    response = client.post('/notes/add_to_subject', headers=auth_headers, json={'note_id': str(note_id), 'subject_id': str(other)})
+    assert response.status_code == 200
+    assert generated_titles(client, auth_headers, db, subject_notes) == []
+    assert generated_titles(client, auth_headers, db, other) == ['Current']
+
+
+def test_backfill_copies_subject_ids_onto_legacy_generated_notes(client, auth_headers, db, subject_notes):
+    assert backfill_generated_subjects() == 1
+    assert backfill_generated_subjects() == 0
+    assert generated_titles(client, auth_headers, db, subject_notes) == ['Current', 'Legacy']
+
+
+def test_backfill_walks_generated_notes_in_batches(db, user_id, subject_notes, mongo_calls):
+    note_ids = db.notes.insert_many([{'user_id': user_id, 'subject_id': subject_notes, 'title': f'Legacy {i}'} for i in range(4)]).inserted_ids
+    db.generated_notes.insert_many([{'user_id': user_id, 'original_note_id': note_id, 'content': HTML} for note_id in note_ids])
+    del mongo_calls[:]
+
+    assert backfill_generated_subjects(batch_size=2) == 5
+    batches = [call for call in mongo_calls if call.collection == 'generated_notes' and call.operation == 'find']
+    # Three full batches of two and the empty one that ends the walk
+    assert len(batches) == 4 and all('_id' in call.query for call in batches)
+    assert db.generated_notes.count_documents({'subject_id': {'$exists': False}}) == 0
+
+
+@pytest.mark.parametrize('fields', ['title,title.x', 'generated', 'generated.content', 'title,_id.x'])
+def test_overlapping_fields_do_not_collide(client, auth_headers, subject_notes, fields):
+    response = client.get(f'/notes/subject_notes/{subject_notes}?fields={fields}', headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['notes']) == 3
@@ -0,0 +1,84 @@
+# backend/tests/test_text_extraction.py
+"""extract_local_text: which uploads are read locally, and which are left to Textract."""
+import io
+import zipfile
+
+import pytest
+
+from utils.text_extraction import extract_local_text
+
+PAGE_TEXT = 'Mitochondria produce ATP for the cell'
+
+
+def make_pdf(pages) -> bytes:
+    """A minimal PDF with one Helvetica text line per page; an empty string makes a page with no text layer."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET' if text else ''
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f'{number} 0 obj\n{body}\nendobj\n'.encode()
+    xref = len(data)
+    data += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    data += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode()
+    data += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return data
+
+
+def make_docx(paragraphs) -> bytes:
+    namespace = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        archive.writestr('word/document.xml', f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>')
+    return buffer.getvalue()
+
+
+def test_plain_text_drops_the_bom():
+    result = extract_local_text('\ufeffCell biology\n'.encode('utf-8'), 'text/plain', 'notes.txt')
+    assert result == {'text': 'Cell biology\n', 'method': 'plain'}
+
+
+def test_utf16_text_is_decoded():
+    result = extract_local_text('Cell biology'.encode('utf-16'), 'application/octet-stream', 'notes.txt')
+    assert result == {'text': 'Cell biology', 'method': 'plain'}
+
+
+def test_docx_paragraphs_are_joined():
+    result = extract_local_text(make_docx(['Cells', 'Organelles']), 'application/octet-stream', 'notes.docx')
+    assert result == {'text': 'Cells\nOrganelles', 'method': 'docx'}
+
+
+def test_text_layer_pdf_is_read_locally():
+    result = extract_local_text(make_pdf([PAGE_TEXT, PAGE_TEXT]), 'application/pdf', 'notes.pdf')
+    assert result == {'text': f'{PAGE_TEXT}\n\n{PAGE_TEXT}', 'method': 'pdf-text'}
+
+
+@pytest.mark.parametrize('pages', [
+    [''],
+    ['', ''],
+    # Enough text on one page to cover every page on average
+    [PAGE_TEXT * 10] + [''] * 9,
+    [PAGE_TEXT, 'Fig. 1', PAGE_TEXT],
+], ids=['scanned', 'scanned-multipage', 'mixed', 'short-page'])
+def test_pdf_with_a_scanned_page_is_left_to_textract(pages):
+    assert extract_local_text(make_pdf(pages), 'application/pdf', 'notes.pdf') is None
+
+
+@pytest.mark.parametrize('data, content_type, filename', [
+    (b'\x89PNG\r\n\x1a\n', 'image/png', 'slide.png'),
+    (b'PK\x03\x04 not a zip', 'application/octet-stream', 'notes.docx'),
+    (b'%PDF-1.4 truncated', 'application/pdf', 'notes.pdf'),
+], ids=['image', 'broken-zip', 'broken-pdf'])
+def test_unreadable_uploads_are_left_to_textract(data, content_type, filename):
+    assert extract_local_text(data, content_type, filename) is None
@@ -0,0 +1,67 @@
+# backend/tests/test_textract_pdf.py
+"""GPTManager.extract_text_from_pdf: polling, NextToken pages, page order and failures of asynchronous Textract jobs."""
+import pytest
+
+from config import Config
+from utils.gpt_api import gpt_manager
+
+
+@pytest.fixture(autouse=True)
+def no_poll_delay(monkeypatch):
+    monkeypatch.setattr(Config, 'TEXTRACT_POLL_INTERVAL', 0)
+
+
+def line(text, page):
+    return {'BlockType': 'LINE', 'Text': text, 'Page': page}
+
+
+def detection_calls(textract):
+    return [token for name, token in textract.calls if name == 'get_document_text_detection']
+
+
+def test_polls_until_the_job_succeeds(textract):
+    textract.detection_responses = [
+        {'JobStatus': 'IN_PROGRESS'},
+        {'JobStatus': 'IN_PROGRESS'},
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [{'BlockType': 'PAGE', 'Page': 1}, line('Cells', 1), line('Tissues', 1)]},
+    ]
+    assert gpt_manager.extract_text_from_pdf('test-bucket', 'notes.pdf') == {'text': 'Cells\nTissues', 'pages': 1}
+    assert textract.calls[0] == ('start_document_text_detection', {'S3Object': {'Bucket': 'test-bucket', 'Name': 'notes.pdf'}})
+    assert detection_calls(textract) == [None, None, None]
+
+
+def test_follows_next_token_through_every_result_page(textract):
+    textract.detection_responses = [
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [line('Cells', 1)], 'NextToken': 'page-2'},
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [line('Tissues', 2)], 'NextToken': 'page-3'},
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [line('Organs', 3)]},
+    ]
+    assert gpt_manager.extract_text_from_pdf('test-bucket', 'notes.pdf') == {'text': 'Cells\n\nTissues\n\nOrgans', 'pages': 3}
+    assert detection_calls(textract) == [None, 'page-2', 'page-3']
+
+
+def test_pages_are_joined_in_page_order(textract):
+    # Result pages are not guaranteed to follow document pages
+    textract.detection_responses = [
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [line('Organs', 3), line('Cells', 1)], 'NextToken': 'more'},
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [line('Tissues', 2), line('Membranes', 1)]},
+    ]
+    result = gpt_manager.extract_text_from_pdf('test-bucket', 'notes.pdf')
+    assert result['text'] == 'Cells\nMembranes\n\nTissues\n\nOrgans'
+
+
+def test_failed_job_raises(textract):
+    textract.detection_responses = [
+        {'JobStatus': 'IN_PROGRESS'},
+        {'JobStatus': 'FAILED', 'StatusMessage': 'Unsupported document'},
+    ]
+    with pytest.raises(RuntimeError, match='Unsupported document'):
+        gpt_manager.extract_text_from_pdf('test-bucket', 'notes.pdf')
+
+
+def test_job_past_the_timeout_raises(textract, monkeypatch):
+    monkeypatch.setattr(Config, 'TEXTRACT_TIMEOUT', -1)
+    textract.detection_responses = [{'JobStatus': 'IN_PROGRESS'}, {'JobStatus': 'SUCCEEDED', 'Blocks': []}]
+    with pytest.raises(TimeoutError):
+        gpt_manager.extract_text_from_pdf('test-bucket', 'notes.pdf')
+    assert detection_calls(textract) == [None]
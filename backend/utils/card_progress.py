@@ -0,0 +1,72 @@
+# backend/utils/card_progress.py
+from datetime import datetime, timezone
+
+# Same thresholds the study page applies client-side (app/test/[deckId]/page.js)
+STREAK_THRESHOLDS = {
+    'MASTERY': 3,
+    'LEARNED': 1,
+    'DEMOTION': -2,
+}
+
+CARD_STATUSES = ('unfamiliar', 'learned', 'mastered')
+
+
+def default_card_state() -> dict:
+    return {'streak': 0, 'status': 'unfamiliar', 'lastAnswered': None}
+
+
+def card_status(state) -> str:
+    """A card state's status, with a missing or unrecognised one read as unfamiliar."""
+    status = (state or {}).get('status')
+    return status if status in CARD_STATUSES else 'unfamiliar'
+
+
+def initial_progress_counts(total_cards: int) -> dict:
+    return {'learned': 0, 'mastered': 0, 'unfamiliar': total_cards, 'total': total_cards}
+
+
+def progress_counts_from_states(card_states: dict, total_cards: int) -> dict:
+    counts = initial_progress_counts(total_cards)
+    for i in range(total_cards):
+        status = card_status(card_states.get(str(i)))
+        if status in ('learned', 'mastered'):
+            counts[status] += 1
+            counts['unfamiliar'] -= 1
+    return counts
+
+
+def apply_answer(state: dict, correct: bool, answered_at: datetime) -> dict:
+    """
+    Return the card state after one answer, following the study page's
+    streak rules: a streak of 1 promotes unfamiliar to learned, 3 promotes
+    learned to mastered, and -2 demotes one level and resets the streak.
+    """
+    streak = state.get('streak', 0) + (1 if correct else -1)
+    status = card_status(state)
+
+    if streak >= STREAK_THRESHOLDS['MASTERY'] and status == 'learned':
+        status = 'mastered'
+    elif streak >= STREAK_THRESHOLDS['LEARNED'] and status == 'unfamiliar':
+        status = 'learned'
+    elif streak <= STREAK_THRESHOLDS['DEMOTION']:
+        status = 'learned' if status == 'mastered' else 'unfamiliar'
+        streak = 0
+
+    return {'streak': streak, 'status': status, 'lastAnswered': answered_at}
+
+
+def parse_answer_timestamp(value) -> datetime:
+    """
+    Accept an ISO 8601 string or epoch milliseconds (as sent by Date.now())
+    and return a naive UTC datetime. Missing values mean "now".
+    """
+    if value is None:
+        return datetime.utcnow()
+    if isinstance(value, bool):
+        raise ValueError("Invalid timestamp")
+    if isinstance(value, (int, float)):
+        return datetime.utcfromtimestamp(value / 1000)
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
@@ -0,0 +1,59 @@
+# backend/utils/chunking.py
+import math
+import re
+
+# Rough token estimate for English text with the GPT tokenizers (~4 characters per token)
+CHARS_PER_TOKEN = 4
+
+# Separators tried in order, from the coarsest structural boundary to the finest
+_SPLITTERS = [
+    re.compile(r'\n\s*\n'),        # paragraphs / blocks
+    re.compile(r'\n'),             # lines
+    re.compile(r'(?<=[.!?])\s+'),  # sentences
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _split_piece(text: str, max_tokens: int, level: int = 0) -> list:
+    """
+    Break text into pieces that each fit max_tokens, using the coarsest
+    separator that works and falling back to a hard character cut.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    if level >= len(_SPLITTERS):
+        size = max_tokens * CHARS_PER_TOKEN
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    pieces = []
+    for part in _SPLITTERS[level].split(text):
+        if part.strip():
+            pieces.extend(_split_piece(part, max_tokens, level + 1))
+    return pieces
+
+
+def split_text(text: str, max_tokens: int) -> list:
+    """
+    Split text into chunks of at most max_tokens (estimated), cutting on
+    paragraph, line and sentence boundaries and packing adjacent pieces
+    together so chunks stay close to the budget.
+
+    Returns:
+        list: Non-empty chunks in document order.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in _split_piece(text.strip(), max_tokens):
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append('\n\n'.join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
@@ -0,0 +1,126 @@
+# backend/utils/completion_cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo.errors import PyMongoError
+from config import Config
+from utils.database import collection
+
+
+class CompletionCache:
+    """
+    Two-tier cache for chat completions: a per-process LRU in front of a
+    MongoDB collection shared by all workers. Entries expire after ttl_seconds
+    in both tiers; the collection relies on a TTL index on 'expires_at'
+    (see utils/indexes.py) to purge them.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_entry_bytes: int,
+                 enabled: bool = True, collection_name: str = 'completion_cache'):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_entry_bytes = max_entry_bytes
+        self.enabled = enabled
+        self.collection = collection(collection_name)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'persistent_hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def make_key(model: str, messages: list, **params) -> str:
+        """
+        Hash of everything that determines a completion: model, the system and
+        user messages and the sampling parameters.
+        """
+        material = json.dumps({'model': model, 'messages': messages, 'params': params}, sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return entry[0]
+            if entry:
+                del self._memory[key]
+
+        try:
+            doc = self.collection.find_one({'_id': key, 'expires_at': {'$gt': datetime.utcnow()}})
+        except PyMongoError as e:
+            logging.warning(f"Completion cache lookup failed: {e}")
+            doc = None
+
+        with self._lock:
+            if not doc:
+                self._stats['misses'] += 1
+                return None
+            self._stats['persistent_hits'] += 1
+
+        remaining = (doc['expires_at'] - datetime.utcnow()).total_seconds()
+        self._remember(key, doc['value'], now + remaining)
+        return doc['value']
+
+    def put(self, key: str, value: dict):
+        if not self.enabled:
+            return
+        if len(json.dumps(value).encode('utf-8')) > self.max_entry_bytes:
+            return
+
+        self._remember(key, value, time.time() + self.ttl_seconds)
+        try:
+            self.collection.update_one(
+                {'_id': key},
+                {'$set': {
+                    'value': value,
+                    'created_at': datetime.utcnow(),
+                    'expires_at': datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+        except PyMongoError as e:
+            logging.warning(f"Completion cache write failed: {e}")
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            self.collection.delete_one({'_id': key})
+        except PyMongoError as e:
+            logging.warning(f"Completion cache delete failed: {e}")
+
+    def _remember(self, key: str, value: dict, expires_at: float):
+        with self._lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._memory)
+        hits = stats['memory_hits'] + stats['persistent_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        stats['enabled'] = self.enabled
+        return stats
+
+
+# Create a default instance
+completion_cache = CompletionCache(
+    max_entries=Config.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
+    max_entry_bytes=Config.LLM_CACHE_MAX_ENTRY_BYTES,
+    enabled=Config.LLM_CACHE_ENABLED
+)
@@ -0,0 +1,66 @@
+# backend/utils/compression.py
+import gzip
+from flask import request
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # Only gzip is offered then
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+}
+
+
+def _supported_encodings() -> list:
+    # Preferred first: brotli is smaller than gzip at a similar CPU cost for JSON
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=Config.COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """
+    after_request hook that compresses buffered text responses with the best
+    encoding the client accepts. Streamed responses (Server-Sent Events,
+    file passthrough) and small bodies are sent as they are.
+    """
+    if (response.status_code < 200 or response.status_code in (204, 304)
+            or response.is_streamed or response.direct_passthrough
+            or response.mimetype == 'text/event-stream'
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(_supported_encodings())
+    if not encoding:
+        return response
+
+    data = response.get_data()
+    if len(data) < Config.COMPRESS_MIN_BYTES:
+        return response
+
+    response.set_data(_compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+
+    # A strong ETag names one exact byte sequence, so each encoding gets its own
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def init_compression(app):
+    if Config.COMPRESS_RESPONSES:
+        app.after_request(compress_response)
@@ -0,0 +1,191 @@
+# backend/utils/database.py
+import os
+import threading
+import logging
+from pymongo import MongoClient, monitoring
+from pymongo.read_preferences import read_pref_mode_from_name
+from pymongo.write_concern import WriteConcern
+from config import Config
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener that keeps running counters for pool_stats().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {
+                'created': 0,
+                'closed': 0,
+                'checked_out': 0,
+                'checked_in': 0,
+                'checkout_failed': 0,
+                'pools_cleared': 0
+            }
+
+    def _incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+        counters['open'] = counters['created'] - counters['closed']
+        counters['in_use'] = counters['checked_out'] - counters['checked_in']
+        return counters
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._incr('pools_cleared')
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._incr('created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._incr('closed')
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._incr('checkout_failed')
+
+    def connection_checked_out(self, event):
+        self._incr('checked_out')
+
+    def connection_checked_in(self, event):
+        self._incr('checked_in')
+
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+_pool_listener = PoolStatsListener()
+
+
+def _build_client():
+    return MongoClient(
+        Config.MONGODB_URI,
+        maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+        minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=Config.MONGO_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=Config.MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=Config.MONGO_SOCKET_TIMEOUT_MS,
+        waitQueueTimeoutMS=Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        event_listeners=[_pool_listener],
+        connect=False
+    )
+
+
+def get_client() -> MongoClient:
+    """
+    Return the MongoClient owned by the current process, creating it on first use.
+
+    A client inherited from a parent process (pre-fork servers such as gunicorn)
+    is discarded and rebuilt, since pymongo clients are not fork-safe.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _lock:
+        if _client is None or _client_pid != pid:
+            if _client is not None:
+                logging.info("Process fork detected, creating a new MongoDB client.")
+            _pool_listener.reset()
+            _client = _build_client()
+            _client_pid = pid
+    return _client
+
+
+def get_db():
+    client = get_client()
+    read_preference = read_pref_mode_from_name(Config.MONGO_READ_PREFERENCE)
+    return client.get_database(
+        Config.MONGO_DB_NAME,
+        read_preference=read_preference,
+        write_concern=WriteConcern(w=Config.MONGO_WRITE_CONCERN_W, wtimeout=Config.MONGO_WRITE_CONCERN_TIMEOUT_MS)
+    )
+
+
+def get_collection(name: str):
+    return get_db()[name]
+
+
+class CollectionProxy:
+    """
+    Module-level stand-in for a collection that resolves against the current
+    process's client, so blueprints can keep a global handle without opening
+    a connection at import time.
+
+    The resolved collection is cached alongside the client it came from and
+    only looked up again when get_client() returns a different client, i.e.
+    after a fork.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._resolved = None
+
+    def _collection(self):
+        client = get_client()
+        resolved = self._resolved
+        if resolved is None or resolved[0] is not client:
+            resolved = (client, get_collection(self.name))
+            self._resolved = resolved
+        return resolved[1]
+
+    def __getattr__(self, attr):
+        return getattr(self._collection(), attr)
+
+    def __repr__(self):
+        return f"CollectionProxy({self.name!r})"
+
+
+def collection(name: str) -> CollectionProxy:
+    return CollectionProxy(name)
+
+
+def pool_stats() -> dict:
+    """
+    Connection pool counters for the current process.
+    """
+    return {
+        'pid': os.getpid(),
+        'client_initialized': _client is not None and _client_pid == os.getpid(),
+        'max_pool_size': Config.MONGO_MAX_POOL_SIZE,
+        'min_pool_size': Config.MONGO_MIN_POOL_SIZE,
+        **_pool_listener.snapshot()
+    }
+
+
+def _reset_after_fork():
+    # Drop the parent's client reference in the child without closing it;
+    # closing would tear down sockets the parent is still using.
+    global _client, _client_pid, _lock
+    _client = None
+    _client_pid = None
+    _lock = threading.Lock()
+    _pool_listener._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
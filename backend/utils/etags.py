@@ -0,0 +1,57 @@
+# backend/utils/etags.py
+import hashlib
+from datetime import datetime
+from typing import Optional
+from flask import Response, request
+
+# Projection for reading just the fields an ETag is derived from
+VERSION_PROJECTION = {'updated_at': 1, 'version': 1}
+
+# Suffixes utils/compression.py appends to the ETag of an encoded representation
+ENCODING_SUFFIXES = ('-br', '-gzip')
+
+
+def bump_version(update: dict) -> dict:
+    """
+    Add an updated_at timestamp and a version increment to a MongoDB update
+    document. Every write that changes what a GET returns should go through
+    this so cached ETags stop matching.
+    """
+    update = dict(update)
+    update['$set'] = {**update.get('$set', {}), 'updated_at': datetime.utcnow()}
+    update['$inc'] = {**update.get('$inc', {}), 'version': 1}
+    return update
+
+
+def document_etag(doc: dict) -> str:
+    """Strong validator for a document, from its _id, version and updated_at."""
+    updated_at = doc.get('updated_at')
+    material = f"{doc['_id']}:{doc.get('version', 0)}:{updated_at.isoformat() if updated_at else ''}"
+    return hashlib.sha1(material.encode('utf-8')).hexdigest()
+
+
+def matching_etag(etag: str) -> Optional[str]:
+    """
+    The ETag from If-None-Match that names this version, in whichever content
+    encoding the client received it, or None if the client's copy is stale.
+    """
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    if if_none_match.star_tag:
+        return etag
+    for candidate in (etag, *(etag + suffix for suffix in ENCODING_SUFFIXES)):
+        if if_none_match.contains(candidate):
+            return candidate
+    return None
+
+
+def not_modified(etag: str) -> Response:
+    return with_etag(Response(status=304), etag)
+
+
+def with_etag(response, etag: str):
+    """Attach a strong ETag and require clients to revalidate before reuse."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -1,18 +1,60 @@
-import openai
 import logging
+import threading
 import boto3
 from config import Config
+from utils.completion_cache import completion_cache
+from utils.chunking import estimate_tokens, split_text
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
 import json
+import re
+import time
+
+# Characters from the start of each part sent to the outline model
+OUTLINE_PREVIEW_CHARS = 600
+
+# Document wrappers a chunk completion may still include despite the prompt
+_FENCE = re.compile(r'^\s*```(?:html)?\s*|\s*```\s*$', re.IGNORECASE)
+_WRAPPER = re.compile(r'<!DOCTYPE[^>]*>|<head\b.*?</head\s*>|</?(?:html|body)\b[^>]*>', re.IGNORECASE | re.DOTALL)
+_H1 = re.compile(r'<(/?)h1\b', re.IGNORECASE)
+
+
+def section_fragment(html: str) -> str:
+    """
+    Reduce one chunk's completion to a section fragment: no code fence, no
+    <html>/<head>/<body> wrapper, and any <h1> demoted to <h2> so the merged
+    document keeps a single title.
+    """
+    html = _WRAPPER.sub('', _FENCE.sub('', html))
+    return _H1.sub(r'<\1h2', html).strip()
+
+def _openai():
+    """
+    Import and configure openai on first use. Importing it pulls in aiohttp,
+    which would otherwise add a few hundred milliseconds to every worker start.
+    """
+    import openai
+    openai.api_key = Config.OPENAI_API_KEY
+    return openai
 
 class GPTManager:
     def __init__(self):
-        openai.api_key = Config.OPENAI_API_KEY
-        self.textract = boto3.client(
-            'textract',
-            aws_access_key_id=Config.AWS_ACCESS_KEY,
-            aws_secret_access_key=Config.AWS_SECRET_KEY,
-            region_name=Config.AWS_REGION
-        )
+        self._textract = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def textract(self):
+        """Textract client, created on first use."""
+        if self._textract is None:
+            with self._client_lock:
+                if self._textract is None:
+                    self._textract = boto3.client(
+                        'textract',
+                        aws_access_key_id=Config.AWS_ACCESS_KEY,
+                        aws_secret_access_key=Config.AWS_SECRET_KEY,
+                        region_name=Config.AWS_REGION
+                    )
+        return self._textract
 
     def extract_text_from_image(self, s3_bucket: str, s3_key: str):
         try:
@@ -44,32 +86,218 @@ class GPTManager:
             logging.error(f"Unexpected error during Textract OCR: {e}", exc_info=True)
             raise
 
-    def generate_notes(self, extracted_text: str):
+    def extract_text_from_pdf(self, s3_bucket: str, s3_key: str):
+        """
+        OCR a multi-page PDF with Textract's asynchronous text detection.
+
+        Starts a detection job, polls it every TEXTRACT_POLL_INTERVAL seconds
+        (up to TEXTRACT_TIMEOUT), then follows NextToken through the paginated
+        results and joins the LINE blocks page by page in reading order.
+        Meant to run on a background worker, not in a request.
+        """
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a professional note summarizer. "
-                            "Create organized, detailed notes in HTML format. "
-                            "Use headings (<h1>, <h2>, etc.), paragraphs (<p>), lists (<ul>, <li>) where appropriate. "
-                            "For mathematical expressions, use LaTeX notation with $...$ for inline math and $$...$$ for display math. "
-                            "Return only the HTML content."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Please summarize and enhance these notes:\n\n{extracted_text}"
+            job = self.textract.start_document_text_detection(
+                DocumentLocation={
+                    'S3Object': {
+                        'Bucket': s3_bucket,
+                        'Name': s3_key
                     }
-                ],
+                }
+            )
+            job_id = job['JobId']
+
+            deadline = time.monotonic() + Config.TEXTRACT_TIMEOUT
+            while True:
+                response = self.textract.get_document_text_detection(JobId=job_id)
+                status = response['JobStatus']
+                if status in ('SUCCEEDED', 'PARTIAL_SUCCESS'):
+                    break
+                if status == 'FAILED':
+                    raise RuntimeError(f"Textract job {job_id} failed: {response.get('StatusMessage')}")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Textract job {job_id} did not finish in {Config.TEXTRACT_TIMEOUT}s")
+                time.sleep(Config.TEXTRACT_POLL_INTERVAL)
+
+            pages = {}
+            while True:
+                for block in response.get('Blocks', []):
+                    if block.get('BlockType') == 'LINE' and 'Text' in block:
+                        pages.setdefault(block.get('Page', 1), []).append(block['Text'])
+                next_token = response.get('NextToken')
+                if not next_token:
+                    break
+                response = self.textract.get_document_text_detection(JobId=job_id, NextToken=next_token)
+
+            extracted_text = "\n\n".join("\n".join(pages[page]) for page in sorted(pages))
+            return {'text': extracted_text, 'pages': len(pages)}
+
+        except self.textract.exceptions.InvalidS3ObjectException as e:
+            logging.error(f"Textract invalid S3 object: {e}", exc_info=True)
+            raise
+        except self.textract.exceptions.UnsupportedDocumentException as e:
+            logging.error(f"Textract unsupported document: {e}", exc_info=True)
+            raise
+        except Exception as e:
+            logging.error(f"Unexpected error during Textract PDF OCR: {e}", exc_info=True)
+            raise
+
+    def _chat_completion(self, messages: list, temperature: float, max_tokens: int,
+                         model: str = "gpt-4", use_cache: bool = True):
+        """
+        Run a chat completion through the completion cache.
+
+        Returns:
+            tuple: ({'content', 'tokens_used', 'cached'}, cache_key)
+        """
+        cache_key = completion_cache.make_key(model, messages, temperature=temperature, max_tokens=max_tokens)
+        if use_cache:
+            cached = completion_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, 'cached': True}, cache_key
+
+        response = _openai().ChatCompletion.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        result = {
+            'content': response['choices'][0]['message']['content'],
+            'tokens_used': response['usage']['total_tokens']
+        }
+        if use_cache:
+            completion_cache.put(cache_key, result)
+        return {**result, 'cached': False}, cache_key
+
+    @staticmethod
+    def _notes_messages(extracted_text: str, part: int = None, parts: int = None) -> list:
+        if parts and parts > 1:
+            request_text = (
+                f"This is part {part} of {parts} of a longer document. "
+                f"Please summarize and enhance this part of the notes:\n\n{extracted_text}"
+            )
+            headings = (
+                "This part will be placed between other sections of one document, so return a section fragment only: "
+                "start with an <h2> naming this part, use <h2> and lower headings, and do not add <html>, <head>, <body> or <h1> tags. "
+            )
+        else:
+            request_text = f"Please summarize and enhance these notes:\n\n{extracted_text}"
+            headings = "Use headings (<h1>, <h2>, etc.), paragraphs (<p>), lists (<ul>, <li>) where appropriate. "
+        return [
+            {
+                "role": "system",
+                "content": (
+                    "You are a professional note summarizer. "
+                    "Create organized, detailed notes in HTML format. "
+                    f"{headings}"
+                    "For mathematical expressions, use LaTeX notation with $...$ for inline math and $$...$$ for display math. "
+                    "Return only the HTML content."
+                )
+            },
+            {
+                "role": "user",
+                "content": request_text
+            }
+        ]
+
+    def _notes_header(self, chunks: list, use_cache: bool = True) -> dict:
+        """
+        Reduce step for chunked notes: one call to the cheaper outline model
+        with the opening of each part returns a single title and a one-line
+        outline entry per part, rendered as <h1> and <ul>.
+        """
+        previews = "\n\n".join(
+            f"Part {i + 1}:\n{chunk[:OUTLINE_PREVIEW_CHARS]}" for i, chunk in enumerate(chunks)
+        )
+        completion, cache_key = self._chat_completion(
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You write the title and outline for a set of study notes. "
+                        "Given the opening of each part of a document, return strict JSON: "
+                        "{\"title\": \"...\", \"outline\": [\"...\", ...]} with one short outline entry per part."
+                    )
+                },
+                {"role": "user", "content": previews}
+            ],
+            temperature=0,
+            max_tokens=300,
+            model=Config.LLM_OUTLINE_MODEL,
+            use_cache=use_cache
+        )
+        try:
+            header = json.loads(completion['content'])
+            title, outline = str(header['title']), [str(entry) for entry in header.get('outline') or []]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            # The sections still carry their own headings, so carry on without a header
+            logging.warning(f"Unusable notes outline, leaving it out: {e}")
+            completion_cache.invalidate(cache_key)
+            return {**completion, 'content': ''}
+
+        content = f"<h1>{escape(title)}</h1>"
+        if outline:
+            content += "\n<ul>" + "".join(f"<li>{escape(entry)}</li>" for entry in outline) + "</ul>"
+        return {**completion, 'content': content}
+
+    def _generate_chunks(self, chunks: list, use_cache: bool = True):
+        """
+        Summarize chunks concurrently (at most LLM_MAX_PARALLEL_CHUNKS at a
+        time) and yield the notes header followed by each chunk's section
+        fragment, in document order.
+
+        If the consumer stops early (the SSE client disconnected), chunks
+        that have not started are cancelled rather than waited for.
+        """
+        workers = max(1, min(Config.LLM_MAX_PARALLEL_CHUNKS, len(chunks) + 1))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='notes-chunk')
+        try:
+            # Submitted first: it is small, so it is usually ready before the first section
+            header = executor.submit(self._notes_header, chunks, use_cache)
+            futures = [
+                executor.submit(
+                    self._chat_completion,
+                    messages=self._notes_messages(chunk, part=i + 1, parts=len(chunks)),
+                    temperature=0.7,
+                    max_tokens=2000,
+                    use_cache=use_cache
+                )
+                for i, chunk in enumerate(chunks)
+            ]
+            yield header.result()
+            for future in futures:
+                completion, _ = future.result()
+                yield {**completion, 'content': section_fragment(completion['content'])}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def generate_notes(self, extracted_text: str, use_cache: bool = True):
+        """
+        Generate HTML notes from extracted text. Text longer than
+        LLM_CHUNK_TOKENS is split on structural boundaries, the chunks are
+        summarized in parallel as section fragments, and the sections are
+        joined in order under one title and outline.
+        """
+        openai = _openai()
+        try:
+            if estimate_tokens(extracted_text) > Config.LLM_CHUNK_TOKENS:
+                completions = list(self._generate_chunks(split_text(extracted_text, Config.LLM_CHUNK_TOKENS), use_cache))
+                return {
+                    'summary': '\n'.join(c['content'] for c in completions if c['content']),
+                    'tokens_used': sum(c['tokens_used'] or 0 for c in completions),
+                    'cached': all(c['cached'] for c in completions)
+                }
+
+            completion, _ = self._chat_completion(
+                messages=self._notes_messages(extracted_text),
                 temperature=0.7,
-                max_tokens=2000
+                max_tokens=2000,
+                use_cache=use_cache
             )
             return {
-                'summary': response['choices'][0]['message']['content'],
-                'tokens_used': response['usage']['total_tokens']
+                'summary': completion['content'],
+                'tokens_used': completion['tokens_used'],
+                'cached': completion['cached']
             }
         except openai.error.OpenAIError as e:
             logging.error(f"OpenAI error during note generation: {e}", exc_info=True)
@@ -78,13 +306,64 @@ class GPTManager:
             logging.error(f"Unexpected error during note generation: {e}", exc_info=True)
             raise
 
-    def generate_flashcards(self, text: str):
+    def stream_notes(self, extracted_text: str, use_cache: bool = True):
+        """
+        Streaming variant of generate_notes: yields HTML fragments as the model
+        produces them. A cached completion is yielded as a single fragment, and
+        a finished stream is written back to the completion cache. Long text
+        goes through the chunked path and is yielded as the title and outline,
+        then one section at a time.
+        """
+        if estimate_tokens(extracted_text) > Config.LLM_CHUNK_TOKENS:
+            sections = self._generate_chunks(split_text(extracted_text, Config.LLM_CHUNK_TOKENS), use_cache)
+            try:
+                for completion in sections:
+                    if completion['content']:
+                        yield completion['content'] + '\n'
+            finally:
+                # Closing the stream early (GeneratorExit) cancels the chunks not yet started
+                sections.close()
+            return
+
+        messages = self._notes_messages(extracted_text)
+        cache_key = completion_cache.make_key("gpt-4", messages, temperature=0.7, max_tokens=2000)
+        if use_cache:
+            cached = completion_cache.get(cache_key)
+            if cached is not None:
+                yield cached['content']
+                return
+
+        openai = _openai()
+        try:
+            response = openai.ChatCompletion.create(
+                model="gpt-4",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=2000,
+                stream=True
+            )
+            fragments = []
+            for chunk in response:
+                fragment = chunk['choices'][0].get('delta', {}).get('content')
+                if fragment:
+                    fragments.append(fragment)
+                    yield fragment
+        except openai.error.OpenAIError as e:
+            logging.error(f"OpenAI error during streamed note generation: {e}", exc_info=True)
+            raise
+
+        if use_cache:
+            # Streamed responses don't report usage
+            completion_cache.put(cache_key, {'content': ''.join(fragments), 'tokens_used': None})
+
+    def generate_flashcards(self, text: str, use_cache: bool = True):
         """
         Generate flashcards from the provided text.
 
         We prompt the model to create a list of flashcards, each with a "term" and "definition".
         The model should return valid JSON so we can parse it.
         """
+        openai = _openai()
         try:
             prompt = (
                 "You are a professional educator. Given the following text, extract the key concepts and create a set of flashcards. "
@@ -93,27 +372,32 @@ class GPTManager:
                 "[{\"term\": \"Term1\", \"definition\": \"Definition for Term1\"}, {\"term\": \"Term2\", \"definition\": \"Definition for Term2\"}, ...]"
             )
 
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
+            completion, cache_key = self._chat_completion(
                 messages=[
                     {"role": "system", "content": prompt},
                     {"role": "user", "content": f"Text:\n\n{text}\n\nPlease produce flashcards now."}
                 ],
                 temperature=0.7,
-                max_tokens=1500
+                max_tokens=1500,
+                use_cache=use_cache
             )
 
-            content = response['choices'][0]['message']['content'].strip()
-            # Attempt to parse JSON
-            flashcards = json.loads(content)
-            # Validate the structure
-            if not isinstance(flashcards, list):
-                raise ValueError("Flashcards JSON is not a list.")
-
-            # Ensure each flashcard has 'term' and 'definition'
-            for fc in flashcards:
-                if 'term' not in fc or 'definition' not in fc:
-                    raise ValueError("A flashcard is missing 'term' or 'definition'.")
+            content = completion['content'].strip()
+            try:
+                # Attempt to parse JSON
+                flashcards = json.loads(content)
+                # Validate the structure
+                if not isinstance(flashcards, list):
+                    raise ValueError("Flashcards JSON is not a list.")
+
+                # Ensure each flashcard has 'term' and 'definition'
+                for fc in flashcards:
+                    if 'term' not in fc or 'definition' not in fc:
+                        raise ValueError("A flashcard is missing 'term' or 'definition'.")
+            except (json.JSONDecodeError, ValueError):
+                # Don't keep serving a malformed response from the cache
+                completion_cache.invalidate(cache_key)
+                raise
 
             return flashcards
 
@@ -0,0 +1,175 @@
+# backend/utils/health.py
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+from botocore.exceptions import ClientError
+from config import Config
+from utils.database import get_client
+
+# Any syntactically valid id works; Textract answering "no such job" proves it is reachable
+TEXTRACT_PROBE_JOB_ID = 'readiness-probe'
+
+
+def probe_mongodb():
+    get_client().admin.command('ping')
+
+
+def probe_s3():
+    from utils.s3_manager import s3_manager
+    s3_manager.s3.head_bucket(Bucket=s3_manager.bucket)
+
+
+def probe_openai():
+    from utils.gpt_api import _openai
+    _openai().Model.list(request_timeout=Config.HEALTH_PROBE_TIMEOUT)
+
+
+def probe_textract():
+    from utils.gpt_api import gpt_manager
+    try:
+        gpt_manager.textract.get_document_text_detection(JobId=TEXTRACT_PROBE_JOB_ID)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'InvalidJobIdException':
+            raise
+
+
+DEFAULT_PROBES = {
+    'mongodb': probe_mongodb,
+    's3': probe_s3,
+    'openai': probe_openai,
+    'textract': probe_textract,
+}
+
+
+class HealthMonitor:
+    """
+    Probes each dependency on a background thread every `interval` seconds
+    and keeps the latest result per dependency. Readiness checks read those
+    cached results, so a load balancer polling /readyz never causes network
+    I/O of its own.
+
+    A probe that has not finished within `timeout` seconds is reported as
+    failed and is not started again until the stuck call returns.
+    """
+
+    def __init__(self, probes: dict, interval: float, timeout: float, required=(), stale_after: Optional[float] = None):
+        self.probes = dict(probes)
+        self.interval = interval
+        self.timeout = timeout
+        self.required = tuple(name for name in required if name in self.probes)
+        self.stale_after = stale_after if stale_after is not None else 3 * interval
+        self._results = {}
+        self._in_flight = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = None
+
+    def add_listener(self, listener: Callable[[str, dict, Optional[dict]], None]):
+        """Call listener(name, result, previous) whenever a dependency changes state."""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Start the probe thread for this process if it is not already running."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self.check_all()
+            time.sleep(self.interval)
+
+    def _timed(self, probe: Callable) -> dict:
+        started = time.perf_counter()
+        error = None
+        try:
+            probe()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        return {
+            'ok': error is None,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'error': error,
+        }
+
+    def check_all(self):
+        """Run every probe concurrently and record the results."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(self.probes), thread_name_prefix='health-probe')
+        started = time.perf_counter()
+        for name, probe in self.probes.items():
+            future = self._in_flight.get(name)
+            if future is None or future.done():
+                self._in_flight[name] = self._executor.submit(self._timed, probe)
+
+        for name, future in self._in_flight.items():
+            remaining = max(0.0, self.timeout - (time.perf_counter() - started))
+            try:
+                result = future.result(timeout=remaining)
+            except Exception:
+                result = {'ok': False, 'latency_ms': None, 'error': f"Timed out after {self.timeout:g}s"}
+            result['checked_at'] = datetime.utcnow()
+            self._record(name, result)
+
+    def _record(self, name: str, result: dict):
+        with self._lock:
+            previous = self._results.get(name)
+            self._results[name] = result
+        if previous is None or previous['ok'] != result['ok']:
+            for listener in self._listeners:
+                try:
+                    listener(name, result, previous)
+                except Exception as e:
+                    logging.error(f"Health listener failed for {name}: {e}", exc_info=True)
+
+    def status(self) -> dict:
+        """
+        Latest result per dependency and overall readiness. Ready means every
+        required dependency passed its most recent probe, and that probe is
+        no older than stale_after seconds.
+        """
+        self.start()
+        now = datetime.utcnow()
+        with self._lock:
+            checks = {name: dict(result) for name, result in self._results.items()}
+
+        for name, result in checks.items():
+            age = (now - result['checked_at']).total_seconds()
+            if age > self.stale_after:
+                result['ok'] = False
+                result['error'] = f"Last checked {age:.0f}s ago"
+        for name in self.probes:
+            checks.setdefault(name, {'ok': False, 'latency_ms': None, 'error': 'Not checked yet', 'checked_at': None})
+            checks[name]['required'] = name in self.required
+
+        return {
+            'ready': all(checks[name]['ok'] for name in self.required),
+            'checks': checks,
+        }
+
+    def _reset_after_fork(self):
+        # Threads do not survive fork; the child starts its own on first use
+        self._thread = None
+        self._executor = None
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+
+# Create a default instance
+health_monitor = HealthMonitor(
+    DEFAULT_PROBES,
+    interval=Config.HEALTH_CHECK_INTERVAL,
+    timeout=Config.HEALTH_PROBE_TIMEOUT,
+    required=[name.strip() for name in Config.READINESS_DEPENDENCIES.split(',') if name.strip()]
+)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=health_monitor._reset_after_fork)
@@ -0,0 +1,75 @@
+# backend/utils/indexes.py
+import logging
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+from config import Config
+from utils.database import get_db
+
+# Listings page through (created_at, _id) newest first (see utils/pagination.py)
+USER_PAGE = [('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]
+USER_SUBJECT_PAGE = [('user_id', ASCENDING), ('subject_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]
+
+# Index manifest: collection name -> list of (keys, options).
+# Every filter issued by the blueprints should be served by one of these.
+INDEXES = {
+    'notes': [
+        (USER_SUBJECT_PAGE, {'name': 'user_subject_created'}),
+        (USER_PAGE, {'name': 'user_created_id'}),
+    ],
+    'generated_notes': [
+        ([('original_note_id', ASCENDING), ('user_id', ASCENDING)], {'name': 'original_note_user'}),
+        (USER_SUBJECT_PAGE, {'name': 'user_subject_created'}),
+    ],
+    'subjects': [
+        (USER_PAGE, {'name': 'user_created_id'}),
+    ],
+    'flashcards_decks': [
+        (USER_PAGE, {'name': 'user_created_id'}),
+        # Finds decks still waiting for card_schedules (CardScheduler.backfill_decks)
+        ([('schedules_seeded', ASCENDING)], {'name': 'schedules_seeded'}),
+    ],
+    'card_schedules': [
+        ([('user_id', ASCENDING), ('next_due', ASCENDING)], {'name': 'user_next_due'}),
+        ([('deck_id', ASCENDING), ('card_index', ASCENDING)], {'name': 'deck_card_unique', 'unique': True}),
+    ],
+    'completion_cache': [
+        ([('expires_at', ASCENDING)], {'name': 'expires_at_ttl', 'expireAfterSeconds': 0}),
+    ],
+    'ocr_cache': [
+        ([('created_at', ASCENDING)], {'name': 'created_at_ttl', 'expireAfterSeconds': Config.OCR_CACHE_TTL_SECONDS}),
+    ],
+    'revoked_tokens': [
+        ([('expires_at', ASCENDING)], {'name': 'expires_at_ttl', 'expireAfterSeconds': 0}),
+    ],
+    'jobs': [
+        ([('finished_at', ASCENDING)], {'name': 'finished_at_ttl', 'expireAfterSeconds': Config.JOB_RETENTION_SECONDS}),
+        ([('status', ASCENDING), ('updated_at', ASCENDING)], {'name': 'status_updated'}),
+    ],
+    'users': [
+        ([('email', ASCENDING)], {'name': 'email_unique', 'unique': True}),
+    ],
+}
+
+
+def ensure_indexes(db=None) -> dict:
+    """
+    Create every index in INDEXES that does not exist yet.
+
+    create_index is a no-op for an identical existing index, so this is safe
+    to run on every startup. Failures (e.g. duplicate emails blocking the
+    unique index) are logged per index and do not stop the others.
+
+    Returns:
+        dict: collection name -> list of index names that were ensured.
+    """
+    db = db if db is not None else get_db()
+    ensured = {}
+    for collection_name, indexes in INDEXES.items():
+        ensured[collection_name] = []
+        for keys, options in indexes:
+            try:
+                name = db[collection_name].create_index(keys, **options)
+                ensured[collection_name].append(name)
+            except PyMongoError as e:
+                logging.error(f"Failed to create index {options.get('name')} on {collection_name}: {e}")
+    return ensured
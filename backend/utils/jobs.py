@@ -0,0 +1,173 @@
+# backend/utils/jobs.py
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from bson import ObjectId
+from config import Config
+from utils.database import collection
+
+jobs_collection = collection('jobs')
+
+JOB_PENDING = 'pending'
+JOB_PROCESSING = 'processing'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+# A worker that died mid-job leaves it in one of these states for good
+UNFINISHED_STATUSES = (JOB_PENDING, JOB_PROCESSING)
+
+
+class JobQueue:
+    """
+    Runs background jobs and records their lifecycle in the 'jobs' collection.
+
+    Backends:
+        'thread': jobs run on a bounded ThreadPoolExecutor in this process.
+        'inline': jobs run synchronously inside submit(); meant for tests and
+                  local debugging where a worker pool gets in the way.
+
+    Jobs live in this process only, so a crash or restart strands whatever
+    was pending or processing. A job not updated for stale_after seconds is
+    marked failed, when it is polled and whenever a process starts its
+    pool, and the handler registered with on_stale() for its type is called
+    so whatever the job was working on can be failed too. Finished jobs are
+    removed by the finished_at TTL index (see utils/indexes.py).
+    """
+
+    def __init__(self, backend: str = 'thread', max_workers: int = 4, stale_after: float = 1800):
+        if backend not in ('thread', 'inline'):
+            raise ValueError(f"Unknown job backend: {backend}")
+        self.backend = backend
+        self.max_workers = max_workers
+        self.stale_after = stale_after
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stale_handlers = {}
+
+    def on_stale(self, job_type: str, handler: Callable[[dict], None]):
+        """Call handler(job) whenever a job of this type is marked failed as stale."""
+        self._stale_handlers[job_type] = handler
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+                try:
+                    self.fail_stale_jobs()
+                except Exception as e:
+                    logging.error(f"Failed to fail stale jobs: {e}", exc_info=True)
+            return self._executor
+
+    def submit(self, job_type: str, handler: Callable, user_id: str, **payload) -> str:
+        """
+        Persist a pending job record and schedule handler(job_id=..., user_id=..., **payload).
+
+        The handler's return value is stored as the job result. Any exception
+        marks the job as failed with its message.
+
+        Returns:
+            str: The job id.
+        """
+        now = datetime.utcnow()
+        job = {
+            'type': job_type,
+            'user_id': user_id,
+            'payload': payload,
+            'status': JOB_PENDING,
+            'result': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now
+        }
+        job_id = str(jobs_collection.insert_one(job).inserted_id)
+
+        if self.backend == 'inline':
+            self._run(job_id, handler, user_id, payload)
+        else:
+            self._get_executor().submit(self._run, job_id, handler, user_id, payload)
+        return job_id
+
+    def _run(self, job_id: str, handler: Callable, user_id: str, payload: dict):
+        if not self._set_status(job_id, JOB_PENDING, JOB_PROCESSING, started_at=datetime.utcnow()):
+            logging.warning(f"Job {job_id} is no longer pending, not running it")
+            return
+        try:
+            result = handler(job_id=job_id, user_id=user_id, **payload)
+            finished = self._set_status(job_id, JOB_PROCESSING, JOB_DONE, result=result, finished_at=datetime.utcnow())
+        except Exception as e:
+            logging.error(f"Job {job_id} failed: {e}", exc_info=True)
+            finished = self._set_status(job_id, JOB_PROCESSING, JOB_FAILED, error=str(e), finished_at=datetime.utcnow())
+        if not finished:
+            logging.warning(f"Job {job_id} was failed as stale before it finished, dropping its outcome")
+
+    def _set_status(self, job_id: str, expected: str, status: str, **fields) -> bool:
+        """
+        Move a job from the expected status to a new one. Returns False, leaving
+        the job untouched, if it has left the expected status in the meantime
+        (for example, failed as stale while its handler was still running).
+        """
+        fields.update({'status': status, 'updated_at': datetime.utcnow()})
+        return jobs_collection.update_one({'_id': ObjectId(job_id), 'status': expected}, {'$set': fields}).modified_count > 0
+
+    def _stale_update(self, now: datetime) -> dict:
+        return {'$set': {
+            'status': JOB_FAILED,
+            'error': f"Job did not finish within {self.stale_after:g}s",
+            'updated_at': now,
+            'finished_at': now
+        }}
+
+    def _fail_stale(self, job: dict, now: datetime) -> bool:
+        """
+        Mark a job read as stale failed, only if nothing has touched it since
+        it was read, then run its type's stale handler. Returns True if the
+        job was failed here.
+        """
+        update = self._stale_update(now)
+        result = jobs_collection.update_one({'_id': job['_id'], 'status': job['status'], 'updated_at': job['updated_at']}, update)
+        if not result.modified_count:
+            return False
+        job.update(update['$set'])
+        handler = self._stale_handlers.get(job.get('type'))
+        if handler:
+            try:
+                handler(job)
+            except Exception as e:
+                logging.error(f"Stale handler for job {job['_id']} failed: {e}", exc_info=True)
+        return True
+
+    def fail_stale_jobs(self) -> int:
+        """Mark every pending or processing job not updated for stale_after seconds as failed."""
+        now = datetime.utcnow()
+        stale = jobs_collection.find(
+            {'status': {'$in': list(UNFINISHED_STATUSES)}, 'updated_at': {'$lt': now - timedelta(seconds=self.stale_after)}},
+            {'type': 1, 'payload': 1, 'status': 1, 'updated_at': 1}
+        )
+        failed = sum(self._fail_stale(job, now) for job in stale)
+        if failed:
+            logging.warning(f"Marked {failed} stale job(s) as failed")
+        return failed
+
+    def get(self, job_id: str, user_id: str) -> Optional[dict]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        job = jobs_collection.find_one({'_id': ObjectId(job_id), 'user_id': user_id})
+        if not job:
+            return None
+
+        now = datetime.utcnow()
+        if job['status'] in UNFINISHED_STATUSES and now - job['updated_at'] > timedelta(seconds=self.stale_after):
+            self._fail_stale(job, now)
+
+        job['_id'] = str(job['_id'])
+        return job
+
+
+# Create a default instance
+job_queue = JobQueue(
+    backend=Config.JOB_BACKEND,
+    max_workers=Config.JOB_MAX_WORKERS,
+    stale_after=Config.JOB_STALE_SECONDS
+)
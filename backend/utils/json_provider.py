@@ -0,0 +1,76 @@
+# backend/utils/json_provider.py
+import base64
+from datetime import date, datetime, timezone
+from bson import Binary, Decimal128, ObjectId, Timestamp
+from bson.dbref import DBRef
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+# Naive datetimes from MongoDB are UTC; emit them as ISO 8601 with a 'Z' suffix
+ORJSON_OPTIONS = (orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _isoformat(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def bson_default(o):
+    """
+    Serialize the BSON types that come back from PyMongo: ObjectId and
+    Decimal128 as strings, binary data as base64, and DBRef/Timestamp as
+    their plain values. datetime is only seen here on the stdlib path;
+    orjson encodes it natively.
+    """
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, datetime):
+        return _isoformat(o)
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, Decimal128):
+        return str(o.to_decimal())
+    if isinstance(o, (Binary, bytes)):
+        return base64.b64encode(bytes(o)).decode('ascii')
+    if isinstance(o, DBRef):
+        return {'$ref': o.collection, '$id': o.id}
+    if isinstance(o, Timestamp):
+        return _isoformat(o.as_datetime())
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    return DefaultJSONProvider.default(o)
+
+
+class BSONJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes documents straight from PyMongo, so
+    routes can return them without converting ObjectIds by hand. Uses orjson
+    when it is installed and the standard library otherwise.
+    """
+
+    default = staticmethod(bson_default)
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        option = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype)
@@ -0,0 +1,54 @@
+# backend/utils/log_buffer.py
+import threading
+import time
+from collections import deque
+
+
+class LogBuffer:
+    """
+    Fixed-capacity, in-memory log for the status page. Entries carry a
+    monotonically increasing sequence number so clients can fetch only
+    what they have not seen; the oldest entries are dropped once the
+    buffer is full, keeping memory flat regardless of uptime.
+    """
+
+    def __init__(self, capacity: int):
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._last_seq = 0
+
+    def append(self, status: str, message: str) -> dict:
+        with self._lock:
+            self._last_seq += 1
+            entry = {
+                "seq": self._last_seq,
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "status": status,
+                "message": message
+            }
+            self._entries.append(entry)
+        return entry
+
+    def since(self, seq: int) -> dict:
+        """
+        Entries newer than seq, oldest first. Walks back from the newest entry,
+        so the cost is proportional to the number of entries returned.
+        'truncated' is set when entries after seq were already evicted.
+        """
+        with self._lock:
+            entries = []
+            for entry in reversed(self._entries):
+                if entry["seq"] <= seq:
+                    break
+                entries.append(entry)
+            entries.reverse()
+            oldest = self._entries[0]["seq"] if self._entries else self._last_seq + 1
+            return {
+                "entries": entries,
+                "last_seq": self._last_seq,
+                "truncated": seq + 1 < oldest
+            }
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return list(self._entries)
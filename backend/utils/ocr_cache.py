@@ -0,0 +1,60 @@
+# backend/utils/ocr_cache.py
+import hashlib
+import logging
+from datetime import datetime
+from typing import BinaryIO, Optional
+from pymongo.errors import PyMongoError
+from utils.database import collection
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_of_file(file: BinaryIO) -> str:
+    """
+    SHA-256 hex digest of an uploaded file, read in chunks. The stream is
+    rewound afterwards so it can still be uploaded.
+    """
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """
+    Content-addressed store of extracted document text, keyed by the SHA-256
+    of the file bytes so identical uploads share one OCR result. Entries are
+    deleted OCR_CACHE_TTL_SECONDS after created_at by a TTL index (see
+    utils/indexes.py); the notes keep their own copy of the text.
+    """
+
+    def __init__(self, collection_name: str = 'ocr_cache'):
+        self.collection = collection(collection_name)
+
+    def get(self, file_hash: str) -> Optional[str]:
+        if not file_hash:
+            return None
+        try:
+            entry = self.collection.find_one({'_id': file_hash}, {'text': 1})
+        except PyMongoError as e:
+            logging.warning(f"OCR cache lookup failed: {e}")
+            return None
+        return entry['text'] if entry else None
+
+    def put(self, file_hash: str, text: str):
+        if not file_hash:
+            return
+        try:
+            self.collection.update_one(
+                {'_id': file_hash},
+                {'$set': {'text': text, 'created_at': datetime.utcnow()}},
+                upsert=True
+            )
+        except PyMongoError as e:
+            logging.warning(f"OCR cache write failed: {e}")
+
+
+# Create a default instance
+ocr_cache = OCRCache()
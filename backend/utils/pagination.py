@@ -0,0 +1,138 @@
+# backend/utils/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId
+from pymongo import DESCENDING
+from config import Config
+
+# Listings are newest first; _id breaks ties between equal timestamps
+KEYSET_SORT = [('created_at', DESCENDING), ('_id', DESCENDING)]
+
+# Always returned so the next cursor can be built from the last document
+CURSOR_FIELDS = ('_id', 'created_at')
+
+
+def encode_cursor(doc: dict) -> str:
+    created_at = doc.get('created_at')
+    payload = {
+        'c': created_at.isoformat() if isinstance(created_at, datetime) else None,
+        'i': str(doc['_id']),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Return (created_at, _id) from a cursor, raising ValueError if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload['c']) if payload['c'] is not None else None
+        return created_at, ObjectId(payload['i'])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_filter(cursor: Optional[str]) -> dict:
+    """Filter matching the documents that sort after the cursor position."""
+    if not cursor:
+        return {}
+    created_at, last_id = decode_cursor(cursor)
+    if created_at is None:
+        # Documents without created_at sort last; page through them by _id
+        return {'created_at': None, '_id': {'$lt': last_id}}
+    return {'$or': [
+        {'created_at': {'$lt': created_at}},
+        {'created_at': created_at, '_id': {'$lt': last_id}},
+        {'created_at': None},
+    ]}
+
+
+def _is_within(field: str, paths) -> bool:
+    # 'extracted_text.0' would project part of 'extracted_text' just as well
+    return any(field == path or field.startswith(f"{path}.") for path in paths)
+
+
+def _outermost_paths(paths) -> list:
+    """
+    The paths with duplicates and paths inside another listed path dropped:
+    MongoDB rejects a projection of both 'title' and 'title.x' as a path
+    collision, and 'title' already returns everything inside it.
+    """
+    kept = []
+    for path in sorted(dict.fromkeys(paths), key=lambda path: path.count('.')):
+        if not _is_within(path, kept):
+            kept.append(path)
+    return kept
+
+
+class PageRequest:
+    """
+    Page parameters read from a listing's query string:
+    ?limit=<n>&cursor=<opaque>&fields=<comma separated>.
+    """
+
+    def __init__(self, limit: int, cursor: Optional[str] = None, fields: Optional[list] = None):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+        self.match = keyset_filter(cursor)
+
+    @classmethod
+    def from_args(cls, args, hidden_fields=()) -> 'PageRequest':
+        """
+        Build a page request from request.args. Fields listed in hidden_fields,
+        and any path inside them, can never be selected. Raises ValueError on
+        bad parameters.
+        """
+        try:
+            limit = int(args.get('limit', Config.LIST_PAGE_SIZE))
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        limit = max(1, min(limit, Config.LIST_MAX_PAGE_SIZE))
+
+        fields = None
+        if args.get('fields'):
+            fields = [
+                field for field in (field.strip() for field in args['fields'].split(','))
+                if field and not field.startswith('$') and not _is_within(field, hidden_fields)
+            ]
+        return cls(limit, args.get('cursor') or None, fields)
+
+    def projection(self, hidden_fields=(), required_fields=()) -> Optional[dict]:
+        """
+        Inclusion projection for the selected fields (plus the cursor fields and
+        anything the route needs to post-process), or an exclusion of the
+        hidden fields when no selection was made. Overlapping paths are
+        collapsed to the outermost one.
+        """
+        if self.fields is None:
+            return {field: 0 for field in hidden_fields} or None
+        return {field: 1 for field in _outermost_paths((*CURSOR_FIELDS, *required_fields, *self.fields))}
+
+    def query(self, base_filter: dict) -> dict:
+        if not self.match:
+            return base_filter
+        return {'$and': [base_filter, self.match]}
+
+    def pipeline(self) -> list:
+        """$match/$sort/$limit stages selecting this page inside an aggregation."""
+        stages = [{'$match': self.match}] if self.match else []
+        return stages + [{'$sort': dict(KEYSET_SORT)}, {'$limit': self.limit + 1}]
+
+    def find(self, collection, base_filter: dict, projection: Optional[dict] = None) -> tuple:
+        """Run a keyset-paginated find; returns (documents, next_cursor)."""
+        cursor = collection.find(self.query(base_filter), projection).sort(KEYSET_SORT).limit(self.limit + 1)
+        return self.finish(list(cursor))
+
+    def finish(self, docs: list) -> tuple:
+        """
+        Trim the look-ahead document fetched past the page and return
+        (documents, next_cursor); next_cursor is None on the last page.
+        """
+        if len(docs) <= self.limit:
+            return docs, None
+        docs = docs[:self.limit]
+        return docs, encode_cursor(docs[-1])
@@ -0,0 +1,102 @@
+# backend/utils/revocation.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from pymongo.errors import PyMongoError
+from config import Config
+from utils.database import collection
+
+
+class RevocationCheckUnavailable(Exception):
+    """The revoked_tokens collection could not be read, so a token's status is unknown."""
+
+
+class RevocationStore:
+    """
+    Revoked JWTs, shared by every worker through a MongoDB collection keyed
+    by jti. Each document carries the token's expiry in 'expires_at', and a
+    TTL index (see utils/indexes.py) purges it once the token could no
+    longer be used anyway.
+
+    Lookups go through a per-process LRU first. A revocation is remembered
+    until the token expires. A "not revoked" answer is only trusted for
+    negative_ttl_seconds, which bounds how long another worker can keep
+    accepting a token after logout.
+
+    If MongoDB cannot be reached and the LRU has no current answer, the
+    check fails closed: is_revoked raises RevocationCheckUnavailable, which
+    app.py turns into a 503.
+    """
+
+    def __init__(self, max_entries: int, negative_ttl_seconds: float, collection_name: str = 'revoked_tokens'):
+        self.max_entries = max_entries
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.collection = collection(collection_name)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'lookups': 0, 'revocations': 0, 'evictions': 0}
+
+    def revoke(self, jti: str, exp: Optional[int] = None, user_id: Optional[str] = None):
+        """Record a token as revoked until its expiry (exp, in epoch seconds)."""
+        doc = {'revoked_at': datetime.utcnow(), 'user_id': user_id}
+        if exp is not None:
+            doc['expires_at'] = datetime.utcfromtimestamp(exp)
+        self.collection.update_one({'_id': jti}, {'$set': doc}, upsert=True)
+
+        self._remember(jti, True, exp if exp is not None else float('inf'))
+        with self._lock:
+            self._stats['revocations'] += 1
+
+    def is_revoked(self, jti: str, exp: Optional[int] = None) -> bool:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(jti)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(jti)
+                self._stats['memory_hits'] += 1
+                return entry[0]
+            if entry:
+                del self._memory[jti]
+
+        try:
+            revoked = self.collection.find_one({'_id': jti}, {'_id': 1}) is not None
+        except PyMongoError as e:
+            logging.error(f"Token revocation check failed: {e}")
+            raise RevocationCheckUnavailable(str(e)) from e
+        with self._lock:
+            self._stats['lookups'] += 1
+
+        if revoked:
+            valid_until = exp if exp is not None else float('inf')
+        else:
+            valid_until = now + self.negative_ttl_seconds
+            if exp is not None:
+                valid_until = min(valid_until, exp)
+        self._remember(jti, revoked, valid_until)
+        return revoked
+
+    def _remember(self, jti: str, revoked: bool, valid_until: float):
+        with self._lock:
+            self._memory[jti] = (revoked, valid_until)
+            self._memory.move_to_end(jti)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._memory)
+        checks = stats['memory_hits'] + stats['lookups']
+        stats['hit_rate'] = stats['memory_hits'] / checks if checks else 0.0
+        return stats
+
+
+# Create a default instance
+revocation_store = RevocationStore(
+    max_entries=Config.REVOCATION_CACHE_MAX_ENTRIES,
+    negative_ttl_seconds=Config.REVOCATION_NEGATIVE_TTL_SECONDS
+)
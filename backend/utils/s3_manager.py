@@ -1,21 +1,121 @@
 # backend/utils/s3_manager.py
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from werkzeug.utils import secure_filename
 import logging
 from typing import BinaryIO, Optional
 from datetime import datetime
 import base64
+import uuid
 import mimetypes
+import threading
+import time
+import re
+import tempfile
+from collections import OrderedDict
+from config import Config
+
+# Base64 text is decoded in slices of this many characters (a multiple of 4)
+BASE64_DECODE_CHUNK = 64 * 1024
+_NON_BASE64 = re.compile(r'[^A-Za-z0-9+/=]')
+
+def decode_base64_into(base64_str: str, out: BinaryIO):
+    """
+    Decode base64 text into a binary stream in fixed-size slices. Characters
+    outside the base64 alphabet are skipped, as base64.b64decode does.
+    """
+    carry = ''
+    for start in range(0, len(base64_str), BASE64_DECODE_CHUNK):
+        piece = carry + _NON_BASE64.sub('', base64_str[start:start + BASE64_DECODE_CHUNK])
+        usable = len(piece) - len(piece) % 4
+        out.write(base64.b64decode(piece[:usable]))
+        carry = piece[usable:]
+    if carry:
+        out.write(base64.b64decode(carry))
 
 class S3Manager:
+    # Upload throughput counters, shared by every S3Manager in the process
+    _upload_stats = {'uploads': 0, 'bytes': 0, 'seconds': 0.0, 'failures': 0}
+    _upload_stats_lock = threading.Lock()
+
     def __init__(self, config):
-        self.s3 = boto3.client(
-            's3',
-            aws_access_key_id=config.AWS_ACCESS_KEY,
-            aws_secret_access_key=config.AWS_SECRET_KEY
-        )
+        self._s3 = None
+        self._client_lock = threading.Lock()
+        self._credentials = (config.AWS_ACCESS_KEY, config.AWS_SECRET_KEY)
         self.bucket = config.S3_BUCKET
+        self.transfer_config = TransferConfig(
+            multipart_threshold=config.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=config.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=config.S3_MAX_CONCURRENCY,
+            use_threads=config.S3_MAX_CONCURRENCY > 1
+        )
+        self.checksum_algorithm = config.S3_CHECKSUM_ALGORITHM
+        self.spool_max_memory = config.S3_SPOOL_MAX_MEMORY
+
+        # Bounded LRU of presigned GET URLs: (key, expiration) -> (url, expires_at)
+        self._presigned_cache = OrderedDict()
+        self._presigned_cache_size = config.PRESIGNED_URL_CACHE_SIZE
+        self._presigned_reuse_fraction = config.PRESIGNED_URL_REUSE_FRACTION
+        self._presigned_lock = threading.Lock()
+        self._presigned_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def s3(self):
+        """S3 client, created on first use so importing a blueprint stays cheap."""
+        if self._s3 is None:
+            with self._client_lock:
+                if self._s3 is None:
+                    access_key, secret_key = self._credentials
+                    self._s3 = boto3.client(
+                        's3',
+                        aws_access_key_id=access_key,
+                        aws_secret_access_key=secret_key
+                    )
+        return self._s3
+
+    def _upload_fileobj(self, fileobj: BinaryIO, key: str, extra_args: dict):
+        """
+        Upload through the managed transfer (parallel multipart above the
+        configured threshold) with a server-validated checksum, recording
+        throughput in the shared upload stats.
+        """
+        if self.checksum_algorithm:
+            extra_args = {**extra_args, 'ChecksumAlgorithm': self.checksum_algorithm}
+
+        # Multipart parts report progress from transfer threads
+        transferred = [0]
+        progress_lock = threading.Lock()
+        def on_progress(bytes_amount):
+            with progress_lock:
+                transferred[0] += bytes_amount
+
+        started = time.perf_counter()
+        try:
+            self.s3.upload_fileobj(
+                fileobj,
+                self.bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config,
+                Callback=on_progress
+            )
+        except Exception:
+            with S3Manager._upload_stats_lock:
+                S3Manager._upload_stats['failures'] += 1
+            raise
+
+        with S3Manager._upload_stats_lock:
+            S3Manager._upload_stats['uploads'] += 1
+            S3Manager._upload_stats['bytes'] += transferred[0]
+            S3Manager._upload_stats['seconds'] += time.perf_counter() - started
+
+    @classmethod
+    def upload_stats(cls) -> dict:
+        with cls._upload_stats_lock:
+            stats = dict(cls._upload_stats)
+        stats['bytes_per_second'] = stats['bytes'] / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
 
     def upload_file(self, file: BinaryIO, user_id: str) -> str:
         try:
@@ -26,12 +126,7 @@ class S3Manager:
             if hasattr(file, 'content_type'):
                 extra_args['ContentType'] = file.content_type
             
-            self.s3.upload_fileobj(
-                file,
-                self.bucket,
-                key,
-                ExtraArgs=extra_args
-            )
+            self._upload_fileobj(file, key, extra_args)
 
             return f"https://{self.bucket}.s3.amazonaws.com/{key}"
         except ClientError as e:
@@ -44,13 +139,16 @@ class S3Manager:
         Upload a base64-encoded image string to S3.
         If no filename is provided, generate one based on the current timestamp.
 
+        The payload is decoded slice by slice into a spooled temporary file
+        (in memory up to S3_SPOOL_MAX_MEMORY, on disk beyond that) rather than
+        materialising the whole decoded image at once.
+
         :param base64_str: Base64 image data (no data URI prefix)
         :param user_id: ID of the user uploading the file
         :param filename: (Optional) Filename to use for the uploaded file
         :return: Public URL of the uploaded image
         """
         try:
-            file_data = base64.b64decode(base64_str)
             # If no filename is given, create one
             if not filename:
                 filename = f"image_{datetime.utcnow().timestamp()}.png"
@@ -65,13 +163,13 @@ class S3Manager:
 
             key = f"users/{user_id}/flashcards/{datetime.utcnow().isoformat()}_{filename}"
 
-            self.s3.put_object(
-                Bucket=self.bucket,
-                Key=key,
-                Body=file_data,
-                ContentType=content_type,
-                ACL='public-read'  # Adjust as necessary if you don't want public access
-            )
+            with tempfile.SpooledTemporaryFile(max_size=self.spool_max_memory) as buffer:
+                decode_base64_into(base64_str, buffer)
+                buffer.seek(0)
+                self._upload_fileobj(buffer, key, {
+                    'ContentType': content_type,
+                    'ACL': 'public-read'  # Adjust as necessary if you don't want public access
+                })
 
             return f"https://{self.bucket}.s3.amazonaws.com/{key}"
         except ClientError as e:
@@ -81,6 +179,58 @@ class S3Manager:
             logging.error(f"Unexpected error in base64 upload: {e}", exc_info=True)
             raise
 
+    def object_url(self, key: str) -> str:
+        return f"https://{self.bucket}.s3.amazonaws.com/{key}"
+
+    def direct_upload_key(self, user_id: str, filename: str) -> str:
+        """
+        Unique key under the user's uploads/ prefix for a browser-side upload.
+        """
+        return f"users/{user_id}/uploads/{uuid.uuid4().hex}_{secure_filename(filename)}"
+
+    def generate_presigned_post(self, key: str, content_type: str, max_size: int, expiration=900,
+                                checksum_sha256: Optional[str] = None) -> dict:
+        """
+        Generate a presigned POST policy so the client can upload straight to S3.
+
+        The policy pins the key and Content-Type and limits the body to max_size bytes.
+        With checksum_sha256 (hex) it also pins the SHA-256 checksum fields, so S3
+        rejects a body that does not match and stores the checksum on the object.
+
+        Returns:
+            dict: {'url': ..., 'fields': {...}} to send as a multipart form.
+        """
+        fields = {'Content-Type': content_type}
+        if checksum_sha256:
+            fields['x-amz-checksum-algorithm'] = 'SHA256'
+            fields['x-amz-checksum-sha256'] = base64.b64encode(bytes.fromhex(checksum_sha256)).decode('ascii')
+        try:
+            return self.s3.generate_presigned_post(
+                Bucket=self.bucket,
+                Key=key,
+                Fields=fields,
+                Conditions=[
+                    *({name: value} for name, value in fields.items()),
+                    ['content-length-range', 1, max_size]
+                ],
+                ExpiresIn=expiration
+            )
+        except ClientError as e:
+            logging.error(f"S3 presigned POST generation error: {e}")
+            raise
+
+    def head_file(self, key: str) -> Optional[dict]:
+        """
+        HEAD an object. Returns its metadata, or None if it does not exist.
+        """
+        try:
+            return self.s3.head_object(Bucket=self.bucket, Key=key, ChecksumMode='ENABLED')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            logging.error(f"S3 head error: {e}")
+            raise
+
     def get_file(self, key: str) -> Optional[bytes]:
         try:
             response = self.s3.get_object(Bucket=self.bucket, Key=key)
@@ -92,6 +242,7 @@ class S3Manager:
     def delete_file(self, key: str) -> bool:
         try:
             self.s3.delete_object(Bucket=self.bucket, Key=key)
+            self.invalidate_presigned_urls(key)
             return True
         except ClientError as e:
             logging.error(f"S3 deletion error: {e}")
@@ -100,23 +251,57 @@ class S3Manager:
     def generate_presigned_url(self, key: str, expiration=3600) -> Optional[str]:
         """
         Generate a pre-signed URL for the S3 object.
-        
+
+        URLs are cached per (key, expiration) and reused while at least
+        PRESIGNED_URL_REUSE_FRACTION of their lifetime remains, so repeated
+        listings hand out the same URL and browsers can cache the object.
+
         Args:
             key (str): S3 key of the file.
             expiration (int): Expiration time in seconds for the pre-signed URL (default: 1 hour).
-            
+
         Returns:
             Optional[str]: Pre-signed URL if successful, None otherwise.
         """
+        cache_key = (key, expiration)
+        now = time.time()
+        with self._presigned_lock:
+            cached = self._presigned_cache.get(cache_key)
+            if cached and cached[1] - now >= expiration * self._presigned_reuse_fraction:
+                self._presigned_cache.move_to_end(cache_key)
+                self._presigned_stats['hits'] += 1
+                return cached[0]
+            self._presigned_stats['misses'] += 1
+
         try:
             url = self.s3.generate_presigned_url('get_object',
                 Params={'Bucket': self.bucket, 'Key': key},
                 ExpiresIn=expiration
             )
-            return url
         except ClientError as e:
             logging.error(f"S3 pre-signed URL generation error: {e}")
             return None
 
+        with self._presigned_lock:
+            self._presigned_cache[cache_key] = (url, now + expiration)
+            self._presigned_cache.move_to_end(cache_key)
+            while len(self._presigned_cache) > self._presigned_cache_size:
+                self._presigned_cache.popitem(last=False)
+                self._presigned_stats['evictions'] += 1
+        return url
+
+    def invalidate_presigned_urls(self, key: str):
+        with self._presigned_lock:
+            for cache_key in [k for k in self._presigned_cache if k[0] == key]:
+                del self._presigned_cache[cache_key]
+
+    def presigned_url_cache_stats(self) -> dict:
+        with self._presigned_lock:
+            stats = dict(self._presigned_stats)
+            stats['size'] = len(self._presigned_cache)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
 # Create a default instance
-s3_manager = S3Manager
+s3_manager = S3Manager(Config)
@@ -0,0 +1,195 @@
+# backend/utils/scheduler.py
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from utils.database import collection
+from utils.etags import bump_version
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# Answer quality on the SM-2 0-5 scale when the client only reports right/wrong
+CORRECT_QUALITY = 4
+INCORRECT_QUALITY = 1
+
+SCHEDULE_WRITE_RETRIES = 5
+
+
+def default_schedule(now: datetime) -> dict:
+    """A card that has never been reviewed is due immediately."""
+    return {'ease': DEFAULT_EASE, 'interval': 0, 'repetitions': 0, 'reviews': 0, 'next_due': now}
+
+
+def sm2_review(schedule: dict, quality: int, answered_at: datetime) -> dict:
+    """
+    Return the schedule after one review graded 0-5 (SM-2). A grade below 3
+    restarts the card at a one day interval; otherwise the interval grows
+    1 day, 6 days, then by the ease factor. Ease moves with every grade and
+    never drops below 1.3. Intervals are in days.
+    """
+    ease = schedule.get('ease', DEFAULT_EASE)
+    repetitions = schedule.get('repetitions', 0)
+    interval = schedule.get('interval', 0)
+
+    if quality < 3:
+        repetitions = 0
+        interval = 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1
+        elif repetitions == 2:
+            interval = 6
+        else:
+            interval = round(interval * ease)
+
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+    return {
+        'ease': round(ease, 4),
+        'interval': interval,
+        'repetitions': repetitions,
+        'reviews': schedule.get('reviews', 0) + 1,
+        'next_due': answered_at + timedelta(days=interval),
+    }
+
+
+class CardScheduler:
+    """
+    Spaced-repetition state for every card, one document per card keyed by
+    (deck_id, card_index). Documents carry the owner and next_due so the
+    (user_id, next_due) index answers "what is due next" across all decks
+    with a bounded index scan (see utils/indexes.py).
+    """
+
+    def __init__(self, collection_name: str = 'card_schedules'):
+        self.collection = collection(collection_name)
+
+    def seed_deck(self, user_id: str, deck_id, card_count: int, now: Optional[datetime] = None):
+        """Start a fresh schedule for every card, replacing any previous one."""
+        now = now or datetime.utcnow()
+        self.collection.delete_many({'deck_id': deck_id})
+        if card_count:
+            self.collection.insert_many([
+                {'user_id': user_id, 'deck_id': deck_id, 'card_index': i, **default_schedule(now)}
+                for i in range(card_count)
+            ])
+
+    def schedule_missing(self, user_id: str, deck_id, card_indexes, now: Optional[datetime] = None) -> int:
+        """
+        Give each listed card that has no schedule a fresh one, due now.
+        Existing schedules are left alone. Returns the number inserted.
+        """
+        now = now or datetime.utcnow()
+        existing = {
+            doc['card_index']
+            for doc in self.collection.find({'deck_id': deck_id}, {'_id': 0, 'card_index': 1})
+        }
+        missing = [i for i in card_indexes if i not in existing]
+        if not missing:
+            return 0
+        try:
+            self.collection.insert_many([
+                {'user_id': user_id, 'deck_id': deck_id, 'card_index': i, **default_schedule(now)}
+                for i in missing
+            ], ordered=False)
+        except BulkWriteError as e:
+            # Another worker scheduled some of these cards first
+            return e.details.get('nInserted', 0)
+        return len(missing)
+
+    def reset_cards(self, user_id: str, deck_id, card_indexes, now: Optional[datetime] = None):
+        """Put the listed cards back on a fresh schedule, due now, as after a progress reset."""
+        now = now or datetime.utcnow()
+        card_indexes = list(card_indexes)
+        if not card_indexes:
+            return
+        self.collection.update_many(
+            {'deck_id': deck_id, 'card_index': {'$in': card_indexes}},
+            {'$set': {'user_id': user_id, **default_schedule(now)}}
+        )
+        self.schedule_missing(user_id, deck_id, card_indexes, now)
+
+    def backfill_decks(self, decks, now: Optional[datetime] = None) -> int:
+        """
+        Schedule the cards of decks written before card_schedules existed,
+        i.e. decks without the schedules_seeded flag, so they show up in
+        due_cards(). Every backfilled card is due now.
+
+        Returns:
+            int: number of decks backfilled.
+        """
+        now = now or datetime.utcnow()
+        pending = decks.aggregate([
+            {'$match': {'schedules_seeded': None}},
+            {'$project': {'user_id': 1, 'card_count': {'$size': {'$ifNull': ['$cards', []]}}}}
+        ])
+        backfilled = 0
+        for deck in pending:
+            self.schedule_missing(deck['user_id'], deck['_id'], range(deck['card_count']), now)
+            decks.update_one({'_id': deck['_id']}, bump_version({'$set': {'schedules_seeded': True}}))
+            backfilled += 1
+        return backfilled
+
+    def delete_deck(self, deck_id):
+        self.collection.delete_many({'deck_id': deck_id})
+
+    def record_reviews(self, user_id: str, deck_id, reviews: list) -> dict:
+        """
+        Apply (card_index, quality, answered_at) reviews in order. Each card's
+        write is conditioned on the review count that was read, so concurrent
+        sessions re-read and retry rather than dropping a review.
+
+        Returns:
+            dict: card_index -> updated schedule.
+        """
+        by_card = {}
+        for card_index, quality, answered_at in reviews:
+            by_card.setdefault(card_index, []).append((quality, answered_at))
+
+        updated = {}
+        for card_index, answers in by_card.items():
+            for _ in range(SCHEDULE_WRITE_RETRIES):
+                current = self.collection.find_one(
+                    {'deck_id': deck_id, 'card_index': card_index},
+                    {'_id': 0, 'ease': 1, 'interval': 1, 'repetitions': 1, 'reviews': 1}
+                )
+                schedule = current or default_schedule(answers[0][1])
+                for quality, answered_at in answers:
+                    schedule = sm2_review(schedule, quality, answered_at)
+
+                update_filter = {'deck_id': deck_id, 'card_index': card_index}
+                update_filter['reviews'] = current.get('reviews', 0) if current else {'$exists': False}
+                try:
+                    result = self.collection.update_one(
+                        update_filter,
+                        {'$set': {'user_id': user_id, **schedule}},
+                        upsert=current is None
+                    )
+                except DuplicateKeyError:
+                    continue
+                if result.matched_count or result.upserted_id is not None:
+                    updated[card_index] = schedule
+                    break
+            else:
+                logging.warning(f"Gave up scheduling card {card_index} of deck {deck_id} after concurrent updates")
+        return updated
+
+    def due_cards(self, user_id: str, limit: int, now: Optional[datetime] = None) -> list:
+        """
+        The user's next `limit` cards by due date, across all decks, served
+        from the (user_id, next_due) index.
+        """
+        now = now or datetime.utcnow()
+        return list(
+            self.collection.find(
+                {'user_id': user_id, 'next_due': {'$lte': now}},
+                {'_id': 0, 'deck_id': 1, 'card_index': 1, 'ease': 1, 'interval': 1,
+                 'repetitions': 1, 'next_due': 1}
+            ).sort('next_due', 1).limit(limit)
+        )
+
+
+# Create a default instance
+card_scheduler = CardScheduler()
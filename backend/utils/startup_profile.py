@@ -0,0 +1,43 @@
+# backend/utils/startup_profile.py
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter so nothing is already imported
+STARTUP_SCRIPT = (
+    "import time\n"
+    "started = time.perf_counter()\n"
+    "import app\n"
+    "imported = time.perf_counter()\n"
+    "app.create_app()\n"
+    "done = time.perf_counter()\n"
+    "print(f'{(imported - started) * 1000:.1f} {(done - imported) * 1000:.1f}')\n"
+)
+
+
+def profile_startup() -> dict:
+    """
+    Import the app and call create_app() under `python -X importtime`.
+
+    Returns:
+        dict: 'import_ms' and 'create_app_ms' wall-clock times, and 'modules',
+        a list of (module, self_us, cumulative_us) sorted by self time.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        if self_us.isdigit():
+            modules.append((name, int(self_us), int(cumulative_us)))
+    modules.sort(key=lambda row: row[1], reverse=True)
+
+    import_ms, create_app_ms = (float(value) for value in result.stdout.strip().splitlines()[-1].split())
+    return {'import_ms': import_ms, 'create_app_ms': create_app_ms, 'modules': modules}
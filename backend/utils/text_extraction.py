@@ -0,0 +1,123 @@
+# backend/utils/text_extraction.py
+import io
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# A PDF page with less text than this is treated as scanned and sent to OCR
+MIN_PDF_CHARS_PER_PAGE = 20
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png'}
+
+
+def _pdf_reader_class():
+    """
+    pypdf's PdfReader, imported on first use to keep it off the startup path.
+    None when pypdf is not installed; PDF text layers are then left to Textract.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    return PdfReader
+
+
+def _extension(filename: str) -> str:
+    return filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else ''
+
+
+def needs_ocr(content_type: str, filename: str) -> bool:
+    """
+    True for uploads that can only be read by OCR, so callers can skip
+    downloading them for local extraction.
+    """
+    return (content_type or '').startswith('image/') or _extension(filename) in IMAGE_EXTENSIONS
+
+
+def sniff_format(data: bytes, content_type: str, filename: str) -> Optional[str]:
+    """
+    Identify the document format from its leading bytes, falling back to the
+    declared content type and extension for plain text.
+    """
+    if data.startswith(b'%PDF-'):
+        return 'pdf'
+    if data.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if 'word/document.xml' in archive.namelist():
+                    return 'docx'
+        except zipfile.BadZipFile:
+            return None
+        return None
+    if (content_type or '').startswith('text/') or _extension(filename) == 'txt':
+        return 'txt'
+    return None
+
+
+def _decode_text(data: bytes) -> str:
+    if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return data.decode('utf-16')
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def _docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ET.fromstring(archive.read('word/document.xml'))
+
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NAMESPACE}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{WORD_NAMESPACE}t' and node.text:
+                parts.append(node.text)
+            elif node.tag == f'{WORD_NAMESPACE}tab':
+                parts.append('\t')
+            elif node.tag in (f'{WORD_NAMESPACE}br', f'{WORD_NAMESPACE}cr'):
+                parts.append('\n')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs).strip()
+
+
+def _pdf_text(data: bytes) -> Optional[str]:
+    """
+    Text layer of a PDF, or None if pypdf is unavailable or any page looks
+    scanned (too little text on it), so mixed documents go to Textract whole.
+    """
+    reader_class = _pdf_reader_class()
+    if reader_class is None:
+        return None
+    reader = reader_class(io.BytesIO(data))
+    pages = [(page.extract_text() or '').strip() for page in reader.pages]
+    if not pages or any(len(page) < MIN_PDF_CHARS_PER_PAGE for page in pages):
+        return None
+    return '\n\n'.join(pages)
+
+
+def extract_local_text(data: bytes, content_type: str, filename: str) -> Optional[dict]:
+    """
+    Extract text without OCR when the file carries its own text: plain text,
+    DOCX, or PDFs with a text layer.
+
+    Returns:
+        Optional[dict]: {'text': ..., 'method': 'plain' | 'docx' | 'pdf-text'},
+        or None when the file needs OCR.
+    """
+    file_format = sniff_format(data, content_type, filename)
+    try:
+        if file_format == 'txt':
+            return {'text': _decode_text(data), 'method': 'plain'}
+        if file_format == 'docx':
+            return {'text': _docx_text(data), 'method': 'docx'}
+        if file_format == 'pdf':
+            text = _pdf_text(data)
+            if text is not None:
+                return {'text': text, 'method': 'pdf-text'}
+    except Exception as e:
+        logging.warning(f"Local {file_format} extraction failed, falling back to OCR: {e}")
+    return None
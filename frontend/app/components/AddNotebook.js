@@ -180,6 +180,67 @@ export default function AddNotebook({ onClose, onCreateNotebook }) {
 
   const token = typeof window !== 'undefined' ? localStorage.getItem('access_token') : null;
 
+  const waitForJob = async (jobId) => {
+    let job = null;
+    do {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      const jobRes = await fetch(`http://localhost:5000/notes/jobs/${jobId}`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      job = await jobRes.json();
+      if (!jobRes.ok) {
+        throw new Error(job.error || 'Failed to fetch job status');
+      }
+    } while (job.status === 'pending' || job.status === 'processing');
+    return job;
+  };
+
+  // POST /notes/generate/stream and read its Server-Sent Events. Returns
+  // { done: true }, { error }, or { job_id } when text extraction was queued.
+  const streamNotes = async (noteId) => {
+    const res = await fetch('http://localhost:5000/notes/generate/stream', {
+      method: 'POST',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({ note_id: noteId })
+    });
+    if (res.status === 202) {
+      return { job_id: (await res.json()).job_id };
+    }
+    if (!res.ok) {
+      return { error: (await res.json()).error };
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    let html = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) {
+        return { error: 'Stream ended before the notes were saved' };
+      }
+      buffered += decoder.decode(value, { stream: true });
+      let boundary;
+      while ((boundary = buffered.indexOf('\n\n')) !== -1) {
+        const message = buffered.slice(0, boundary);
+        buffered = buffered.slice(boundary + 2);
+        const event = message.match(/^event: (.*)$/m)?.[1];
+        const data = JSON.parse(message.match(/^data: (.*)$/m)?.[1] || '{}');
+        if (event === 'chunk') {
+          html += data.html;
+          setGeneratedNotes(html);
+        } else if (event === 'done') {
+          return { done: true };
+        } else if (event === 'error') {
+          return { error: data.error };
+        }
+      }
+    }
+  };
+
   const handleSubmit = async () => {
     if (!title || !subjectName || !description || !file) {
       alert('Please fill out all fields and select an image file for the main note.');
@@ -238,25 +299,22 @@ export default function AddNotebook({ onClose, onCreateNotebook }) {
       const uploadedNoteId = uploadData.note_id;
       setNoteId(uploadedNoteId);
 
-      // Generate Notes
-      const generateRes = await fetch('http://localhost:5000/notes/generate', {
-        method: 'POST',
-        headers: {
-          'Authorization': `Bearer ${token}`,
-          'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ note_id: uploadedNoteId })
-      });
+      // Generate Notes, rendering the HTML as it streams in
+      let outcome = await streamNotes(uploadedNoteId);
+      if (outcome.job_id) {
+        // PDFs without a text layer are read by a background job first
+        const job = await waitForJob(outcome.job_id);
+        outcome = job.status === 'done' ? await streamNotes(uploadedNoteId) : { error: job.error };
+      }
 
-      const generateData = await generateRes.json();
-      if (!generateRes.ok) {
-        console.error('Generate failed:', generateData.error);
+      if (!outcome.done) {
+        console.error('Generate failed:', outcome.error);
+        setGeneratedNotes(null);
         alert('Failed to generate notes. Please try again.');
         setLoading(false);
         return;
       }
 
-      setGeneratedNotes(generateData.summary);
       setLoading(false);
 
       // Refresh notes list
@@ -2,36 +2,31 @@
 "use client";
 
 import { useState, useEffect } from 'react';
+import LoadMoreButton from './LoadMoreButton';
+import { usePagedList } from '../utils/usePagedList';
 
 const GenerateFromNoteModal = ({ isOpen, onClose, onGenerate }) => {
-  const [notes, setNotes] = useState([]);
   const [selectedNote, setSelectedNote] = useState('');
   const [error, setError] = useState('');
   const token = typeof window !== 'undefined' ? localStorage.getItem('access_token') : null;
+  const {
+    items: notes,
+    hasMore,
+    loading,
+    error: fetchError,
+    reload,
+    loadMore,
+  } = usePagedList('http://localhost:5000/notes/list', 'notes');
 
   useEffect(() => {
-    if (!isOpen) return;
-    // Fetch notes only when modal opens
-    const fetchNotes = async () => {
-      if (!token) return;
-      try {
-        const res = await fetch('http://localhost:5000/notes/list', {
-          headers: { Authorization: `Bearer ${token}` }
-        });
-        const data = await res.json();
-        if (!res.ok) {
-          console.error(data.error);
-          setError('Failed to fetch notes.');
-        } else {
-          setNotes(data.notes || []);
-        }
-      } catch (err) {
-        console.error('Error fetching notes:', err);
-        setError('Error fetching notes.');
-      }
-    };
-    fetchNotes();
-  }, [isOpen, token]);
+    if (!isOpen || !token) return;
+    // Fetch the first page of notes only when the modal opens
+    reload();
+  }, [isOpen, token, reload]);
+
+  useEffect(() => {
+    if (fetchError) setError('Error fetching notes.');
+  }, [fetchError]);
 
   const handleGenerate = () => {
     if (!selectedNote) {
@@ -71,6 +66,7 @@ const GenerateFromNoteModal = ({ isOpen, onClose, onGenerate }) => {
               </option>
             ))}
           </select>
+          <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} className="mt-2 w-full" />
         </div>
 
         <button
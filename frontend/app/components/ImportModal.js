@@ -1,54 +1,39 @@
 import { useState, useEffect } from 'react';
 import { X } from 'lucide-react';
+import LoadMoreButton from './LoadMoreButton';
+import { usePagedList } from '../utils/usePagedList';
 
 const ImportModal = ({ isOpen, onClose, onImport }) => {
   const [selectedDeck, setSelectedDeck] = useState(null);
-  const [availableDecks, setAvailableDecks] = useState([]);
   const [error, setError] = useState('');
-  const [loading, setLoading] = useState(false);
+  const [loaded, setLoaded] = useState(false);
+  const {
+    items: availableDecks,
+    hasMore,
+    loading,
+    error: fetchError,
+    reload,
+    loadMore,
+  } = usePagedList('http://localhost:5000/flashcards/decks', 'decks');
 
   useEffect(() => {
-    const fetchDecks = async () => {
-      setLoading(true);
-      setError('');
-      const token = localStorage.getItem('access_token');
-      
-      if (!token) {
-        setError('User is not authenticated. Please log in again.');
-        setLoading(false);
-        return;
-      }
-
-      try {
-        const response = await fetch('http://localhost:5000/flashcards/decks', {
-          headers: {
-            'Authorization': `Bearer ${token}`,
-          },
-        });
-
-        if (!response.ok) {
-          throw new Error('Failed to fetch decks from server');
-        }
-
-        const data = await response.json();
-        if (data.decks && data.decks.length > 0) {
-          setAvailableDecks(data.decks);
-        } else {
-          setAvailableDecks([]);
-          setError('No decks available.');
-        }
-      } catch (err) {
-        console.error('Error fetching decks:', err.message);
-        setError('Error fetching decks. Please try again later.');
-      } finally {
-        setLoading(false);
-      }
-    };
+    if (!isOpen) return;
+    setError('');
+    setLoaded(false);
+    if (!localStorage.getItem('access_token')) {
+      setError('User is not authenticated. Please log in again.');
+      return;
+    }
+    reload().finally(() => setLoaded(true));
+  }, [isOpen, reload]);
 
-    if (isOpen) {
-      fetchDecks();
+  useEffect(() => {
+    if (fetchError) {
+      setError('Error fetching decks. Please try again later.');
+    } else if (loaded && availableDecks.length === 0) {
+      setError('No decks available.');
     }
-  }, [isOpen]);
+  }, [fetchError, loaded, availableDecks.length]);
 
   const handleImport = () => {
     if (!selectedDeck) {
@@ -56,7 +41,7 @@ const ImportModal = ({ isOpen, onClose, onImport }) => {
       return;
     }
 
-    if (selectedDeck.cards.length < 10) {
+    if ((selectedDeck.progress_counts?.total || 0) < 10) {
       setError('Deck must have at least 10 cards');
       return;
     }
@@ -78,7 +63,7 @@ const ImportModal = ({ isOpen, onClose, onImport }) => {
 
         <h2 className="text-2xl font-bold mb-6">Import Deck</h2>
 
-        {loading ? (
+        {!loaded && loading ? (
           <p className="text-center text-gray-600">Loading decks...</p>
         ) : (
           <div className="space-y-4">
@@ -101,6 +86,7 @@ const ImportModal = ({ isOpen, onClose, onImport }) => {
                   </option>
                 ))}
               </select>
+              <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} className="mt-2 w-full" />
             </div>
 
             {error && (
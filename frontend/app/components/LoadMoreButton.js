@@ -0,0 +1,18 @@
+// frontend/app/components/LoadMoreButton.js
+
+const LoadMoreButton = ({ hasMore, loading, onClick, className = '' }) => {
+  if (!hasMore) return null;
+
+  return (
+    <button
+      type="button"
+      onClick={onClick}
+      disabled={loading}
+      className={`border px-4 py-2 rounded bg-gray-100 hover:bg-gray-200 disabled:opacity-50 ${className}`}
+    >
+      {loading ? 'Loading...' : 'Load more'}
+    </button>
+  );
+};
+
+export default LoadMoreButton;
@@ -35,12 +35,14 @@ export default function Navbar({ activePage }) {
     try {
       const token = localStorage.getItem("access_token");
       if (token) {
+        // Send the refresh token too so it is revoked along with the access token
         await fetch("http://localhost:5000/auth/logout", {
           method: "POST",
           headers: {
             "Content-Type": "application/json",
             "Authorization": `Bearer ${token}`,
           },
+          body: JSON.stringify({ refresh_token: localStorage.getItem("refresh_token") }),
         });
       }
       localStorage.removeItem("access_token");
@@ -2,7 +2,10 @@ import React, { memo } from 'react';
 import ProgressBar from './ProgressBar';
 
 const TestUI = memo(({ deck, onLearn }) => {
-  if (!deck || !deck.cards || deck.cards.length === 0) {
+  // Deck listings carry progress_counts instead of the cards themselves
+  const totalCards = deck?.progress_counts?.total ?? deck?.cards?.length ?? 0;
+
+  if (!deck || totalCards === 0) {
     return (
       <div className="text-center">
         <p className="text-lg text-gray-500">No cards available in this deck.</p>
@@ -14,11 +17,9 @@ const TestUI = memo(({ deck, onLearn }) => {
     title = 'Untitled Deck',
     description = 'No description available',
     underglowColor,
-    cards = [],
   } = deck;
 
   // Calculate progress counts
-  const totalCards = cards.length;
   const progressCounts = deck.progress_counts || {
     learned: 0,
     mastered: 0,
@@ -5,10 +5,12 @@ import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
 import FlashcardsGrid from '../components/FlashcardsGrid';
 import Navbar from '../components/Navbar';
+import LoadMoreButton from '../components/LoadMoreButton';
+import { usePagedList } from '../utils/usePagedList';
 import GenerateFromNoteModal from '../components/GenerateFromNoteModal';
 
 export default function FlashcardsPage() {
-  const [decks, setDecks] = useState([]);
+  const { items: decks, hasMore, loading, reload, loadMore } = usePagedList('http://localhost:5000/flashcards/decks', 'decks');
   const [isNavOpen, setIsNavOpen] = useState(true);
   const [isModalOpen, setIsModalOpen] = useState(false);
   const router = useRouter();
@@ -20,20 +22,7 @@ export default function FlashcardsPage() {
       router.push('/login');
       return;
     }
-
-    try {
-      const res = await fetch('http://localhost:5000/flashcards/decks', {
-        headers: { 'Authorization': `Bearer ${token}` }
-      });
-      const data = await res.json();
-      if (data.decks) {
-        setDecks(data.decks);
-      } else if (data.error) {
-        console.error(data.error);
-      }
-    } catch (err) {
-      console.error('Error fetching decks:', err);
-    }
+    await reload();
   };
 
   useEffect(() => {
@@ -105,6 +94,9 @@ export default function FlashcardsPage() {
           </div>
           
           <FlashcardsGrid decks={decks} />
+          <div className="flex justify-center">
+            <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
+          </div>
         </div>
       </main>
 
@@ -6,6 +6,7 @@ import NotebookDisplay from "../components/NotebookDisplay";
 import TestUI from "../components/TestUI";
 import DeckCard from "../components/DeckCard";
 import AddNew from "../components/AddNew";
+import { fetchPage } from "../utils/fetchPage";
 
 export default function MainPage() {
   const router = useRouter();
@@ -36,25 +37,16 @@ export default function MainPage() {
       const userData = await userRes.json();
       setUserName(userData.full_name || userData.email?.split("@")[0] || "User");
 
-      // Fetch all data in parallel
-      const [flashcardsRes, notesRes] = await Promise.all([
-        fetch("http://localhost:5000/flashcards/decks", {
-          headers: { "Authorization": `Bearer ${token}` }
-        }),
-        fetch("http://localhost:5000/notes/list", {
-          headers: { "Authorization": `Bearer ${token}` }
-        })
+      // Each section shows the newest three, so one small page of each is enough
+      const [{ items: decks }, { items: notes }] = await Promise.all([
+        fetchPage("http://localhost:5000/flashcards/decks", "decks", token, { limit: 3 }),
+        fetchPage("http://localhost:5000/notes/list", "notes", token, { limit: 3 })
       ]);
 
-      const [flashcardsData, notesData] = await Promise.all([
-        flashcardsRes.json(),
-        notesRes.json()
-      ]);
-
-      setFlashcards(flashcardsData.decks || []);
-      setNotes(notesData.notes || []);
+      setFlashcards(decks);
+      setNotes(notes);
       // Tests will be derived from flashcards
-      setTests(flashcardsData.decks || []);
+      setTests(decks);
     } catch (err) {
       console.error("Error fetching data:", err);
     }
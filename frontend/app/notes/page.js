@@ -6,34 +6,31 @@ import AddNotebook from "../components/AddNotebook";
 import NotebookDisplay from "../components/NotebookDisplay";
 import EditNotebook from "../components/EditNotebook";
 import { useRouter } from "next/navigation";
+import LoadMoreButton from "../components/LoadMoreButton";
+import { usePagedList } from "../utils/usePagedList";
 
 export default function NotesPage() {
   const router = useRouter();
   const [isOpen, setIsOpen] = useState(true);
   const [showPopup, setShowPopup] = useState(false);
   const [showEdit, setShowEdit] = useState(false);
-  const [notebooks, setNotebooks] = useState([]);
   const [editNotebook, setEditNotebook] = useState(null);
   const token = typeof window !== "undefined" ? localStorage.getItem("access_token") : null;
-
-  const fetchNotes = async () => {
+  const {
+    items: notebooks,
+    setItems: setNotebooks,
+    hasMore,
+    loading,
+    reload,
+    loadMore,
+  } = usePagedList("http://localhost:5000/notes/list", "notes");
+
+  const fetchNotes = () => {
     if (!token) {
       router.push("/login");
       return;
     }
-    try {
-      const res = await fetch("http://localhost:5000/notes/list", {
-        headers: { Authorization: `Bearer ${token}` },
-      });
-      const data = await res.json();
-      if (!res.ok) {
-        console.error("Error fetching notes:", data.error);
-        return;
-      }
-      setNotebooks(data.notes || []);
-    } catch (error) {
-      console.error("Error fetching notes:", error);
-    }
+    reload();
   };
 
   useEffect(() => {
@@ -165,6 +162,7 @@ export default function NotesPage() {
             <p>No notebooks yet. Add a new notebook to get started.</p>
           )}
         </div>
+        <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} className="mt-6" />
 
         {showPopup && (
           <AddNotebook
@@ -55,11 +55,14 @@ export default function SettingsPage() {
   const handleLogout = async () => {
     if (!token) return;
     try {
+      // Send the refresh token too so it is revoked along with the access token
       const res = await fetch("http://localhost:5000/auth/logout", {
         method: "POST",
         headers: {
+          "Content-Type": "application/json",
           "Authorization": `Bearer ${token}`
-        }
+        },
+        body: JSON.stringify({ refresh_token: localStorage.getItem("refresh_token") })
       });
       if (res.ok) {
         localStorage.removeItem("access_token");
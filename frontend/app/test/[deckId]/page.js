@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import { shuffle } from 'lodash';
 import { X } from 'lucide-react';
@@ -61,6 +61,10 @@ const STREAK_THRESHOLDS = {
   DEMOTION: -2,
 };
 
+// Answers are flushed once this many are queued, or this long after the first one
+const ANSWER_BATCH_SIZE = 10;
+const ANSWER_FLUSH_DELAY_MS = 5000;
+
 const DynamicTestPage = () => {
   const params = useParams();
   const router = useRouter();
@@ -80,6 +84,10 @@ const DynamicTestPage = () => {
   const [isTermQuestion, setIsTermQuestion] = useState(true);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const pendingAnswers = useRef([]);
+  // A sent batch whose outcome is unknown; it is resent under the same batch_id
+  const unconfirmedBatch = useRef(null);
+  const flushTimer = useRef(null);
 
   const getRandomQuestionType = () => {
     const random = Math.random() * 100;
@@ -109,105 +117,74 @@ const DynamicTestPage = () => {
   };
 
 
-  const saveAllProgress = async () => {
+  // Answers are sent to PATCH /progress in batches rather than saving every card's state per answer.
+  // Each batch carries a batch_id, so resending one the server already applied changes nothing.
+  const sendBatch = async (batch, keepalive) => {
+    unconfirmedBatch.current = batch;
     try {
-      if (!deck) return { success: false, error: 'No deck data' };
-  
-      const states = Array.from(cardStates.entries());
-      const currentProgress = {
-        learned: states.filter(([_, state]) => state.status === 'learned').map(([index]) => index),
-        mastered: states.filter(([_, state]) => state.status === 'mastered').map(([index]) => index),
-        unfamiliar: states.filter(([_, state]) => state.status === 'unfamiliar').map(([index]) => index)
-      };
-  
-      const cardStatesObj = {};
-      cardStates.forEach((state, index) => {
-        cardStatesObj[index] = {
-          streak: state.streak,
-          status: state.status,
-          lastAnswered: state.lastAnswered,
-        };
-      });
-  
       const token = localStorage.getItem('access_token');
-      const response = await fetch(
-        `http://localhost:5000/flashcards/decks/${params.deckId}/progress`,
-        {
-          method: 'PUT',
-          headers: {
-            Authorization: `Bearer ${token}`,
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            progress: currentProgress,
-            cardStates: cardStatesObj,
-          }),
-        }
-      );
-  
+      let response;
+      for (let attempt = 0; attempt < 2; attempt++) {
+        response = await fetch(
+          `http://localhost:5000/flashcards/decks/${params.deckId}/progress`,
+          {
+            method: 'PATCH',
+            keepalive,
+            headers: {
+              Authorization: `Bearer ${token}`,
+              'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ events: batch.events, batch_id: batch.id }),
+          }
+        );
+        // 409 means another session changed the same cards; the events can simply be re-applied
+        if (response.status !== 409) break;
+      }
+
       if (!response.ok) {
-        throw new Error('Failed to save final progress');
+        // A 4xx other than 409 means the batch was rejected, so resending it cannot help
+        if (response.status >= 400 && response.status < 500 && response.status !== 409) {
+          unconfirmedBatch.current = null;
+        }
+        throw new Error('Failed to save progress');
+      }
+
+      unconfirmedBatch.current = null;
+      const { progress_counts: counts } = await response.json();
+      if (counts?.total) {
+        setProgress({
+          learned: (counts.learned / counts.total) * 100,
+          mastered: (counts.mastered / counts.total) * 100,
+          unfamiliar: (counts.unfamiliar / counts.total) * 100,
+        });
       }
-  
       return { success: true };
     } catch (error) {
-      console.error('Error in saveAllProgress:', error);
+      console.error('Error saving answers:', error);
+      // The batch stays in unconfirmedBatch, so the next flush resends it with the same batch_id
       return { success: false, error: error.message };
     }
   };
-  
-  const saveQuietProgress = async () => {
-    if (!deck || !currentCard) return;
-  
-    try {
-      const states = Array.from(cardStates.entries());
-      const currentProgress = {
-        learned: states
-          .filter(([_, state]) => state.status === 'learned')
-          .map(([index]) => index),
-        mastered: states
-          .filter(([_, state]) => state.status === 'mastered')
-          .map(([index]) => index),
-        unfamiliar: states
-          .filter(([_, state]) => state.status === 'unfamiliar')
-          .map(([index]) => index)
-      };
-  
-      const token = localStorage.getItem('access_token');
-      await fetch(
-        `http://localhost:5000/flashcards/decks/${params.deckId}/progress`,
-        {
-          method: 'PUT',
-          headers: {
-            Authorization: `Bearer ${token}`,
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            progress: currentProgress,
-            cardStates: Object.fromEntries(
-              Array.from(cardStates.entries()).map(([index, state]) => [
-                index,
-                {
-                  streak: state.streak,
-                  status: state.status,
-                  lastAnswered: state.lastAnswered
-                }
-              ])
-            )
-          }),
-        }
-      );
-  
-      // Update local progress state without showing modal
-      const totalCards = deck.cards.length;
-      setProgress({
-        learned: (currentProgress.learned.length / totalCards) * 100,
-        mastered: (currentProgress.mastered.length / totalCards) * 100,
-        unfamiliar: (currentProgress.unfamiliar.length / totalCards) * 100,
-      });
-  
-    } catch (error) {
-      console.error('Error in quiet save:', error);
+
+  const flushAnswers = async ({ keepalive = false } = {}) => {
+    clearTimeout(flushTimer.current);
+    flushTimer.current = null;
+    if (unconfirmedBatch.current) {
+      const resent = await sendBatch(unconfirmedBatch.current, keepalive);
+      if (!resent.success) return resent;
+    }
+    const events = pendingAnswers.current;
+    if (!events.length) return { success: true };
+    pendingAnswers.current = [];
+    return sendBatch({ id: crypto.randomUUID(), events }, keepalive);
+  };
+
+  const queueAnswer = (cardIndex, isCorrect) => {
+    pendingAnswers.current.push({ index: cardIndex, correct: isCorrect, timestamp: Date.now() });
+    if (pendingAnswers.current.length >= ANSWER_BATCH_SIZE) {
+      flushAnswers();
+    } else if (!flushTimer.current) {
+      flushTimer.current = setTimeout(flushAnswers, ANSWER_FLUSH_DELAY_MS);
     }
   };
 
@@ -276,6 +253,12 @@ const DynamicTestPage = () => {
 
   const resetProgress = () => {
     if (!deck) return;
+
+    // The reset replaces all progress, so queued and unconfirmed answers are dropped
+    clearTimeout(flushTimer.current);
+    flushTimer.current = null;
+    pendingAnswers.current = [];
+    unconfirmedBatch.current = null;
   
     const updatedDeck = { ...deck };
     updatedDeck.cards = updatedDeck.cards.map(card => ({
@@ -310,10 +293,12 @@ const DynamicTestPage = () => {
 
   const handleAnswer = async (isCorrect) => {
     if (!deck || !currentCard) return;
+
+    const cardIndex = deck.cards.findIndex(c => c.id === currentCard.id);
+    queueAnswer(cardIndex, isCorrect);
   
     setCardStates(prevStates => {
       const newStates = new Map(prevStates);
-      const cardIndex = deck.cards.findIndex(c => c.id === currentCard.id);
       const currentState = newStates.get(cardIndex) || { 
         streak: 0, 
         status: 'unfamiliar',
@@ -343,7 +328,6 @@ const DynamicTestPage = () => {
     });
   
     const updatedDeck = { ...deck };
-    const cardIndex = updatedDeck.cards.findIndex(c => c.id === currentCard.id);
     const state = cardStates.get(cardIndex);
     
     if (state) {
@@ -353,9 +337,6 @@ const DynamicTestPage = () => {
       card.consecutiveCorrect = state.streak;
     }
   
-    // Quiet save after updating state
-    await saveQuietProgress();
-    
     // Select next card
     selectNextCard(updatedDeck);
   };
@@ -512,6 +493,16 @@ const DynamicTestPage = () => {
     loadDeck();
   }, [params.deckId]);
 
+  // Send any queued answers when leaving the page
+  useEffect(() => {
+    const flushOnHide = () => flushAnswers({ keepalive: true });
+    window.addEventListener('pagehide', flushOnHide);
+    return () => {
+      window.removeEventListener('pagehide', flushOnHide);
+      flushOnHide();
+    };
+  }, [params.deckId]);
+
   
 
   if (loading) {
@@ -545,7 +536,6 @@ const DynamicTestPage = () => {
     term: isTermQuestion ? currentCard.term : currentCard.definition,
     correctAnswer: isTermQuestion ? currentCard.definition : currentCard.term,
     onAnswer: handleAnswer,
-    saveQuietProgress: saveQuietProgress, // Add this to enable auto-saving
     progress: {
       totalCards: deck.cards.length,
       learnedCount: Array.from(cardStates.values()).filter(state => 
@@ -591,7 +581,7 @@ const DynamicTestPage = () => {
             setShowSaveModal(true);
             setSaveStatus('saving');
             
-            const result = await saveAllProgress();
+            const result = await flushAnswers();
             
             if (result.success) {
               setSaveStatus('success');
@@ -4,50 +4,35 @@ import { useState, useEffect, lazy, Suspense } from 'react';
 import { useRouter } from 'next/navigation';
 import Navbar from '../components/Navbar';
 import TestUI from '../components/TestUI';
+import LoadMoreButton from '../components/LoadMoreButton';
+import { usePagedList } from '../utils/usePagedList';
 
 const ImportModal = lazy(() => import('../components/ImportModal'));
 
 export default function TestPage() {
   const [isNavOpen, setIsNavOpen] = useState(true);
-  const [importedDecks, setImportedDecks] = useState([]);
+  const {
+    items: importedDecks,
+    setItems: setImportedDecks,
+    hasMore,
+    loading,
+    error,
+    reload,
+    loadMore,
+  } = usePagedList('http://localhost:5000/flashcards/decks', 'decks');
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [isLoading, setIsLoading] = useState(true);
-  const [error, setError] = useState(null);
   const router = useRouter();
 
-  // Fetch imported decks from the backend on mount
+  // Fetch the first page of decks on mount; more are loaded on demand
   useEffect(() => {
-    const fetchDecks = async () => {
-      try {
-        setIsLoading(true);
-        const token = localStorage.getItem('access_token');
-        if (!token) {
-          router.push('/login');
-          return;
-        }
-
-        const response = await fetch('http://localhost:5000/flashcards/decks', {
-          headers: {
-            Authorization: `Bearer ${token}`,
-          },
-        });
-
-        if (!response.ok) {
-          throw new Error('Failed to fetch decks');
-        }
-
-        const data = await response.json();
-        setImportedDecks(data.decks || []);
-      } catch (error) {
-        console.error('Error fetching imported decks:', error);
-        setError(error.message);
-      } finally {
-        setIsLoading(false);
-      }
-    };
-
-    fetchDecks();
-  }, [router]);
+    const token = localStorage.getItem('access_token');
+    if (!token) {
+      router.push('/login');
+      return;
+    }
+    reload().finally(() => setIsLoading(false));
+  }, [router, reload]);
 
   const handleImportDeck = async (deck) => {
     try {
@@ -56,12 +41,20 @@ export default function TestPage() {
         return;
       }
 
-      if (deck.cards.length < 10) {
+      if ((deck.progress_counts?.total || 0) < 10) {
         alert('Deck must have at least 10 cards to be imported.');
         return;
       }
 
       const token = localStorage.getItem('access_token');
+
+      // The deck list only carries summaries; importing resets progress, so send the full cards back
+      const deckResponse = await fetch(`http://localhost:5000/flashcards/decks/${deck._id}`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      if (!deckResponse.ok) throw new Error('Failed to load deck');
+      const fullDeck = await deckResponse.json();
+
       const response = await fetch(`http://localhost:5000/flashcards/decks/${deck._id}`, {
         method: 'PUT',
         headers: {
@@ -69,11 +62,14 @@ export default function TestPage() {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
-          ...deck,
+          title: fullDeck.title,
+          description: fullDeck.description,
+          underglowColor: fullDeck.underglowColor,
+          cards: fullDeck.cards,
           progress: {
             learned: [],
             mastered: [],
-            unfamiliar: Array.from({ length: deck.cards.length }, (_, i) => i)
+            unfamiliar: Array.from({ length: fullDeck.cards.length }, (_, i) => i)
           }
         })
       });
@@ -138,13 +134,16 @@ export default function TestPage() {
                     learned: deck.progress_counts?.learned || 0,
                     mastered: deck.progress_counts?.mastered || 0,
                     unfamiliar: deck.progress_counts?.unfamiliar || 0,
-                    total: deck.progress_counts?.total || deck.cards.length
+                    total: deck.progress_counts?.total || 0
                   }}
                   onLearn={() => router.push(`/test/${deck._id}`)}
                 />
               ))}
             </div>
           )}
+          <div className="flex justify-center mt-6">
+            <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
+          </div>
 
           {isModalOpen && (
             <Suspense fallback={<div>Loading...</div>}>
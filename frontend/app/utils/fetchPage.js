@@ -0,0 +1,21 @@
+// frontend/app/utils/fetchPage.js
+
+// List endpoints return one page at a time with a `next_cursor`. Screens load the
+// first page and ask for the next one only when the user wants more.
+export const PAGE_SIZE = 24;
+
+export async function fetchPage(url, key, token, { cursor = null, limit = PAGE_SIZE } = {}) {
+  const pageUrl = new URL(url);
+  pageUrl.searchParams.set('limit', limit);
+  if (cursor) pageUrl.searchParams.set('cursor', cursor);
+
+  const res = await fetch(pageUrl, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || `Failed to fetch ${key}`);
+  }
+
+  return { items: data[key] || [], nextCursor: data.next_cursor || null };
+}
@@ -0,0 +1,36 @@
+// frontend/app/utils/usePagedList.js
+import { useState, useCallback } from 'react';
+import { fetchPage, PAGE_SIZE } from './fetchPage';
+
+// A list screen's items, one page at a time: `reload` fetches the first page,
+// `loadMore` appends the next one while `hasMore` is true.
+export function usePagedList(url, key, { limit = PAGE_SIZE } = {}) {
+  const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState(null);
+
+  const load = useCallback(async (cursor) => {
+    const token = localStorage.getItem('access_token');
+    if (!token) return;
+    setLoading(true);
+    setError(null);
+    try {
+      const page = await fetchPage(url, key, token, { cursor, limit });
+      setItems(prev => (cursor ? [...prev, ...page.items] : page.items));
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error(`Error fetching ${key}:`, err);
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  }, [url, key, limit]);
+
+  const reload = useCallback(() => load(null), [load]);
+  const loadMore = useCallback(() => {
+    if (nextCursor && !loading) load(nextCursor);
+  }, [load, nextCursor, loading]);
+
+  return { items, setItems, hasMore: Boolean(nextCursor), loading, error, reload, loadMore };
+}